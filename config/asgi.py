@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Route the Supabase-backed views to their async versions (killers/async_views.py)
+os.environ.setdefault('KILLERS_ASYNC_VIEWS', 'true')
 
 application = get_asgi_application()
@@ -41,18 +41,23 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'killers',
 ]
 
 MIDDLEWARE = [
+    # Outermost, so timings and response sizes cover every other middleware
+    'killers.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'killers.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'killers.throttling.RateLimitHeadersMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -88,11 +93,75 @@ DATABASES = {
         'HOST': os.getenv('SUPABASE_DB_HOST'),
         'PORT': os.getenv('SUPABASE_DB_PORT', '6543'),  # Pooler port for transaction mode
         'OPTIONS': {
-            'sslmode': 'require',  # Supabase requires SSL
+            # Supabase requires SSL; a local Postgres (e.g. for bench_endpoints) may use 'disable'
+            'sslmode': os.getenv('SUPABASE_DB_SSLMODE', 'require'),
         },
+        # Keep connections to the pooler open between requests
+        'CONN_MAX_AGE': int(os.getenv('SUPABASE_DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        # Transaction-mode pooling cannot keep named cursors open between statements
+        'DISABLE_SERVER_SIDE_CURSORS': True,
     }
 }
 
+# Supabase REST client (one pooled client per worker process)
+SUPABASE_CLIENT = {
+    'MAX_CONNECTIONS': int(os.getenv('SUPABASE_MAX_CONNECTIONS', '20')),
+    'MAX_KEEPALIVE_CONNECTIONS': int(os.getenv('SUPABASE_MAX_KEEPALIVE_CONNECTIONS', '10')),
+    'KEEPALIVE_EXPIRY': float(os.getenv('SUPABASE_KEEPALIVE_EXPIRY', '30')),
+    'TIMEOUT': float(os.getenv('SUPABASE_TIMEOUT', '10')),
+    'CONNECT_TIMEOUT': float(os.getenv('SUPABASE_CONNECT_TIMEOUT', '5')),
+    # Threads used to run independent queries concurrently (see services.execute_concurrently)
+    'FANOUT_WORKERS': int(os.getenv('SUPABASE_FANOUT_WORKERS', '8')),
+}
+
+
+# Data backend per endpoint: 'postgrest' (Supabase REST API) or 'orm' (Django ORM
+# over DATABASES). Endpoints without an entry use 'default'.
+KILLERS_DATA_BACKENDS = {
+    'default': os.getenv('KILLERS_DATA_BACKEND', 'postgrest'),
+    # Writes go through the ORM so model signals keep derived data in sync
+    'suggest': 'orm',
+}
+
+# Seconds between checks of the killers dataset version by the in-memory
+# autocomplete index (a changed version triggers a rebuild)
+KILLERS_AUTOCOMPLETE_REFRESH = int(os.getenv('KILLERS_AUTOCOMPLETE_REFRESH', '30'))
+
+# Seconds between refreshes of the in-memory near-duplicate name index
+# (new suggestions are added, a changed killers version rebuilds it)
+KILLERS_DUPLICATE_REFRESH = int(os.getenv('KILLERS_DUPLICATE_REFRESH', '30'))
+
+# Seconds a closed day/week bucket of /api/stats/submissions/ stays cached
+# (closed buckets never change, this only bounds the cache size)
+KILLERS_THROUGHPUT_CACHE_TIMEOUT = int(os.getenv('KILLERS_THROUGHPUT_CACHE_TIMEOUT', str(7 * 24 * 3600)))
+
+# Per-client token buckets for the public read API ('<requests>/<s|min|hour|day>').
+# 'local' keeps buckets in each process; 'cache' shares them through CACHES['default'].
+KILLERS_RATE_LIMITS = {
+    'killers_list': os.getenv('KILLERS_RATE_LIMIT_LIST', '120/min'),
+    'killers_search': os.getenv('KILLERS_RATE_LIMIT_SEARCH', '60/min'),
+    'killers_autocomplete': os.getenv('KILLERS_RATE_LIMIT_AUTOCOMPLETE', '600/min'),
+    'killers_export': os.getenv('KILLERS_RATE_LIMIT_EXPORT', '10/hour'),
+}
+KILLERS_RATE_LIMIT_STORE = os.getenv('KILLERS_RATE_LIMIT_STORE', 'local')
+
+# Responses smaller than this many bytes are sent uncompressed
+KILLERS_COMPRESSION_MIN_SIZE = int(os.getenv('KILLERS_COMPRESSION_MIN_SIZE', '1024'))
+
+# /metrics is staff-only; a scraper can instead send "Authorization: Bearer <token>"
+KILLERS_METRICS_TOKEN = os.getenv('KILLERS_METRICS_TOKEN', '')
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'killers.renderers.OrjsonRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Serve async versions of the Supabase-backed views (enabled by config/asgi.py)
+KILLERS_ASYNC_VIEWS = os.getenv('KILLERS_ASYNC_VIEWS', 'false').lower() == 'true'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
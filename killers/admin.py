@@ -1,16 +1,81 @@
+import logging
+
 from django.contrib import admin
 from django.contrib.admin.models import LogEntry
 from django import forms
-from django.db.models import Q
-from .models import SerialKiller, Suggestion, Modification
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils.functional import cached_property
+from .approvals import approve_suggestions
+from .countries import country_counts
+from .models import KillerCountry, SerialKiller, Suggestion, Modification
+from .stats import record_bulk_status_change
+
+logger = logging.getLogger(__name__)
+
+def estimated_row_count(model):
+    """Planner estimate of the table's row count from pg_class, or None if never analyzed."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that takes the size of an unfiltered changelist from the
+    planner statistics instead of running COUNT(*) over the whole table.
+    Small tables and filtered changelists still get an exact count.
+    """
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            estimate = estimated_row_count(self.object_list.model)
+            if estimate is not None and estimate >= self.exact_count_threshold:
+                return estimate
+        return super().count
+
+
+class CountryListFilter(admin.SimpleListFilter):
+    """Country filter (born or active there) over the country links, not SELECT DISTINCT on free text."""
+    title = 'country'
+    parameter_name = 'country'
+    max_options = 50
+
+    def lookups(self, request, model_admin):
+        return [(row['name'], row['name']) for row in country_counts(self.max_options)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            links = KillerCountry.objects.filter(killer=OuterRef('pk'), country__name=self.value())
+            return queryset.filter(Exists(links))
+        return queryset
+
+
+class LargeTableAdminMixin:
+    """
+    Changelist settings for tables too large for the admin defaults: no
+    COUNT(*) for the unfiltered total, and no second "full result" count
+    on filtered pages. Combine with ``list_select_related`` so list_display
+    methods that follow foreign keys don't query once per row.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(SerialKiller)
-class SerialKillerAdmin(admin.ModelAdmin):
+class SerialKillerAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin interface for Serial Killers."""
     
     list_display = ('common_name', 'full_name', 'gender', 'proven_victims', 'status', 'years_active', 'assigned_to')
-    list_filter = ('gender', 'status', 'birth_country', 'assigned_to')
+    list_filter = ('gender', 'status', CountryListFilter, 'assigned_to')
+    list_select_related = ('assigned_to',)
     search_fields = ('common_name', 'full_name', 'aliases')
     ordering = ('common_name',)
     
@@ -19,8 +84,10 @@ class SerialKillerAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         if request.user.is_superuser:
             return qs
-        # Staff users see killers assigned to them OR killers with modifications assigned to them
-        return qs.filter(Q(assigned_to=request.user) | Q(modifications__assigned_to=request.user)).distinct()
+        # Staff users see killers assigned to them OR killers with modifications assigned to them.
+        # A subquery instead of a join avoids duplicate rows and the DISTINCT over every column.
+        assigned_modifications = Modification.objects.filter(assigned_to=request.user).values('killer_id')
+        return qs.filter(Q(assigned_to=request.user) | Q(pk__in=assigned_modifications))
     
     def formfield_for_dbfield(self, db_field, request, **kwargs):
         """Customize form fields to make certain TextFields single-line."""
@@ -70,12 +137,32 @@ class SerialKillerAdmin(admin.ModelAdmin):
         return fieldsets
 
 
+class LikelyDuplicateListFilter(admin.SimpleListFilter):
+    """Suggestions whose name closely matches an existing killer or suggestion."""
+    
+    title = 'likely duplicate'
+    parameter_name = 'duplicate'
+    
+    def lookups(self, request, model_admin):
+        return [('killer', 'Of a killer'), ('suggestion', 'Of a suggestion'), ('none', 'None found')]
+    
+    def queryset(self, request, queryset):
+        if self.value() == 'killer':
+            return queryset.filter(duplicate_of_killer__isnull=False)
+        if self.value() == 'suggestion':
+            return queryset.filter(duplicate_of_suggestion__isnull=False)
+        if self.value() == 'none':
+            return queryset.filter(duplicate_score__isnull=True)
+        return queryset
+
+
 @admin.register(Suggestion)
-class SuggestionAdmin(admin.ModelAdmin):
+class SuggestionAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin interface for Suggestions."""
     
-    list_display = ('common_name', 'full_name', 'submission_status', 'proven_victims', 'years_active', 'assigned_to', 'created_at')
-    list_filter = ('submission_status', 'gender', 'assigned_to', 'created_at')
+    list_display = ('common_name', 'full_name', 'submission_status', 'likely_duplicate', 'proven_victims', 'years_active', 'assigned_to', 'created_at')
+    list_filter = ('submission_status', LikelyDuplicateListFilter, 'gender', 'assigned_to', 'created_at')
+    list_select_related = ('assigned_to', 'duplicate_of_killer', 'duplicate_of_suggestion')
     search_fields = ('common_name', 'full_name', 'aliases')
     ordering = ('-created_at',)
     date_hierarchy = 'created_at'
@@ -99,6 +186,9 @@ class SuggestionAdmin(admin.ModelAdmin):
         ('Submission Status', {
             'fields': ('submission_status', 'assigned_to')
         }),
+        ('Likely Duplicate', {
+            'fields': ('duplicate_of_killer', 'duplicate_of_suggestion', 'duplicate_score')
+        }),
         ('Personal Information', {
             'fields': ('common_name', 'full_name', 'aliases', 'date_of_birth', 'birth_country', 'gender')
         }),
@@ -114,10 +204,18 @@ class SuggestionAdmin(admin.ModelAdmin):
         }),
     )
     
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('duplicate_of_killer', 'duplicate_of_suggestion', 'duplicate_score', 'created_at', 'updated_at')
     
     actions = ['mark_in_progress', 'mark_finished', 'approve_and_create_killer']
     
+    @admin.display(description='Likely duplicate of', ordering='-duplicate_score')
+    def likely_duplicate(self, obj):
+        if obj.duplicate_score is None:
+            return '-'
+        target = obj.duplicate_of_killer or obj.duplicate_of_suggestion
+        kind = 'Killer' if obj.duplicate_of_killer_id else 'Suggestion'
+        return f"{kind}: {target.common_name if target else '?'} ({obj.duplicate_score:.0%})"
+    
     def get_readonly_fields(self, request, obj=None):
         """Make assigned_to read-only for non-superusers."""
         readonly = list(self.readonly_fields)
@@ -127,47 +225,32 @@ class SuggestionAdmin(admin.ModelAdmin):
     
     @admin.action(description='Approve and Create Serial Killer')
     def approve_and_create_killer(self, request, queryset):
-        """Convert approved suggestions into SerialKiller records."""
-        created_count = 0
-        for suggestion in queryset:
-            # Create a new SerialKiller from the suggestion
-            killer = SerialKiller.objects.create(
-                common_name=suggestion.common_name,
-                full_name=suggestion.full_name,
-                aliases=suggestion.aliases,
-                date_of_birth=suggestion.date_of_birth,
-                birth_country=suggestion.birth_country,
-                gender=suggestion.gender,
-                proven_victims=suggestion.proven_victims,
-                possible_victims=suggestion.possible_victims,
-                years_active=suggestion.years_active,
-                active_countries=suggestion.active_countries,
-                modus_operandi=suggestion.modus_operandi,
-                capture_date=suggestion.capture_date,
-                sentence=suggestion.sentence,
-                death_date=suggestion.death_date,
-                manner_of_death=suggestion.manner_of_death,
-                status=suggestion.status,
-                notes=suggestion.notes,
-                assigned_to=request.user  # Assign to the user who approved it
-            )
-            # Mark suggestion as finished
-            suggestion.submission_status = 'finished'
-            suggestion.save()
-            created_count += 1
-        
-        self.message_user(request, f'{created_count} suggestion(s) approved and added to database.')
+        """Convert approved suggestions into SerialKiller records assigned to the approving user."""
+        chunks = []
+
+        def report(done, total):
+            chunks.append(done)
+            logger.info("%s approved %d/%d suggestions", request.user, done, total)
+
+        created_count = approve_suggestions(queryset, request.user, progress=report)
+        self.message_user(
+            request, f'{created_count} suggestion(s) approved and added to database in {len(chunks)} chunk(s).'
+        )
     
     actions = ['mark_in_progress', 'mark_finished', 'approve_and_create_killer']
     
     @admin.action(description='Mark selected suggestions as In Progress')
     def mark_in_progress(self, request, queryset):
-        updated = queryset.update(submission_status='in_progress')
+        with transaction.atomic():
+            record_bulk_status_change('suggestions', queryset, 'in_progress')
+            updated = queryset.update(submission_status='in_progress')
         self.message_user(request, f'{updated} suggestion(s) marked as in progress.')
     
     @admin.action(description='Mark selected suggestions as Finished')
     def mark_finished(self, request, queryset):
-        updated = queryset.update(submission_status='finished')
+        with transaction.atomic():
+            record_bulk_status_change('suggestions', queryset, 'finished')
+            updated = queryset.update(submission_status='finished')
         self.message_user(request, f'{updated} suggestion(s) marked as finished.')
     
     def get_fieldsets(self, request, obj=None):
@@ -184,11 +267,12 @@ class SuggestionAdmin(admin.ModelAdmin):
 
 
 @admin.register(Modification)
-class ModificationAdmin(admin.ModelAdmin):
+class ModificationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin interface for Modifications."""
     
     list_display = ('get_killer_name', 'get_suggestion_preview', 'submission_status', 'assigned_to', 'created_at')
     list_filter = ('submission_status', 'assigned_to', 'created_at')
+    list_select_related = ('killer', 'assigned_to')
     search_fields = ('killer__common_name', 'suggestion_text')
     ordering = ('-created_at',)
     date_hierarchy = 'created_at'
@@ -234,12 +318,16 @@ class ModificationAdmin(admin.ModelAdmin):
     
     @admin.action(description='Mark selected modifications as In Progress')
     def mark_in_progress(self, request, queryset):
-        updated = queryset.update(submission_status='in_progress')
+        with transaction.atomic():
+            record_bulk_status_change('modifications', queryset, 'in_progress')
+            updated = queryset.update(submission_status='in_progress')
         self.message_user(request, f'{updated} modification(s) marked as in progress.')
     
     @admin.action(description='Mark selected modifications as Finished')
     def mark_finished(self, request, queryset):
-        updated = queryset.update(submission_status='finished')
+        with transaction.atomic():
+            record_bulk_status_change('modifications', queryset, 'finished')
+            updated = queryset.update(submission_status='finished')
         self.message_user(request, f'{updated} modification(s) marked as finished.')
     
     def get_fieldsets(self, request, obj=None):
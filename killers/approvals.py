@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .importers import bulk_write
+from .models import SerialKiller, Suggestion
+from .stats import record_bulk_status_change
+
+APPROVAL_CHUNK_SIZE = 1000
+
+# Suggestion columns copied onto the new SerialKiller
+APPROVAL_FIELDS = (
+    'common_name', 'full_name', 'aliases', 'date_of_birth', 'birth_country', 'gender',
+    'proven_victims', 'possible_victims', 'years_active', 'active_countries', 'modus_operandi',
+    'capture_date', 'sentence', 'death_date', 'manner_of_death', 'status', 'notes',
+)
+
+
+@transaction.atomic
+def approve_suggestions(queryset, user, chunk_size=APPROVAL_CHUNK_SIZE, progress=None):
+    """
+    Create a SerialKiller from every suggestion in ``queryset`` and mark the
+    suggestions finished, assigning the new records to ``user``.
+
+    Works set-based in chunks of ``chunk_size``: one read, one bulk_create and
+    one update() per chunk, all in a single transaction. ``progress(done, total)``
+    is called after each chunk. Returns the number of suggestions approved.
+    """
+    pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(pks), chunk_size):
+        chunk = Suggestion.objects.filter(pk__in=pks[start:start + chunk_size])
+        rows = [{**row, 'assigned_to': user} for row in chunk.order_by('pk').values(*APPROVAL_FIELDS)]
+        bulk_write(SerialKiller, rows)
+        record_bulk_status_change('suggestions', chunk, 'finished')
+        chunk.update(submission_status='finished', updated_at=timezone.now())
+        if progress:
+            progress(start + len(rows), len(pks))
+    return len(pks)
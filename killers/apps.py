@@ -7,3 +7,4 @@ class KillersConfig(AppConfig):
     
     def ready(self):
         import killers.signals  # Import signals to register them
+        import killers.metrics  # Instruments new DB connections
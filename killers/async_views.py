@@ -0,0 +1,147 @@
+"""
+Async counterparts of the Supabase-backed views, used when the project is
+served through config/asgi.py. Remote I/O is awaited on the event loop
+instead of blocking a worker thread per request.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.views.decorators.http import require_GET
+
+from .conditional import KILLERS_DATASET, dataset_conditional
+from .duplicates import duplicate_fields, duplicate_groups, remember_suggestion
+from .exports import acsv_lines, aiter_killer_rows, andjson_lines
+from .filters import apply_filters, filter_embeds, parse_killer_filters
+from .models import Suggestion, Modification
+from .pagination import (
+    apply_keyset, build_page, decode_cursor, parse_fields, parse_ordering, parse_page_size, select_columns,
+)
+from .services import get_async_supabase_client
+from .renderers import OrjsonResponse
+from .stats import get_dashboard_stats
+from .throttling import rate_limited
+from .kanban import COLUMN_PAGE_SIZE, KINDS, STATUSES, board, card_query
+from .views import parse_search_limit, suggestion_data
+
+
+async def suggestion_view(request):
+    if request.method == 'POST':
+        try:
+            form_type = request.POST.get('form_type')
+
+            if form_type == 'new_killer':
+                data = suggestion_data(request.POST)
+                data.update(await sync_to_async(duplicate_fields)(data))
+                created = await Suggestion.objects.acreate(**data)
+                remember_suggestion({**data, 'id': created.pk})
+                return render(request, 'suggestion.html', {'message': 'Suggestion submitted successfully!'})
+
+            elif form_type == 'correction':
+                data = {
+                    'killer_id': request.POST.get('killer_id'),
+                    'suggestion_text': request.POST.get('suggestion_text'),
+                    'submission_status': 'new'
+                }
+                await Modification.objects.acreate(**data)
+                return render(request, 'suggestion.html', {'message': 'Correction submitted successfully!', 'is_correction': True})
+
+        except Exception as e:
+            context = {'error': str(e)}
+            if request.POST.get('form_type') == 'correction':
+                context['is_correction'] = True
+            return render(request, 'suggestion.html', context)
+
+    # GET request; the correction form looks subjects up through /api/killers/autocomplete/
+    return render(request, 'suggestion.html', {'is_correction': request.GET.get('type') == 'correction'})
+
+
+@rate_limited('killers_list')
+@dataset_conditional(KILLERS_DATASET)
+@require_GET
+async def get_all_killers(request):
+    """
+    Async version of views.get_all_killers (same parameters and payload).
+    """
+    try:
+        fields = parse_fields(request.GET.get('fields'))
+        page_size = parse_page_size(request.GET.get('page_size'))
+        ordering = parse_ordering(request.GET.get('ordering'))
+        cursor = decode_cursor(request.GET.get('cursor'), ordering)
+        filters = parse_killer_filters(request.GET)
+    except ValueError as e:
+        return OrjsonResponse({"error": str(e)}, status=400)
+
+    try:
+        supabase = get_async_supabase_client()
+        columns = select_columns(fields, ordering) + filter_embeds(filters)
+        query = apply_filters(supabase.table('Serial Killers').select(columns), filters)
+        response = await apply_keyset(query, cursor, page_size, ordering).execute()
+        return OrjsonResponse(build_page(request, response.data, cursor, page_size, fields, ordering))
+    except Exception as e:
+        return OrjsonResponse({"error": str(e)}, status=500)
+
+
+@rate_limited('killers_search')
+@dataset_conditional(KILLERS_DATASET)
+@require_GET
+async def get_killer_by_name(request, common_name):
+    """
+    Async version of views.get_killer_by_name.
+    """
+    try:
+        limit = parse_search_limit(request.GET.get('limit'))
+    except ValueError as e:
+        return OrjsonResponse({"error": str(e)}, status=400)
+
+    try:
+        supabase = get_async_supabase_client()
+        response = await supabase.rpc('search_killers', {'q': common_name, 'max_results': limit}).execute()
+        return OrjsonResponse(response.data)
+    except Exception as e:
+        return OrjsonResponse({"error": str(e)}, status=500)
+
+
+@rate_limited('killers_export')
+@dataset_conditional(KILLERS_DATASET)
+@require_GET
+async def export_killers_ndjson(request):
+    """
+    Async version of views.export_killers_ndjson, streamed without buffering.
+    """
+    response = StreamingHttpResponse(andjson_lines(aiter_killer_rows()), content_type='application/x-ndjson')
+    response['Content-Disposition'] = 'attachment; filename="killers.ndjson"'
+    return response
+
+
+@rate_limited('killers_export')
+@dataset_conditional(KILLERS_DATASET)
+@require_GET
+async def export_killers_csv(request):
+    """
+    Async version of views.export_killers_csv, streamed without buffering.
+    """
+    response = StreamingHttpResponse(acsv_lines(aiter_killer_rows()), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="killers.csv"'
+    return response
+
+
+async def dashboard_view(request):
+    try:
+        supabase = get_async_supabase_client()
+        keys = [(kind, status) for kind in KINDS for status in STATUSES]
+        *pages, stats = await asyncio.gather(
+            *(card_query(supabase, kind, status, None, COLUMN_PAGE_SIZE).execute() for kind, status in keys),
+            sync_to_async(get_dashboard_stats)(),
+        )
+        columns = {key: page.data for key, page in zip(keys, pages)}
+        context = {
+            'board': board(columns, stats['submission_stats']),
+            'duplicate_groups': await sync_to_async(duplicate_groups)(),
+            **stats,
+        }
+        return render(request, 'dashboard.html', context)
+
+    except Exception as e:
+        return render(request, 'dashboard.html', {'error': str(e)})
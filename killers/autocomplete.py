@@ -0,0 +1,90 @@
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .conditional import KILLERS_DATASET, get_dataset_version
+from .repositories import get_repository
+
+AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
+
+
+class PrefixIndex:
+    """
+    Sorted in-memory index of killer names answering prefix queries with a
+    binary search.
+
+    Every word of a name is indexed, so "bun" finds "Ted Bundy"; matches on
+    the start of the whole name rank before matches on a later word.
+    """
+
+    def __init__(self, rows):
+        names, words = [], []
+        for row in rows:
+            name = row['common_name'] or ''
+            folded = name.casefold()
+            names.append((folded, row['id'], name))
+            for i, ch in enumerate(folded):
+                if i and not ch.isspace() and folded[i - 1].isspace():
+                    words.append((folded[i:], row['id'], name))
+        names.sort()
+        words.sort()
+        self._names = names
+        self._words = words
+
+    def __len__(self):
+        return len(self._names)
+
+    def search(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        prefix = prefix.strip().casefold()
+        if not prefix:
+            return []
+        results, seen = [], set()
+        for entries in (self._names, self._words):
+            # Walk forward from the first candidate: slicing (or islice) would
+            # cost O(n) per keystroke instead of O(matches)
+            i = bisect_left(entries, (prefix,))
+            while i < len(entries) and len(results) < limit:
+                key, pk, name = entries[i]
+                if not key.startswith(prefix):
+                    break
+                if pk not in seen:
+                    seen.add(pk)
+                    results.append({'id': pk, 'common_name': name})
+                i += 1
+        return results
+
+
+_index = None
+_index_version = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_killer_index():
+    """
+    Return this process's PrefixIndex, rebuilding it when the killers dataset
+    version has changed. The version is checked at most once every
+    ``KILLERS_AUTOCOMPLETE_REFRESH`` seconds, so most lookups touch no I/O.
+    """
+    global _index, _index_version, _checked_at
+    refresh = getattr(settings, 'KILLERS_AUTOCOMPLETE_REFRESH', 30)
+    if _index is not None and time.monotonic() - _checked_at < refresh:
+        return _index
+    with _lock:
+        if _index is not None and time.monotonic() - _checked_at < refresh:
+            return _index
+        version, _ = get_dataset_version(KILLERS_DATASET)
+        if _index is None or version != _index_version:
+            _index = PrefixIndex(get_repository('autocomplete').killer_choices())
+            _index_version = version
+        _checked_at = time.monotonic()
+        return _index
+
+
+def reset_killer_index():
+    global _index, _index_version, _checked_at
+    with _lock:
+        _index, _index_version, _checked_at = None, None, 0.0
@@ -0,0 +1,335 @@
+"""
+Offline stand-in for the Supabase REST API, used by ``manage.py bench_endpoints``.
+
+FakePostgrest serves ``/rest/v1/<table>`` and ``/rest/v1/rpc/search_killers``
+from in-memory rows over HTTP, implementing the subset of PostgREST the
+repositories use: column selection (including the ``killer:killer_id(...)``
+embed), ``eq/neq/gt/gte/lt/lte/is/in`` filters, nested ``or``/``and``
+groups, multi-column ``order`` with null placement, ``limit`` and inserts.
+"""
+import datetime
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .importers import bulk_write
+from .models import Modification, SerialKiller, Suggestion
+from .stats import apply_deltas, submission_contributions
+
+REST_PREFIX = '/rest/v1/'
+
+# Foreign keys the fake can embed: table -> {fk column: referenced table}
+FOREIGN_KEYS = {'Modifications': {'killer_id': 'Serial Killers'}}
+
+
+def _split_top_level(text):
+    """Split on commas that are not inside parentheses or double quotes."""
+    parts, depth, quoted, current, escaped = [], 0, False, [], False
+    for ch in text:
+        if escaped:
+            current.append(ch)
+            escaped = False
+            continue
+        if ch == '\\' and quoted:
+            current.append(ch)
+            escaped = True
+            continue
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == '(':
+            depth += 1
+        elif not quoted and ch == ')':
+            depth -= 1
+        elif not quoted and depth == 0 and ch == ',':
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(ch)
+    if current:
+        parts.append(''.join(current))
+    return parts
+
+
+def _unquote_value(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    return value
+
+
+def _coerce(value, sample):
+    """Convert a filter literal to the type of the stored value it is compared with."""
+    if isinstance(sample, bool):
+        return value == 'true'
+    if isinstance(sample, int):
+        return int(value)
+    if isinstance(sample, float):
+        return float(value)
+    return value
+
+
+def _compare(op, stored, literal):
+    if op == 'is':
+        return stored is None if literal == 'null' else stored == (literal == 'true')
+    if op == 'in':
+        values = [_unquote_value(v) for v in _split_top_level(literal.strip('()'))]
+        return stored is not None and stored in [_coerce(v, stored) for v in values]
+    if stored is None:
+        return False
+    literal = _coerce(_unquote_value(literal), stored)
+    return {
+        'eq': stored == literal,
+        'neq': stored != literal,
+        'gt': stored > literal,
+        'gte': stored >= literal,
+        'lt': stored < literal,
+        'lte': stored <= literal,
+    }[op]
+
+
+def _condition(column, expression):
+    """Predicate for ``column=op.value`` (``expression`` is ``op.value``)."""
+    negate = expression.startswith('not.')
+    if negate:
+        expression = expression[4:]
+    op, _, literal = expression.partition('.')
+    if op in ('or', 'and'):
+        raise ValueError(f"Unsupported nested filter on {column}")
+
+    def predicate(row):
+        return _compare(op, row.get(column), literal) != negate
+    return predicate
+
+
+def _group(kind, body):
+    """Predicate for an ``or=(...)``/``and=(...)`` group."""
+    predicates = []
+    for part in _split_top_level(body[1:-1]):
+        if part.startswith(('or(', 'and(')):
+            name, _, rest = part.partition('(')
+            predicates.append(_group(name, '(' + rest))
+        else:
+            column, _, expression = part.partition('.')
+            predicates.append(_condition(column, expression))
+    combine = any if kind == 'or' else all
+    return lambda row: combine(p(row) for p in predicates)
+
+
+def _sort(rows, order):
+    # Stable sorts applied from the last key to the first
+    for term in reversed(order.split(',')):
+        column, *modifiers = term.split('.')
+        descending = 'desc' in modifiers
+        nulls_first = 'nullsfirst' in modifiers or (descending and 'nullslast' not in modifiers)
+        present = [r for r in rows if r.get(column) is not None]
+        missing = [r for r in rows if r.get(column) is None]
+        present.sort(key=lambda r: r[column], reverse=descending)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+class FakePostgrest:
+    """
+    In-memory tables behind a threaded HTTP server speaking a PostgREST subset.
+    ``max_rows`` caps every select like PostgREST's db-max-rows setting.
+    """
+
+    def __init__(self, tables=None, max_rows=None):
+        self.tables = tables or {}
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._server = None
+        self._indexes = {}
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self, host='127.0.0.1', port=0):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._respond(*fake.handle_get(self.path))
+
+            def do_HEAD(self):
+                self._respond(*fake.handle_get(self.path))
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'null')
+                self._respond(*fake.handle_post(self.path, body))
+
+            def _respond(self, status, payload):
+                data = json.dumps(payload, cls=DjangoJSONEncoder).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(data)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def handle_get(self, path):
+        parts = urlsplit(path)
+        table = unquote(parts.path[len(REST_PREFIX):])
+        if table not in self.tables:
+            return 404, {'message': f'relation "{table}" does not exist'}
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        try:
+            return 200, self.query(table, params)
+        except (ValueError, KeyError) as e:
+            return 400, {'message': str(e)}
+
+    def handle_post(self, path, body):
+        name = unquote(urlsplit(path).path[len(REST_PREFIX):])
+        if name == 'rpc/search_killers':
+            return 200, self.search(body.get('q', ''), body.get('max_results', 20))
+        if name not in self.tables:
+            return 404, {'message': f'relation "{name}" does not exist'}
+        rows = body if isinstance(body, list) else [body]
+        with self._lock:
+            table = self.tables[name]
+            next_id = max((r['id'] for r in table), default=0) + 1
+            created = []
+            for i, row in enumerate(rows):
+                row = {'id': next_id + i, 'created_at': datetime.datetime.now(datetime.timezone.utc), **row}
+                table.append(row)
+                created.append(row)
+        return 201, created
+
+    def query(self, table, params):
+        rows = self.tables[table]
+        select, order, limit = '*', None, None
+        predicates = []
+        for key, value in params:
+            if key == 'select':
+                select = value
+            elif key == 'order':
+                order = value
+            elif key == 'limit':
+                limit = int(value)
+            elif key in ('or', 'and'):
+                predicates.append(_group(key, value))
+            else:
+                predicates.append(_condition(key, value))
+        rows = [r for r in rows if all(p(r) for p in predicates)]
+        if order:
+            rows = _sort(rows, order)
+        if self.max_rows is not None:
+            limit = self.max_rows if limit is None else min(limit, self.max_rows)
+        if limit is not None:
+            rows = rows[:limit]
+        return [self._project(table, row, select) for row in rows]
+
+    def _project(self, table, row, select):
+        result = {}
+        for column in _split_top_level(select):
+            if column == '*':
+                result.update(row)
+            elif '(' in column:
+                alias, _, rest = column.partition(':')
+                fk, _, columns = rest.partition('(')
+                target = self._get(FOREIGN_KEYS[table][fk], row.get(fk))
+                result[alias] = (
+                    {c: target.get(c) for c in columns.rstrip(')').split(',')} if target else None
+                )
+            else:
+                result[column] = row.get(column)
+        return result
+
+    def _get(self, table, pk):
+        index = self._indexes.get(table)
+        if index is None or len(index) != len(self.tables[table]):
+            index = self._indexes[table] = {r['id']: r for r in self.tables[table]}
+        return index.get(pk)
+
+    def search(self, query, limit):
+        # Substring match standing in for the trigram/full-text ranking
+        needle = query.casefold()
+        fields = ('common_name', 'full_name', 'aliases')
+        matches = [
+            row for row in self.tables.get('Serial Killers', [])
+            if any(needle in (row.get(f) or '').casefold() for f in fields)
+        ]
+        matches.sort(key=lambda r: (not (r['common_name'] or '').casefold().startswith(needle), r['common_name']))
+        return matches[:limit]
+
+
+COUNTRIES = ('United States', 'United Kingdom', 'Germany', 'Russia', 'Brazil', 'India', 'France', 'Colombia')
+METHODS = ('Strangulation', 'Poisoning', 'Shooting', 'Stabbing', 'Bludgeoning')
+STATUSES = ('imprisoned', 'deceased', 'at_large', 'released')
+
+
+def synthetic_killer(i):
+    start = 1900 + (i * 7) % 120
+    return {
+        'common_name': f"Subject {i:06d}",
+        'full_name': f"Synthetic Person {i}",
+        'aliases': f"The Example {i % 997}",
+        'birth_country': COUNTRIES[i % len(COUNTRIES)],
+        'gender': ('male', 'female', 'unknown')[i % 3],
+        'proven_victims': i % 50,
+        'possible_victims': f"{i % 50}-{i % 50 + 15}",
+        'years_active': f"{start}-{start + i % 12}",
+        'active_countries': COUNTRIES[(i + 1) % len(COUNTRIES)],
+        'modus_operandi': METHODS[i % len(METHODS)],
+        'status': STATUSES[i % len(STATUSES)],
+        'notes': 'Generated for benchmarking.',
+    }
+
+
+def seed_database(killers, suggestions, modifications, batch_size=2000):
+    """Fill the (test) database with synthetic rows; counters and derived columns included."""
+    for start in range(0, killers, batch_size):
+        bulk_write(SerialKiller, [synthetic_killer(i) for i in range(start, min(start + batch_size, killers))])
+    for start in range(0, suggestions, batch_size):
+        rows = []
+        for i in range(start, min(start + batch_size, suggestions)):
+            row = synthetic_killer(killers + i)
+            row['submission_status'] = ('new', 'in_progress', 'finished')[i % 3]
+            rows.append(row)
+        bulk_write(Suggestion, rows)
+    killer_ids = list(SerialKiller.objects.order_by('pk').values_list('pk', flat=True)[:max(modifications, 1)])
+    if killer_ids:
+        created = Modification.objects.bulk_create([
+            Modification(
+                killer_id=killer_ids[i % len(killer_ids)],
+                suggestion_text=f"Correction {i}",
+                submission_status=('new', 'in_progress', 'finished')[i % 3],
+            )
+            for i in range(modifications)
+        ], batch_size=batch_size)
+        deltas = Counter()
+        for modification in created:
+            deltas.update(submission_contributions('modifications', {'submission_status': modification.submission_status}))
+        apply_deltas(deltas)
+
+
+def tables_from_database():
+    """Snapshot the seeded tables as PostgREST would return them."""
+    return {
+        'Serial Killers': list(SerialKiller.objects.order_by('pk').values()),
+        'Suggestions': list(Suggestion.objects.order_by('pk').values()),
+        'Modifications': list(Modification.objects.order_by('pk').values()),
+    }
+
@@ -0,0 +1,123 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:  # optional: without it responses are only gzipped
+    brotli = None
+
+# Brotli quality for response bodies; 11 is far too slow for per-request use
+BROTLI_QUALITY = 5
+
+
+def accepted_encodings(header):
+    """Parse Accept-Encoding into ``{coding: q}``."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header):
+    """Pick 'br' or 'gzip' for an Accept-Encoding header, or None for identity."""
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get('*', 0)
+    candidates = (['br'] if brotli else []) + ['gzip']
+    # Prefer the client's highest q-value; brotli wins ties (smaller output)
+    best = max(candidates, key=lambda coding: accepted.get(coding, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+def _brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in sequence:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _abrotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    async for chunk in sequence:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _agzip_sequence(sequence):
+    # One gzip member for the whole body, like compress_sequence(); each chunk
+    # is sync-flushed so it reaches the client without waiting for the next
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in sequence:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Brotli/gzip response compression, negotiated from Accept-Encoding.
+
+    Like Django's GZipMiddleware, but bodies smaller than
+    ``settings.KILLERS_COMPRESSION_MIN_SIZE`` bytes are left alone (the
+    framing overhead outweighs the savings) and brotli is preferred when the
+    client accepts it and the ``brotli`` package is installed. Streaming
+    responses (the exports) are always compressed chunk by chunk.
+    """
+
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        min_size = getattr(settings, 'KILLERS_COMPRESSION_MIN_SIZE', 1024)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            content = response.streaming_content
+            if encoding == 'br':
+                response.streaming_content = _abrotli_sequence(content) if response.is_async else _brotli_sequence(content)
+            elif response.is_async:
+                response.streaming_content = _agzip_sequence(content)
+            else:
+                response.streaming_content = compress_sequence(content, max_random_bytes=self.max_random_bytes)
+            del response.headers['Content-Length']
+        else:
+            if encoding == 'br':
+                compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+            else:
+                compressed = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # The body changed, so a strong ETag must become weak (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
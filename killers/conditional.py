@@ -0,0 +1,96 @@
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import DatasetVersion
+
+KILLERS_DATASET = 'killers'
+
+
+def bump_dataset_version(name):
+    """Increment a dataset's version so cached representations become stale."""
+    updated = DatasetVersion.objects.filter(name=name).update(
+        version=F('version') + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        DatasetVersion.objects.get_or_create(name=name, defaults={'version': 1})
+
+
+def get_dataset_version(name):
+    """Return ``(version, updated_at)`` for a dataset with a single primary-key read."""
+    row = DatasetVersion.objects.filter(pk=name).values_list('version', 'updated_at').first()
+    if row is None:
+        return 0, None
+    return row
+
+
+async def aget_dataset_version(name):
+    row = await DatasetVersion.objects.filter(pk=name).values_list('version', 'updated_at').afirst()
+    if row is None:
+        return 0, None
+    return row
+
+
+def _make_etag(name, version, request):
+    # The same dataset version renders differently per URL (cursor, fields)
+    # and per negotiated media type, so both are part of the validator.
+    key = f"{name}:{version}:{request.get_full_path()}:{request.META.get('HTTP_ACCEPT', '')}"
+    return quote_etag(hashlib.sha1(key.encode()).hexdigest())
+
+
+def _validators(name, request, version, updated_at):
+    etag = _make_etag(name, version, request)
+    last_modified = int(updated_at.timestamp()) if updated_at else None
+    return etag, last_modified
+
+
+def _add_validators(response, etag, last_modified):
+    # Never attach validators to errors, or clients would cache them
+    if response.status_code == 200:
+        response.headers.setdefault('ETag', etag)
+        if last_modified is not None:
+            response.headers.setdefault('Last-Modified', http_date(last_modified))
+    return response
+
+
+def dataset_conditional(name):
+    """
+    Serve ETag/Last-Modified for a view whose output depends only on ``name``.
+
+    Matching ``If-None-Match``/``If-Modified-Since`` requests get a 304 before
+    the view runs, so the table is neither re-read nor re-serialized. Works
+    for both sync and async views. Apply it inside the rate limiting (below
+    ``throttle_classes`` or ``rate_limited``) so revalidations count too.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_inner(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view_func(request, *args, **kwargs)
+
+                etag, last_modified = _validators(name, request, *await aget_dataset_version(name))
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    response = _add_validators(await view_func(request, *args, **kwargs), etag, last_modified)
+                return response
+            return async_inner
+
+        @wraps(view_func)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            etag, last_modified = _validators(name, request, *get_dataset_version(name))
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = _add_validators(view_func(request, *args, **kwargs), etag, last_modified)
+            return response
+        return inner
+    return decorator
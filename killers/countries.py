@@ -0,0 +1,74 @@
+"""
+Country dimension for killers and suggestions.
+
+``birth_country`` and ``active_countries`` are free text ("USA",
+"United States, Canada", "England / Wales"). parsers.parse_countries()
+turns them into canonical names, and sync_countries() mirrors them into the
+``Killer Countries`` / ``Suggestion Countries`` link tables so per-country
+filters and counts use the ``(country, killer)`` index instead of
+scanning and re-parsing every row.
+"""
+from django.db.models import Count, Q
+
+from .models import Country, KillerCountry, SerialKiller, Suggestion, SuggestionCountry
+from .parsers import ACTIVE, BIRTH, country_links
+
+LINK_MODELS = {SerialKiller: (KillerCountry, 'killer_id'), Suggestion: (SuggestionCountry, 'suggestion_id')}
+
+
+def sync_countries(model, rows):
+    """
+    Make the link table of ``model`` (SerialKiller or Suggestion) match the
+    country fields of ``rows`` (dicts with ``id``, ``birth_country`` and
+    ``active_countries``). Costs a fixed handful of queries per call however
+    many rows are passed, so imports and backfills sync in batches.
+    """
+    link_model, owner = LINK_MODELS[model]
+    wanted = {row['id']: country_links(row) for row in rows}
+    if not wanted:
+        return
+
+    names = {name for links in wanted.values() for name, _ in links}
+    ids = {}
+    if names:
+        Country.objects.bulk_create([Country(name=name) for name in names], ignore_conflicts=True)
+        ids = dict(Country.objects.filter(name__in=names).values_list('name', 'id'))
+    wanted = {(pk, ids[name], role) for pk, links in wanted.items() for name, role in links}
+
+    stale = []
+    existing = link_model.objects.filter(**{f'{owner}__in': [row['id'] for row in rows]})
+    for link_id, pk, country_id, role in existing.values_list('id', owner, 'country_id', 'role'):
+        key = (pk, country_id, role)
+        if key in wanted:
+            wanted.discard(key)
+        else:
+            stale.append(link_id)
+    if stale:
+        link_model.objects.filter(id__in=stale).delete()
+    link_model.objects.bulk_create(
+        [link_model(**{owner: pk}, country_id=country_id, role=role) for pk, country_id, role in wanted],
+        ignore_conflicts=True,
+    )
+
+
+def country_counts(limit=None):
+    """
+    Killers per country in one GROUP BY over the link table, most first:
+    ``[{'name', 'killers', 'born', 'active'}]``. ``killers`` counts each
+    killer once even when they were both born and active there.
+    """
+    # Annotation names must not clash with the Country.killers relation
+    rows = (
+        Country.objects.annotate(
+            n_killers=Count('killer_links__killer', distinct=True),
+            n_born=Count('killer_links', filter=Q(killer_links__role=BIRTH)),
+            n_active=Count('killer_links', filter=Q(killer_links__role=ACTIVE)),
+        )
+        .filter(n_killers__gt=0)
+        .order_by('-n_killers', 'name')
+        .values_list('name', 'n_killers', 'n_born', 'n_active')
+    )
+    return [
+        {'name': name, 'killers': killers, 'born': born, 'active': active}
+        for name, killers, born, active in (rows[:limit] if limit else rows)
+    ]
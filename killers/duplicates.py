@@ -0,0 +1,275 @@
+"""
+Near-duplicate detection for incoming suggestions.
+
+NameIndex keeps character trigram postings over the normalised names
+(common name, full name and each alias) of every killer and open
+suggestion. A new suggestion is scored against it with the trigram
+similarity pg_trgm uses, ``shared / (|a| + |b| - shared)``, so
+"Jeffery Dahmer", "jeffrey dahmer" and "Dahmer, Jeffrey" land on the same
+record in a few milliseconds without touching the database.
+
+The best match at or above DUPLICATE_THRESHOLD is stored on the
+suggestion (``duplicate_of_killer`` / ``duplicate_of_suggestion`` and
+``duplicate_score``) for the admin and the dashboard to group by.
+"""
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import F
+
+from .conditional import KILLERS_DATASET, get_dataset_version
+from .models import SerialKiller, Suggestion
+
+DUPLICATE_THRESHOLD = 0.5
+
+DUPLICATE_COLUMNS = ('duplicate_of_killer_id', 'duplicate_of_suggestion_id', 'duplicate_score')
+
+KILLER, SUGGESTION = 'killer', 'suggestion'
+
+ALIAS_SEPARATORS = re.compile(r'[,;/|\n]+')
+NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(name):
+    """Casefold, strip accents and punctuation: ``"Ángel  O'Neil"`` -> ``"angel o neil"``."""
+    name = name.casefold()
+    if not name.isascii():
+        decomposed = unicodedata.normalize('NFKD', name)
+        name = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return NON_ALNUM.sub(' ', name).strip()
+
+
+def trigrams(normalized):
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in normalized.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def record_names(row):
+    """Every name a killer or suggestion row is known by."""
+    names = [row.get('common_name'), row.get('full_name')]
+    names += ALIAS_SEPARATORS.split(row.get('aliases') or '')
+    return [name.strip() for name in names if name and name.strip()]
+
+
+class NameIndex:
+    """
+    Trigram postings over record names, updated one record at a time.
+
+    Lookups use prefix filtering: a name with similarity >= t to a query of
+    ``n`` trigrams shares at least ``ceil(t * n)`` of them, so it must contain
+    one of the query's ``n - ceil(t * n) + 1`` rarest trigrams. Only those
+    postings are read, and each candidate is then scored exactly. Frequent
+    trigrams such as a leading "  j" are never scanned.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(set)  # trigram -> {variant id}
+        self._variants = {}  # variant id -> (key, display name, trigrams)
+        self._keys = {}  # key -> [variant id]
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key, names):
+        """Index ``names`` under ``key`` (``(KILLER | SUGGESTION, pk)``), replacing earlier ones."""
+        variants, seen = [], set()
+        for name in names:
+            normalized = normalize(name)
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                variants.append((name, trigrams(normalized)))
+        with self._lock:
+            self._remove(key)
+            ids = []
+            for name, grams in variants:
+                variant_id = self._next_id
+                self._next_id += 1
+                self._variants[variant_id] = (key, name, grams)
+                for gram in grams:
+                    self._postings[gram].add(variant_id)
+                ids.append(variant_id)
+            if ids:
+                self._keys[key] = ids
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        for variant_id in self._keys.pop(key, ()):
+            _, _, grams = self._variants.pop(variant_id)
+            for gram in grams:
+                postings = self._postings[gram]
+                postings.discard(variant_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def best_match(self, names, threshold=DUPLICATE_THRESHOLD):
+        """Return ``(key, matched name, score)`` for the most similar record, or None."""
+        best = None
+        with self._lock:
+            for name in names:
+                grams = trigrams(normalize(name))
+                if not grams:
+                    continue
+                rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+                prefix = len(grams) - math.ceil(threshold * len(grams)) + 1
+                candidates = set()
+                for gram in rarest[:prefix]:
+                    candidates.update(self._postings.get(gram, ()))
+                for variant_id in candidates:
+                    key, matched, other = self._variants[variant_id]
+                    shared = len(grams & other)
+                    score = shared / (len(grams) + len(other) - shared)
+                    if score >= threshold and (best is None or score > best[2]):
+                        best = (key, matched, score)
+        return best
+
+
+_index = None
+_index_version = None
+_last_suggestion_id = 0
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _add_suggestions(index, rows):
+    global _last_suggestion_id
+    for row in rows:
+        index.add((SUGGESTION, row['id']), record_names(row))
+        _last_suggestion_id = max(_last_suggestion_id, row['id'])
+
+
+def get_duplicate_index():
+    """
+    Return this process's NameIndex. It is rebuilt when the killers dataset
+    version changes and otherwise topped up with suggestions created since
+    the last check (by any worker), at most once every
+    ``KILLERS_DUPLICATE_REFRESH`` seconds.
+    """
+    global _index, _index_version, _last_suggestion_id, _checked_at
+    refresh = getattr(settings, 'KILLERS_DUPLICATE_REFRESH', 30)
+    if _index is not None and time.monotonic() - _checked_at < refresh:
+        return _index
+    # Imported here: the repositories record new suggestions in this index
+    from .repositories import get_repository
+
+    with _lock:
+        if _index is not None and time.monotonic() - _checked_at < refresh:
+            return _index
+        repository = get_repository('duplicates')
+        version, _ = get_dataset_version(KILLERS_DATASET)
+        if _index is None or version != _index_version:
+            index = NameIndex()
+            for row in repository.killer_names():
+                index.add((KILLER, row['id']), record_names(row))
+            _last_suggestion_id = 0
+            _add_suggestions(index, repository.open_suggestion_names(0))
+            _index, _index_version = index, version
+        else:
+            _add_suggestions(_index, repository.open_suggestion_names(_last_suggestion_id))
+        _checked_at = time.monotonic()
+        return _index
+
+
+def remember_suggestion(row):
+    """Index a suggestion created by this process right away."""
+    with _lock:
+        if _index is not None:
+            _add_suggestions(_index, [row])
+
+
+def reset_duplicate_index():
+    global _index, _index_version, _last_suggestion_id, _checked_at
+    with _lock:
+        _index, _index_version, _last_suggestion_id, _checked_at = None, None, 0, 0.0
+
+
+def duplicate_fields(data, index=None):
+    """Suggestion columns recording the best existing match for ``data``."""
+    try:
+        match = (index or get_duplicate_index()).best_match(record_names(data))
+    except Exception as e:
+        # Never lose a submission because the index couldn't be loaded
+        print(f"Error checking for duplicates: {e}")
+        return {}
+    if match is None:
+        return dict.fromkeys(DUPLICATE_COLUMNS)
+    (kind, pk), _, score = match
+    return {
+        'duplicate_of_killer_id': pk if kind == KILLER else None,
+        'duplicate_of_suggestion_id': pk if kind == SUGGESTION else None,
+        'duplicate_score': round(score, 3),
+    }
+
+
+def rescore_suggestions(batch_size=1000):
+    """
+    Recompute the likely duplicate of every open suggestion, replaying them
+    in submission order so each is compared with the killers and the
+    suggestions before it, as it was when submitted. Returns
+    ``(scored, flagged)``.
+    """
+    index = NameIndex()
+    for row in SerialKiller.objects.order_by().values('id', 'common_name', 'full_name', 'aliases').iterator():
+        index.add((KILLER, row['id']), record_names(row))
+
+    scored = flagged = 0
+    pending = []
+    rows = Suggestion.objects.exclude(submission_status='finished').order_by('id')
+    for row in rows.values('id', 'common_name', 'full_name', 'aliases').iterator():
+        fields = duplicate_fields(row, index)
+        pending.append(Suggestion(id=row['id'], **fields))
+        index.add((SUGGESTION, row['id']), record_names(row))
+        scored += 1
+        flagged += fields.get('duplicate_score') is not None
+        if len(pending) >= batch_size:
+            Suggestion.objects.bulk_update(pending, list(DUPLICATE_COLUMNS))
+            pending = []
+    if pending:
+        Suggestion.objects.bulk_update(pending, list(DUPLICATE_COLUMNS))
+    reset_duplicate_index()
+    return scored, flagged
+
+
+def duplicate_groups(limit=20):
+    """
+    Open suggestions with a likely duplicate, grouped by the record they
+    match, best matches first: ``[{'kind', 'id', 'name', 'suggestions'}]``.
+    """
+    rows = (
+        Suggestion.objects.exclude(submission_status='finished')
+        .filter(duplicate_score__isnull=False)
+        .order_by('-duplicate_score')
+        .values(
+            'id', 'common_name', 'duplicate_score', 'duplicate_of_killer_id', 'duplicate_of_suggestion_id',
+            killer_name=F('duplicate_of_killer__common_name'),
+            suggestion_name=F('duplicate_of_suggestion__common_name'),
+        )[:limit * 5]
+    )
+    groups = {}
+    for row in rows:
+        if row['duplicate_of_killer_id'] is not None:
+            key = (KILLER, row['duplicate_of_killer_id'], row['killer_name'])
+        else:
+            key = (SUGGESTION, row['duplicate_of_suggestion_id'], row['suggestion_name'])
+        if key not in groups and len(groups) >= limit:
+            continue
+        groups.setdefault(key, []).append(
+            {'id': row['id'], 'common_name': row['common_name'], 'score': row['duplicate_score']}
+        )
+    return [
+        {'kind': kind, 'id': pk, 'name': name, 'suggestions': suggestions}
+        for (kind, pk, name), suggestions in groups.items()
+    ]
@@ -0,0 +1,75 @@
+import csv
+
+from .models import SerialKiller
+from .renderers import dumps
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = tuple(f.attname for f in SerialKiller._meta.concrete_fields)
+
+
+def iter_killer_rows(chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield every killer as a dict, reading ``chunk_size`` rows per query.
+
+    Chunks are taken by primary-key keyset rather than a server-side cursor:
+    the database is reached through Supabase's transaction-mode pooler, which
+    cannot hold a named cursor open across statements.
+    """
+    queryset = SerialKiller.objects.order_by('pk').values(*EXPORT_FIELDS)
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(chunk[:chunk_size])
+        if not rows:
+            return
+        yield from rows
+        last_pk = rows[-1]['id']
+
+
+async def aiter_killer_rows(chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Async iter_killer_rows() for ASGI: Django buffers a sync iterator passed to
+    StreamingHttpResponse into memory before sending it, an async one is
+    streamed a chunk at a time.
+    """
+    queryset = SerialKiller.objects.order_by('pk').values(*EXPORT_FIELDS)
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = [row async for row in chunk[:chunk_size]]
+        if not rows:
+            return
+        for row in rows:
+            yield row
+        last_pk = rows[-1]['id']
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield dumps(row) + b'\n'
+
+
+async def andjson_lines(rows):
+    async for row in rows:
+        yield dumps(row) + b'\n'
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows, fields=EXPORT_FIELDS):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[f] for f in fields])
+
+
+async def acsv_lines(rows, fields=EXPORT_FIELDS):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    async for row in rows:
+        yield writer.writerow([row[f] for f in fields])
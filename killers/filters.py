@@ -0,0 +1,117 @@
+from django.db.models import Exists, OuterRef
+
+from .models import KillerCountry, KillerMoTag, SerialKiller
+from .parsers import MO_TAG_CHOICES, canonical_country
+
+# Empty inner embeds through the link tables, per filter: they keep only
+# killers with a matching link (see apply_filters) without adding anything
+# to the returned rows
+FILTER_EMBEDS = {
+    'country': 'Killer Countries!inner(Countries!inner())',
+    'mo': 'Killer MO Tags!inner()',
+}
+
+
+def parse_year_range(raw):
+    """Parse ``"1970,1980"`` into ``(1970, 1980)``."""
+    parts = [p.strip() for p in raw.split(',')]
+    if len(parts) != 2:
+        raise ValueError("active_between must be two years, e.g. active_between=1970,1980.")
+    try:
+        start, end = int(parts[0]), int(parts[1])
+    except ValueError:
+        raise ValueError("active_between years must be integers.")
+    if start > end:
+        raise ValueError("active_between start year must not be after the end year.")
+    return start, end
+
+
+def parse_choice_list(name, raw, choices):
+    """Parse ``"a,b"`` into a list of values, each of which must be a valid choice."""
+    values = [v.strip() for v in raw.split(',') if v.strip()]
+    allowed = [value for value, _ in choices]
+    invalid = [v for v in values if v not in allowed]
+    if invalid or not values:
+        raise ValueError(f"{name} must be one or more of: {', '.join(allowed)}.")
+    return values
+
+
+def parse_non_negative_int(name, raw):
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer.")
+    if value < 0:
+        raise ValueError(f"{name} must not be negative.")
+    return value
+
+
+def parse_killer_filters(params):
+    """Validate the filter query parameters of the killers listing."""
+    filters = {}
+    if params.get('active_between'):
+        filters['active_between'] = parse_year_range(params['active_between'])
+    if params.get('status'):
+        filters['status'] = parse_choice_list('status', params['status'], SerialKiller.STATUS_CHOICES)
+    if params.get('gender'):
+        filters['gender'] = parse_choice_list('gender', params['gender'], SerialKiller.GENDER_CHOICES)
+    if params.get('birth_country'):
+        filters['birth_country'] = params['birth_country'].strip()
+    if params.get('country'):
+        country = canonical_country(params['country'])
+        if country is None:
+            raise ValueError("country must not be blank.")
+        filters['country'] = country
+    if params.get('mo'):
+        filters['mo'] = parse_choice_list('mo', params['mo'], MO_TAG_CHOICES)
+    if params.get('min_proven_victims'):
+        filters['min_proven_victims'] = parse_non_negative_int('min_proven_victims', params['min_proven_victims'])
+    return filters
+
+
+def filter_embeds(filters):
+    """Embedded resources the PostgREST select list needs for ``filters``."""
+    return ''.join(f',{embed}' for name, embed in FILTER_EMBEDS.items() if name in filters)
+
+
+def apply_filters(query, filters):
+    """Push validated filters down to PostgREST (select with filter_embeds() first)."""
+    if 'active_between' in filters:
+        start, end = filters['active_between']
+        # Active periods overlapping [start, end]
+        query = query.lte('active_start_year', end).gte('active_end_year', start)
+    for column in ('status', 'gender'):
+        if column in filters:
+            query = query.in_(column, filters[column])
+    if 'birth_country' in filters:
+        query = query.eq('birth_country', filters['birth_country'])
+    if 'country' in filters:
+        query = query.eq('Killer Countries.Countries.name', filters['country'])
+    if 'mo' in filters:
+        query = query.in_('Killer MO Tags.tag', filters['mo'])
+    if 'min_proven_victims' in filters:
+        query = query.gte('proven_victims', filters['min_proven_victims'])
+    return query
+
+
+def filter_queryset(queryset, filters):
+    """Apply validated filters to a SerialKiller queryset."""
+    if 'active_between' in filters:
+        start, end = filters['active_between']
+        queryset = queryset.filter(active_start_year__lte=end, active_end_year__gte=start)
+    for column in ('status', 'gender'):
+        if column in filters:
+            queryset = queryset.filter(**{f'{column}__in': filters[column]})
+    if 'birth_country' in filters:
+        queryset = queryset.filter(birth_country=filters['birth_country'])
+    if 'country' in filters:
+        # Semi-join on the (country, killer) index; no duplicate rows when a
+        # killer was both born and active there
+        links = KillerCountry.objects.filter(killer=OuterRef('pk'), country__name=filters['country'])
+        queryset = queryset.filter(Exists(links))
+    if 'mo' in filters:
+        tagged = KillerMoTag.objects.filter(killer=OuterRef('pk'), tag__in=filters['mo'])
+        queryset = queryset.filter(Exists(tagged))
+    if 'min_proven_victims' in filters:
+        queryset = queryset.filter(proven_victims__gte=filters['min_proven_victims'])
+    return queryset
@@ -0,0 +1,135 @@
+import csv
+import json
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .conditional import KILLERS_DATASET, bump_dataset_version
+from .countries import sync_countries
+from .models import SerialKiller, Suggestion
+from .mo_tags import sync_mo_tags
+from .parsers import COUNTRY_FIELDS, DERIVED_FIELDS, apply_derived_fields
+from .stats import apply_deltas, contributions_for, diff
+
+# Rows are matched on this column when upserting
+NATURAL_KEY = 'common_name'
+
+IMPORT_MODELS = {
+    'killers': SerialKiller,
+    'suggestions': Suggestion,
+}
+
+
+def import_fields(model):
+    """Columns a row may set: editable, non-relational concrete fields."""
+    return {
+        f.name: f for f in model._meta.concrete_fields
+        if f.editable and not f.primary_key and not f.is_relation
+    }
+
+
+def read_rows(path, fmt=None):
+    """Yield dicts from a CSV (with header) or NDJSON file; ``fmt`` defaults to the extension."""
+    fmt = fmt or ('csv' if str(path).lower().endswith('.csv') else 'ndjson')
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def clean_row(model, row, fields=None):
+    """
+    Convert and validate one input row against the model's fields, including
+    their choices. Empty strings become NULL. Raises ValidationError.
+    """
+    if not isinstance(row, dict):
+        # An NDJSON line holding a list, string or number rather than an object
+        raise ValidationError(f"Expected a JSON object, got {type(row).__name__}.")
+    fields = fields or import_fields(model)
+    # Other model columns (id, timestamps, derived values) are accepted so
+    # files from the export endpoints round-trip, but they are not imported
+    known = {f.attname for f in model._meta.concrete_fields}
+    unknown = [k for k in row if k not in known]
+    if unknown:
+        raise ValidationError(f"Unknown column(s): {', '.join(unknown)}")
+    cleaned, errors = {}, {}
+    for name, value in row.items():
+        if name not in fields:
+            continue
+        if value == '' and fields[name].null:
+            value = None
+        try:
+            cleaned[name] = fields[name].clean(value, None)
+        except ValidationError as e:
+            errors[name] = e.messages
+    if NATURAL_KEY not in cleaned and NATURAL_KEY not in errors:
+        errors[NATURAL_KEY] = ["This field is required."]
+    if errors:
+        raise ValidationError(errors)
+    return cleaned
+
+
+@transaction.atomic
+def bulk_write(model, rows, upsert=False):
+    """
+    Write cleaned rows in one transaction with a single bulk_create (plus one
+    bulk_update when upserting by ``NATURAL_KEY``).
+
+    bulk_create/bulk_update skip save() and signals, so the derived columns,
+    dashboard counters, country links, MO tags and dataset version are maintained here. Returns
+    ``(created, updated)`` counts.
+    """
+    existing = {}
+    if upsert:
+        names = {row[NATURAL_KEY] for row in rows}
+        # Lowest id wins when the table already holds duplicate names; the
+        # row locks keep concurrent edits from being lost under the update
+        matches = model.objects.select_for_update().filter(**{f'{NATURAL_KEY}__in': names})
+        for obj in matches.order_by('-pk'):
+            existing[getattr(obj, NATURAL_KEY)] = obj
+
+    deltas = Counter()
+    to_create, to_update, columns = [], {}, set()
+    pending = {}  # natural key -> unsaved instance created earlier in this batch
+    for row in rows:
+        key = row[NATURAL_KEY]
+        obj = pending.get(key) or to_update.get(key) or existing.get(key)
+        if obj is None:
+            obj = model(**row)
+            to_create.append(obj)
+            if upsert:
+                pending[key] = obj
+        else:
+            if obj.pk is not None and key not in to_update:
+                # Remove what the stored row contributed before overwriting it
+                deltas.update(diff(contributions_for(obj), {}))
+                to_update[key] = obj
+            for name, value in row.items():
+                setattr(obj, name, value)
+            columns.update(row)
+        apply_derived_fields(obj)
+
+    now = timezone.now()
+    for obj in to_update.values():
+        obj.updated_at = now
+    columns |= set(DERIVED_FIELDS) | {'updated_at'}
+
+    model.objects.bulk_create(to_create)
+    if to_update:
+        model.objects.bulk_update(to_update.values(), sorted(columns))
+    for obj in [*to_create, *to_update.values()]:
+        deltas.update(contributions_for(obj))
+    apply_deltas(deltas)
+    if model in (SerialKiller, Suggestion):
+        sync_countries(model, [
+            {'id': obj.pk, **{f: getattr(obj, f) for f in COUNTRY_FIELDS}} for obj in [*to_create, *to_update.values()]
+        ])
+    if model is SerialKiller:
+        sync_mo_tags([{'id': obj.pk, 'modus_operandi': obj.modus_operandi} for obj in [*to_create, *to_update.values()]])
+        transaction.on_commit(lambda: bump_dataset_version(KILLERS_DATASET))
+    return len(to_create), len(to_update)
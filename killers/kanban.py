@@ -0,0 +1,129 @@
+"""
+Paginated kanban columns for the dashboard.
+
+Each submission kind (suggestions, modifications) has one column per
+submission status. A column is read newest first in pages keyed on
+``(created_at, id)`` behind the ``submission_status`` equality, which the
+``*_status_created`` indexes serve directly, so a page costs the
+same however many finished items have piled up.
+"""
+from django.db.models import F
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from .models import Modification, Suggestion
+from .pagination import Ordering, apply_keyset, encode_cursor, keyset_queryset
+
+# Cards rendered into each column by the dashboard page itself
+COLUMN_PAGE_SIZE = 20
+MAX_COLUMN_PAGE_SIZE = 100
+
+STATUSES = ('new', 'in_progress', 'finished')
+STATUS_LABELS = dict(Suggestion.SUBMISSION_STATUS_CHOICES)
+
+KINDS = {'suggestions': Suggestion, 'modifications': Modification}
+TABLES = {'suggestions': 'Suggestions', 'modifications': 'Modifications'}
+
+# Value of the ``type`` field the status update views expect
+CARD_TYPES = {'suggestions': 'Suggestion', 'modifications': 'Correction'}
+
+CARD_ORDERING = Ordering('created_at', True, True)
+
+CARD_SELECT = {
+    'suggestions': 'id,common_name,full_name,birth_country,submission_status,created_at,duplicate_score',
+    'modifications': 'id,suggestion_text,submission_status,created_at,killer:killer_id(common_name)',
+}
+CARD_VALUES = {
+    'suggestions': (
+        'id', 'common_name', 'full_name', 'birth_country', 'submission_status', 'created_at', 'duplicate_score',
+    ),
+    'modifications': ('id', 'suggestion_text', 'submission_status', 'created_at'),
+}
+
+
+def parse_column(kind, status):
+    if kind not in KINDS:
+        raise ValueError(f"type must be one of: {', '.join(KINDS)}.")
+    if status not in STATUSES:
+        raise ValueError(f"status must be one of: {', '.join(STATUSES)}.")
+    return kind, status
+
+
+def parse_column_page_size(raw):
+    if not raw:
+        return COLUMN_PAGE_SIZE
+    try:
+        size = int(raw)
+    except ValueError:
+        raise ValueError("page_size must be an integer.")
+    if size < 1:
+        raise ValueError("page_size must be positive.")
+    return min(size, MAX_COLUMN_PAGE_SIZE)
+
+
+def card_query(client, kind, status, cursor, page_size):
+    """Un-executed PostgREST query for one column page (works on sync and async clients)."""
+    query = client.table(TABLES[kind]).select(CARD_SELECT[kind]).eq('submission_status', status)
+    return apply_keyset(query, cursor, page_size, CARD_ORDERING)
+
+
+def card_queryset(kind, status, cursor, page_size):
+    """ORM equivalent of card_query(), evaluated to a list of rows."""
+    queryset = KINDS[kind].objects.filter(submission_status=status)
+    columns = CARD_VALUES[kind]
+    if kind == 'modifications':
+        rows = keyset_queryset(queryset, cursor, page_size, CARD_ORDERING).values(
+            *columns, killer_name=F('killer__common_name')
+        )
+    else:
+        rows = keyset_queryset(queryset, cursor, page_size, CARD_ORDERING).values(*columns)
+    return list(rows)
+
+
+def to_card(kind, row):
+    """Normalise a PostgREST or ORM row into the dashboard's card dict."""
+    card = dict(row)
+    card['type'] = CARD_TYPES[kind]
+    if kind == 'modifications' and 'killer_name' not in card:
+        # Killer name is embedded through the killer_id foreign key
+        killer = card.pop('killer', None) or {}
+        card['killer_name'] = killer.get('common_name', 'Unknown ID')
+    if card.get('created_at') is not None and not isinstance(card['created_at'], str):
+        card['created_at'] = card['created_at'].isoformat()
+    return card
+
+
+def column_page(kind, status, rows, page_size):
+    """Trim the extra row and return ``{'next': url, 'results': cards}``."""
+    cards = [to_card(kind, row) for row in rows[:page_size]]
+    next_url = None
+    if len(rows) > page_size:
+        params = {
+            'type': kind, 'status': status, 'page_size': page_size,
+            'cursor': encode_cursor(cards[-1], CARD_ORDERING),
+        }
+        next_url = f"{reverse('dashboard_cards')}?{urlencode(params)}"
+    return {'next': next_url, 'results': cards}
+
+
+def board(columns, submission_stats, page_size=COLUMN_PAGE_SIZE):
+    """
+    Template context for the kanban boards: ``{kind: [column, ...]}`` built
+    from ``{(kind, status): rows}`` and the dashboard's status counters.
+    """
+    counts = {
+        ('suggestions', 'new'): submission_stats['suggestions_new'],
+        ('suggestions', 'in_progress'): submission_stats['suggestions_progress'],
+        ('suggestions', 'finished'): submission_stats['suggestions_done'],
+        ('modifications', 'new'): submission_stats['corrections_new'],
+        ('modifications', 'in_progress'): submission_stats['corrections_progress'],
+        ('modifications', 'finished'): submission_stats['corrections_done'],
+    }
+    return {
+        kind: [
+            {'status': status, 'label': STATUS_LABELS[status], 'count': counts[(kind, status)],
+             **column_page(kind, status, columns[(kind, status)], page_size)}
+            for status in STATUSES
+        ]
+        for kind in KINDS
+    }
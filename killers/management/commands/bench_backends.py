@@ -0,0 +1,64 @@
+import itertools
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from killers.models import Suggestion
+from killers.pagination import decode_cursor, encode_cursor
+from killers.repositories import BACKENDS
+
+BENCH_PREFIX = '__bench__'
+
+
+class Command(BaseCommand):
+    help = "Compare the PostgREST and ORM data backends on listing, search and inserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30, help='Runs per operation')
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--query', default='bundy', help='Search term')
+
+    def handle(self, *args, **options):
+        iterations, page_size = options['iterations'], options['page_size']
+        results = {}
+        try:
+            for name, backend_class in BACKENDS.items():
+                repo = backend_class()
+                # The cursor after the first page exercises the keyset filter path
+                first_page = repo.list_killers(None, {}, None, page_size)
+                deep_cursor = decode_cursor(encode_cursor(first_page[-1])) if first_page else None
+                counter = itertools.count()
+
+                results[name] = {
+                    'list (first page)': self._time(lambda: repo.list_killers(None, {}, None, page_size), iterations),
+                    'list (next page)': self._time(lambda: repo.list_killers(None, {}, deep_cursor, page_size), iterations),
+                    'search': self._time(lambda: repo.search_killers(options['query'], 20), iterations),
+                    'insert suggestion': self._time(
+                        lambda: repo.create_suggestion({
+                            'common_name': f"{BENCH_PREFIX}{name}-{next(counter)}",
+                            'years_active': '1970-1980',
+                            'submission_status': 'new',
+                        }),
+                        iterations,
+                    ),
+                }
+        finally:
+            # Deleting through the ORM keeps the dashboard counters consistent
+            for suggestion in Suggestion.objects.filter(common_name__startswith=BENCH_PREFIX):
+                suggestion.delete()
+
+        operations = next(iter(results.values())).keys() if results else []
+        for operation in operations:
+            row = ' | '.join(f"{name}: {results[name][operation]:7.2f} ms" for name in results)
+            winner = min(results, key=lambda name: results[name][operation])
+            self.stdout.write(f"{operation:>18}: {row} -> {winner}")
+
+    def _time(self, fn, iterations):
+        fn()  # warm-up (connection setup, plan cache)
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,162 @@
+import asyncio
+import datetime
+import json
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_databases, teardown_databases
+
+from killers.benchmarking import FakePostgrest, seed_database, tables_from_database
+from killers.management.commands.loadtest import run_load
+from killers.models import DashboardStat, Modification, SerialKiller, Suggestion
+
+DEFAULT_PATHS = (
+    '/api/killers/',
+    '/api/killers/?page_size=200&ordering=-proven_victims',
+    '/api/killers/?status=imprisoned&gender=female',
+    '/api/killers/search/?q=subject 0001',
+    '/api/killers/autocomplete/?q=sub',
+    '/api/killers/Subject 000042/',
+    '/api/suggest/?type=correction',
+    '/api/dashboard/',
+)
+
+DEFAULT_SERVER = '{python} manage.py runserver --noreload {host}:{port}'
+
+# Effectively disable throttling for the server under test
+UNTHROTTLED = {
+    f'KILLERS_RATE_LIMIT_{scope}': '100000000/s'
+    for scope in ('LIST', 'SEARCH', 'AUTOCOMPLETE', 'EXPORT')
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Offline endpoint benchmark: seeds a throwaway test database at each dataset size, serves the "
+        "Supabase REST API from an in-process fake, starts the app server against both and drives every "
+        "path concurrently. Prints p50/p95/p99 latency and throughput per path as JSON. Point the "
+        "SUPABASE_DB_* settings at a local Postgres (SUPABASE_DB_SSLMODE=disable) first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000', help='Comma-separated killer counts to seed')
+        parser.add_argument('--requests', type=int, default=300, help='Requests per path')
+        parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight')
+        parser.add_argument('--path', action='append', dest='paths', help='Path to benchmark (repeatable)')
+        parser.add_argument('--server', default=DEFAULT_SERVER,
+                            help='App server command; {python}, {host} and {port} are substituted '
+                                 '(e.g. "uvicorn config.asgi:application --host {host} --port {port}")')
+        parser.add_argument('--output', help='Write the JSON here instead of stdout')
+        parser.add_argument('--keepdb', action='store_true', help='Reuse the test database between runs')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers.")
+        paths = options['paths'] or DEFAULT_PATHS
+
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        try:
+            results = {str(size): self._run_size(size, paths, options) for size in sizes}
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+
+        report = {
+            'commit': self._commit(),
+            'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'server': options['server'],
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'results': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(f"Wrote {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def _run_size(self, size, paths, options):
+        self.stderr.write(f"Seeding {size} killers...")
+        self._reset_tables()
+        seed_database(size, suggestions=max(size // 10, 1), modifications=max(size // 10, 1))
+        fake = FakePostgrest(tables_from_database()).start()
+        host, port = '127.0.0.1', free_port()
+        server = self._start_server(options['server'], host, port, fake.url)
+        try:
+            base = f'http://{host}:{port}'
+            self._wait_ready(base, server)
+            results = {}
+            for path in paths:
+                result = asyncio.run(run_load([base + path], options['requests'], options['concurrency']))
+                self.stderr.write(
+                    f"  {path}: {result['throughput_rps']} req/s | p50 {result['p50_ms']} ms | "
+                    f"p95 {result['p95_ms']} ms | p99 {result['p99_ms']} ms | {result['errors']} errors"
+                )
+                results[path] = result
+            return results
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+            fake.stop()
+
+    def _reset_tables(self):
+        tables = [model._meta.db_table for model in (Modification, Suggestion, SerialKiller, DashboardStat)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"TRUNCATE {', '.join(connection.ops.quote_name(t) for t in tables)} RESTART IDENTITY CASCADE"
+            )
+
+    def _start_server(self, template, host, port, supabase_url):
+        env = {
+            **os.environ,
+            **UNTHROTTLED,
+            'SUPABASE_URL': supabase_url,
+            'SUPABASE_KEY': 'bench-anon-key',
+            'SUPABASE_DB_NAME': connection.settings_dict['NAME'],
+        }
+        command = template.format(python=shlex.quote(sys.executable), host=host, port=port)
+        return subprocess.Popen(
+            shlex.split(command), cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def _wait_ready(self, base, server, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"The app server exited with status {server.returncode}.")
+            try:
+                httpx.get(base + '/api/docs/', timeout=1)
+                return
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        raise CommandError(f"The app server did not start within {timeout}s.")
+
+    def _commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
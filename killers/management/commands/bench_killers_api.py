@@ -0,0 +1,50 @@
+import statistics
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from killers import services
+
+
+class Command(BaseCommand):
+    help = "Measure per-request latency of /api/killers/ with a fresh vs a pooled Supabase client."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Requests per mode')
+        parser.add_argument('--path', default='/api/killers/', help='Endpoint to benchmark')
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST='localhost')
+
+        # "fresh" reproduces the old behaviour: one create_client() per request
+        with mock.patch('killers.repositories.get_supabase_client', services.new_supabase_client):
+            fresh = self._run(client, options['path'], options['requests'])
+
+        services.close_supabase_client()
+        client.get(options['path'])  # warm the pool so the first handshake isn't counted
+        pooled = self._run(client, options['path'], options['requests'])
+
+        self._report('fresh client', fresh)
+        self._report('pooled client', pooled)
+        speedup = statistics.mean(fresh) / statistics.mean(pooled)
+        self.stdout.write(self.style.SUCCESS(f"Mean speedup: {speedup:.2f}x"))
+
+    def _run(self, client, path, count):
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            response = client.get(path)
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                self.stderr.write(f"{path} returned {response.status_code}")
+        return timings
+
+    def _report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+        self.stdout.write(
+            f"{label:>14}: mean {statistics.mean(timings):7.1f} ms | "
+            f"p50 {statistics.median(timings):7.1f} ms | p95 {p95:7.1f} ms"
+        )
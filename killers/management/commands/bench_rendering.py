@@ -0,0 +1,70 @@
+import datetime
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from killers.compression import BROTLI_QUALITY, brotli
+from killers.exports import iter_killer_rows
+from killers.renderers import OrjsonRenderer
+
+
+class Command(BaseCommand):
+    help = "Compare JSON serialization time and bytes on the wire for the full killers dataset."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=5, help='Serializations per renderer')
+        parser.add_argument('--synthetic', type=int, metavar='ROWS',
+                            help='Benchmark generated rows instead of reading the database')
+
+    def handle(self, *args, **options):
+        rows = self._synthetic_rows(options['synthetic']) if options['synthetic'] else list(iter_killer_rows())
+        self.stdout.write(f"{len(rows)} rows")
+
+        body = None
+        for renderer in (JSONRenderer(), OrjsonRenderer()):
+            timings = []
+            for _ in range(options['iterations']):
+                start = time.perf_counter()
+                body = renderer.render(rows)
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                f"{type(renderer).__name__:>15}: {statistics.median(timings):8.1f} ms, {len(body):>11,} bytes"
+            )
+
+        encodings = [('gzip', lambda data: compress_string(data))]
+        if brotli:
+            encodings.append(('br', lambda data: brotli.compress(data, quality=BROTLI_QUALITY)))
+        for name, compress in encodings:
+            start = time.perf_counter()
+            compressed = compress(body)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stdout.write(
+                f"{name:>15}: {elapsed:8.1f} ms, {len(compressed):>11,} bytes "
+                f"({len(compressed) / len(body):.0%} of uncompressed)"
+            )
+
+    def _synthetic_rows(self, count):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return [
+            {
+                'id': i,
+                'common_name': f"Subject {i}",
+                'full_name': f"Full Name Number {i}",
+                'aliases': f"Alias {i}, The Example {i % 97}",
+                'date_of_birth': datetime.date(1900 + i % 100, 1 + i % 12, 1 + i % 28),
+                'birth_country': ['United States', 'United Kingdom', 'Germany', 'Russia'][i % 4],
+                'gender': ['male', 'female'][i % 2],
+                'proven_victims': i % 40,
+                'possible_victims': f"{i % 40}-{i % 40 + 10}",
+                'years_active': f"{1950 + i % 60}-{1955 + i % 60}",
+                'modus_operandi': 'Strangulation; poisoning',
+                'status': 'imprisoned',
+                'notes': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 3,
+                'created_at': now,
+                'updated_at': now,
+            }
+            for i in range(count)
+        ]
@@ -0,0 +1,79 @@
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from killers.models import SerialKiller
+
+FIRST_NAMES = ['Ted', 'John', 'Harold', 'Aileen', 'Jeffrey', 'Andrei', 'Pedro', 'Luis', 'Dennis', 'Gary']
+SYLLABLES = ['bun', 'ga', 'ship', 'wuor', 'dah', 'chi', 'ka', 'lo', 'pez', 'ra', 'der', 'ridg', 'way', 'mer', 'nos', 'ti']
+
+
+class Command(BaseCommand):
+    help = "Seed synthetic killers inside a rolled-back transaction and time search_killers() lookups."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help='Synthetic rows to insert')
+        parser.add_argument('--queries', type=int, default=200, help='Lookups to time')
+        parser.add_argument('--limit', type=int, default=20, help='max_results passed to search_killers()')
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        with transaction.atomic():
+            self._seed(rng, options['rows'])
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE "Serial Killers"')
+
+            surnames = self._surnames
+            terms = [rng.choice(surnames) for _ in range(options['queries'] // 2)]
+            terms += [self._typo(rng, rng.choice(surnames)) for _ in range(options['queries'] - len(terms))]
+            timings = self._time(terms, options['limit'])
+
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN ANALYZE SELECT * FROM search_killers(%s, %s)', [surnames[0], options['limit']])
+                plan = '\n'.join(row[0] for row in cursor.fetchall())
+            transaction.set_rollback(True)
+
+        timings.sort()
+        self.stdout.write(f"rows: {options['rows']} | queries: {len(timings)}")
+        self.stdout.write(
+            f"mean {statistics.mean(timings):.2f} ms | p50 {statistics.median(timings):.2f} ms | "
+            f"p95 {timings[max(0, int(len(timings) * 0.95) - 1)]:.2f} ms | max {timings[-1]:.2f} ms"
+        )
+        self.stdout.write(plan)
+
+    def _seed(self, rng, rows):
+        self._surnames = []
+        batch = []
+        for i in range(rows):
+            last = ''.join(rng.choices(SYLLABLES, k=3)).title()
+            first = rng.choice(FIRST_NAMES)
+            if i % 100 == 0:
+                self._surnames.append(last)
+            suffix = ''.join(rng.choices(string.ascii_lowercase, k=6))
+            batch.append(SerialKiller(
+                common_name=f"{first} {last} {suffix}",
+                full_name=f"{first} {suffix.title()} {last}",
+                aliases=f"The {suffix.title()} Killer, {last} of {suffix}",
+            ))
+            if len(batch) == 5000:
+                SerialKiller.objects.bulk_create(batch)
+                batch = []
+        SerialKiller.objects.bulk_create(batch)
+
+    def _typo(self, rng, word):
+        i = rng.randrange(len(word))
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+
+    def _time(self, terms, limit):
+        timings = []
+        with connection.cursor() as cursor:
+            for term in terms:
+                start = time.perf_counter()
+                cursor.execute('SELECT id FROM search_killers(%s, %s)', [term, limit])
+                cursor.fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+        return timings
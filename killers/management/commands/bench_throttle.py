@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+
+from killers import throttling
+
+
+class Command(BaseCommand):
+    help = "Measure the per-request cost of the rate limit check for each bucket store."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100000)
+        parser.add_argument('--clients', type=int, default=1000, help='Distinct client addresses')
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        requests = [
+            factory.get('/api/killers/', REMOTE_ADDR=f'10.0.{i // 256}.{i % 256}')
+            for i in range(options['clients'])
+        ]
+        iterations = options['iterations']
+        # A limit high enough that every check takes the "allowed" path
+        limits = {'bench': f'{iterations * 10}/s'}
+
+        for store in throttling.STORES:
+            with override_settings(KILLERS_RATE_LIMITS=limits, KILLERS_RATE_LIMIT_STORE=store):
+                throttling.get_store().clear()
+                start = time.perf_counter()
+                for i in range(iterations):
+                    throttling.check_rate(requests[i % len(requests)], 'bench')
+                elapsed = time.perf_counter() - start
+            self.stdout.write(f"{store:>6}: {elapsed / iterations * 1e6:6.2f} µs per check")
@@ -0,0 +1,91 @@
+import json
+import os
+import time
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from killers.importers import IMPORT_MODELS, bulk_write, clean_row, import_fields, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-load serial killers or suggestions from a CSV or NDJSON file. Rows are "
+        "validated against the model fields and written in batches, one transaction each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with header row) or NDJSON file')
+        parser.add_argument('--model', choices=sorted(IMPORT_MODELS), default='killers')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per transaction')
+        parser.add_argument('--upsert', action='store_true', help='Update rows whose common_name already exists')
+        parser.add_argument('--skip-invalid', action='store_true', help='Report and skip invalid rows instead of stopping')
+        parser.add_argument('--resume', action='store_true', help='Continue after the last committed batch')
+        parser.add_argument('--checkpoint', help='Progress file (default: <path>.checkpoint)')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive.")
+        model = IMPORT_MODELS[options['model']]
+        fields = import_fields(model)
+        checkpoint = options['checkpoint'] or f"{path}.checkpoint"
+        skip = self._read_checkpoint(checkpoint, path) if options['resume'] else 0
+        if skip:
+            self.stdout.write(f"Resuming after row {skip}.")
+
+        self.created = self.updated = self.invalid = 0
+        self.start = time.perf_counter()
+        batch, consumed = [], skip
+        try:
+            for consumed, row in enumerate(islice(read_rows(path, options['format']), skip, None), start=skip + 1):
+                try:
+                    batch.append(clean_row(model, row, fields))
+                except ValidationError as e:
+                    if not options['skip_invalid']:
+                        raise CommandError(f"Row {consumed}: {'; '.join(e.messages)}")
+                    self.invalid += 1
+                    self.stderr.write(f"Skipping row {consumed}: {'; '.join(e.messages)}")
+                if len(batch) >= options['batch_size']:
+                    self._flush(model, batch, options['upsert'], checkpoint, path, consumed)
+                    batch = []
+        except (ValueError, UnicodeDecodeError) as e:
+            raise CommandError(f"Could not read row {consumed + 1}: {e}")
+        self._flush(model, batch, options['upsert'], checkpoint, path, consumed)
+
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        elapsed = time.perf_counter() - self.start
+        written = self.created + self.updated
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {written} {options['model']} ({self.created} created, {self.updated} updated, "
+            f"{self.invalid} skipped) in {elapsed:.1f}s ({written / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
+
+    def _flush(self, model, batch, upsert, checkpoint, path, consumed):
+        if batch:
+            created, updated = bulk_write(model, batch, upsert=upsert)
+            self.created += created
+            self.updated += updated
+        # Only record progress once the batch is committed
+        with open(checkpoint, 'w') as f:
+            json.dump({'path': os.path.abspath(path), 'rows': consumed}, f)
+        elapsed = time.perf_counter() - self.start
+        written = self.created + self.updated
+        self.stdout.write(f"  {consumed} rows read, {written} written ({written / elapsed if elapsed else 0:.0f} rows/s)")
+
+    def _read_checkpoint(self, checkpoint, path):
+        try:
+            with open(checkpoint) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            raise CommandError(f"Checkpoint {checkpoint} is corrupt; remove it to start over.")
+        if state.get('path') != os.path.abspath(path):
+            raise CommandError(f"Checkpoint {checkpoint} belongs to {state.get('path')}.")
+        return int(state['rows'])
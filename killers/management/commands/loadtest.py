@@ -0,0 +1,76 @@
+import asyncio
+import json
+import time
+
+import httpx
+from django.core.management.base import BaseCommand
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_load(urls, total, concurrency, timeout=30.0):
+    """Issue ``total`` GETs round-robin over ``urls`` with ``concurrency`` in flight."""
+    latencies, errors = [], 0
+    counter = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(urls[i % len(urls)])
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive concurrent GET load at a running server and report throughput and latency. "
+        "Run it once against the WSGI deployment (e.g. gunicorn config.wsgi) and once against "
+        "the ASGI one (e.g. uvicorn config.asgi:application) with the same arguments to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help='Absolute URLs to request (round-robin)')
+        parser.add_argument('--requests', type=int, default=2000, help='Total requests')
+        parser.add_argument('--concurrency', type=int, default=200, help='Requests in flight')
+        parser.add_argument('--label', default='', help='Label stored with the JSON result')
+        parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+
+    def handle(self, *args, **options):
+        result = asyncio.run(run_load(options['urls'], options['requests'], options['concurrency']))
+        result['label'] = options['label']
+        if options['json']:
+            self.stdout.write(json.dumps(result))
+            return
+        self.stdout.write(
+            f"{options['label'] or 'run'}: {result['throughput_rps']} req/s over {result['requests']} requests "
+            f"({result['errors']} errors) | p50 {result['p50_ms']} ms | p95 {result['p95_ms']} ms | "
+            f"p99 {result['p99_ms']} ms"
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from killers.stats import rebuild_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard counter table from the Serial Killers, Suggestions and Modifications tables."
+
+    def handle(self, *args, **options):
+        rows = rebuild_dashboard_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt dashboard stats ({rows} counters)."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from killers.duplicates import rescore_suggestions
+
+
+class Command(BaseCommand):
+    help = "Find the likely duplicate of every open suggestion and store it on the suggestion."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Suggestions written per UPDATE.")
+
+    def handle(self, *args, **options):
+        scored, flagged = rescore_suggestions(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Scored {scored} open suggestions; {flagged} have a likely duplicate."))
@@ -0,0 +1,229 @@
+"""
+Per-request performance telemetry exposed in Prometheus text format.
+
+MetricsMiddleware opens a RequestMetrics for every request in a context
+variable. While it is active, ORM queries (through an execute wrapper
+installed on every new connection) and Supabase HTTP calls (through
+services.TimedTransport) add their count and duration to it. When the
+response is finished the totals are observed into histograms labelled
+with the view name.
+
+Histograms are kept per process; with several workers each one serves
+its own ``/metrics`` (scrape every worker, or let Prometheus sum them).
+"""
+import contextvars
+import hmac
+import threading
+import time
+from bisect import bisect_left
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label value."""
+
+    def __init__(self, name, documentation, buckets, label='view'):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label = label
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                # Per-bucket (non-cumulative) counts, then +Inf, sum
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+        for label_value, (counts, total) in sorted(snapshot.items()):
+            label = f'{self.label}="{_escape(label_value)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label}}} {total}')
+            lines.append(f'{self.name}_count{{{label}}} {cumulative}')
+        return '\n'.join(lines)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUEST_DURATION = Histogram('killers_request_duration_seconds', 'Wall time per request.', DURATION_BUCKETS)
+DB_QUERIES = Histogram('killers_db_queries', 'ORM queries per request.', COUNT_BUCKETS)
+DB_DURATION = Histogram('killers_db_duration_seconds', 'Time spent in ORM queries per request.', DURATION_BUCKETS)
+SUPABASE_CALLS = Histogram('killers_supabase_calls', 'Supabase HTTP calls per request.', COUNT_BUCKETS)
+SUPABASE_DURATION = Histogram(
+    'killers_supabase_duration_seconds', 'Time spent in Supabase HTTP calls per request.', DURATION_BUCKETS
+)
+RESPONSE_BYTES = Histogram('killers_response_bytes', 'Response body size.', BYTES_BUCKETS)
+
+HISTOGRAMS = (REQUEST_DURATION, DB_QUERIES, DB_DURATION, SUPABASE_CALLS, SUPABASE_DURATION, RESPONSE_BYTES)
+
+
+class RequestMetrics:
+    """Running totals for one request; shared with the fan-out threads it starts."""
+
+    __slots__ = ('started', 'db_queries', 'db_time', 'supabase_calls', 'supabase_time', 'response_bytes', '_lock')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = self.supabase_calls = self.response_bytes = 0
+        self.db_time = self.supabase_time = 0.0
+        self._lock = threading.Lock()
+
+    def add_query(self, seconds):
+        with self._lock:
+            self.db_queries += 1
+            self.db_time += seconds
+
+    def add_supabase_call(self, seconds):
+        with self._lock:
+            self.supabase_calls += 1
+            self.supabase_time += seconds
+
+
+_current = contextvars.ContextVar('killers_request_metrics', default=None)
+
+
+def current_metrics():
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(time.perf_counter() - start)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # Installed once per connection so queries from any thread are seen
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def observe(view, metrics):
+    REQUEST_DURATION.observe(view, time.perf_counter() - metrics.started)
+    DB_QUERIES.observe(view, metrics.db_queries)
+    DB_DURATION.observe(view, metrics.db_time)
+    SUPABASE_CALLS.observe(view, metrics.supabase_calls)
+    SUPABASE_DURATION.observe(view, metrics.supabase_time)
+    RESPONSE_BYTES.observe(view, metrics.response_bytes)
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return (match.view_name or match._func_path) if match else 'unresolved'
+
+
+def _count_bytes(chunks, on_done):
+    total = 0
+    try:
+        for chunk in chunks:
+            total += len(chunk)
+            yield chunk
+    finally:
+        on_done(total)
+
+
+async def _acount_bytes(chunks, on_done):
+    total = 0
+    try:
+        async for chunk in chunks:
+            total += len(chunk)
+            yield chunk
+    finally:
+        on_done(total)
+
+
+class MetricsMiddleware:
+    """Record wall time, ORM and Supabase usage and response size per view."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        metrics = RequestMetrics()
+        _current.set(metrics)
+        return self._finish(request, metrics, self.get_response(request))
+
+    async def _acall(self, request):
+        metrics = RequestMetrics()
+        _current.set(metrics)
+        return self._finish(request, metrics, await self.get_response(request))
+
+    def _finish(self, request, metrics, response):
+        view = _view_name(request)
+        if not response.streaming:
+            metrics.response_bytes = len(response.content)
+            _current.set(None)
+            observe(view, metrics)
+            return response
+
+        # Streaming bodies are produced after the middleware returns; observe
+        # once the last chunk has been sent.
+        def done(total):
+            metrics.response_bytes = total
+            _current.set(None)
+            observe(view, metrics)
+
+        if response.is_async:
+            response.streaming_content = _acount_bytes(response.streaming_content, done)
+        else:
+            response.streaming_content = _count_bytes(response.streaming_content, done)
+        return response
+
+
+def render_metrics():
+    return '\n'.join(h.render() for h in HISTOGRAMS) + '\n'
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Open to staff users, or to anyone presenting
+    ``Authorization: Bearer <settings.KILLERS_METRICS_TOKEN>`` when it is set.
+    """
+    token = getattr(settings, 'KILLERS_METRICS_TOKEN', '')
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    authorized = bool(token) and hmac.compare_digest(header, f'Bearer {token}')
+    if not authorized and not (request.user.is_active and request.user.is_staff):
+        return HttpResponseForbidden('Staff only.')
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:20
+
+from django.db import migrations, models
+
+
+def create_killers_version(apps, schema_editor):
+    DatasetVersion = apps.get_model('killers', 'DatasetVersion')
+    DatasetVersion.objects.get_or_create(name='killers')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('killers', '0007_create_staff_group'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetVersion',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dataset Version',
+                'verbose_name_plural': 'Dataset Versions',
+                'db_table': 'Dataset Versions',
+                'managed': True,
+            },
+        ),
+        migrations.RunPython(create_killers_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:21
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+SEARCH_SQL = """
+CREATE OR REPLACE FUNCTION killer_search_document(common_name text, full_name text, aliases text)
+RETURNS tsvector LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT setweight(to_tsvector('simple'::regconfig, coalesce(common_name, '')), 'A')
+        || setweight(to_tsvector('simple'::regconfig, coalesce(full_name, '')), 'B')
+        || setweight(to_tsvector('simple'::regconfig, coalesce(aliases, '')), 'B')
+$$;
+
+CREATE INDEX IF NOT EXISTS killer_search_document_idx
+    ON "Serial Killers" USING gin (killer_search_document(common_name, full_name, aliases));
+
+CREATE OR REPLACE FUNCTION search_killers(q text, max_results integer DEFAULT 20)
+RETURNS SETOF "Serial Killers" LANGUAGE sql STABLE AS $$
+    SELECT k.*
+    FROM "Serial Killers" k
+    WHERE k.common_name ILIKE '%' || q || '%'
+       OR k.common_name % q
+       OR k.full_name % q
+       OR q <% k.aliases
+       OR killer_search_document(k.common_name, k.full_name, k.aliases) @@ plainto_tsquery('simple', q)
+    ORDER BY greatest(
+                 similarity(k.common_name, q),
+                 similarity(coalesce(k.full_name, ''), q),
+                 word_similarity(q, coalesce(k.aliases, ''))
+             )
+             + ts_rank(killer_search_document(k.common_name, k.full_name, k.aliases), plainto_tsquery('simple', q)) DESC,
+             k.common_name, k.id
+    LIMIT max_results
+$$;
+"""
+
+REVERSE_SEARCH_SQL = """
+DROP FUNCTION IF EXISTS search_killers(text, integer);
+DROP INDEX IF EXISTS killer_search_document_idx;
+DROP FUNCTION IF EXISTS killer_search_document(text, text, text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('killers', '0008_datasetversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['common_name'], name='killer_common_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['full_name'], name='killer_full_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['aliases'], name='killer_aliases_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunSQL(SEARCH_SQL, REVERSE_SEARCH_SQL),
+    ]
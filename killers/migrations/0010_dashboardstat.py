@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('killers', '0009_killer_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(help_text="Statistic family, e.g. 'killers.gender'", max_length=50)),
+                ('key', models.CharField(help_text="Bucket within the metric, e.g. 'male'", max_length=255)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Dashboard Stat',
+                'verbose_name_plural': 'Dashboard Stats',
+                'db_table': 'Dashboard Stats',
+                'managed': True,
+                'indexes': [models.Index(fields=['metric', '-value'], name='dashboard_stat_top')],
+                'constraints': [models.UniqueConstraint(fields=('metric', 'key'), name='dashboard_stat_metric_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+from killers.parsers import DERIVED_FIELDS, derived_fields
+
+
+def backfill_derived_columns(apps, schema_editor):
+    for model_name in ('SerialKiller', 'Suggestion'):
+        model = apps.get_model('killers', model_name)
+        batch = []
+        for obj in model.objects.only('id', 'years_active', 'possible_victims').iterator(chunk_size=2000):
+            for name, value in derived_fields(obj.years_active, obj.possible_victims).items():
+                setattr(obj, name, value)
+            batch.append(obj)
+            if len(batch) == 2000:
+                model.objects.bulk_update(batch, DERIVED_FIELDS)
+                batch = []
+        model.objects.bulk_update(batch, DERIVED_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('killers', '0010_dashboardstat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='serialkiller',
+            name='active_end_year',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='serialkiller',
+            name='active_start_year',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='serialkiller',
+            name='possible_victims_max',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='serialkiller',
+            name='possible_victims_min',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='suggestion',
+            name='active_end_year',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='suggestion',
+            name='active_start_year',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='suggestion',
+            name='possible_victims_max',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='suggestion',
+            name='possible_victims_min',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_derived_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('killers', '0011_derived_crime_columns'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=models.Index(fields=['common_name', 'id'], name='killer_name_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=models.Index(fields=['status', 'common_name', 'id'], name='killer_status_name_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=models.Index(fields=['gender', 'common_name', 'id'], name='killer_gender_name_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=models.Index(fields=['birth_country', 'common_name', 'id'], name='killer_country_name_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=models.Index(fields=['proven_victims', 'id'], name='killer_victims_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=models.Index(fields=['active_start_year', 'id'], name='killer_start_year_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=models.Index(models.OrderBy(models.F('proven_victims'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='killer_victims_desc_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='serialkiller',
+            index=models.Index(models.OrderBy(models.F('active_start_year'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='killer_start_year_desc_keyset'),
+        ),
+    ]
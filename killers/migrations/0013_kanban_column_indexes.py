@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('killers', '0012_keyset_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='modification',
+            index=models.Index(models.F('submission_status'), models.OrderBy(models.F('created_at'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='modification_status_created'),
+        ),
+        migrations.AddIndex(
+            model_name='suggestion',
+            index=models.Index(models.F('submission_status'), models.OrderBy(models.F('created_at'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='suggestion_status_created'),
+        ),
+    ]
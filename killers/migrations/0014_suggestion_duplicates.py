@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('killers', '0013_kanban_column_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='suggestion',
+            name='duplicate_of_killer',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Existing killer this suggestion most likely duplicates', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicate_suggestions', to='killers.serialkiller'),
+        ),
+        migrations.AddField(
+            model_name='suggestion',
+            name='duplicate_of_suggestion',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Earlier suggestion this one most likely duplicates', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicate_suggestions', to='killers.suggestion'),
+        ),
+        migrations.AddField(
+            model_name='suggestion',
+            name='duplicate_score',
+            field=models.FloatField(blank=True, editable=False, help_text='Name similarity of the likely duplicate (0-1)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='suggestion',
+            index=models.Index(models.OrderBy(models.F('duplicate_score'), descending=True), condition=models.Q(('duplicate_score__isnull', False)), name='suggestion_duplicate_score'),
+        ),
+    ]
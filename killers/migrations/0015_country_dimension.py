@@ -0,0 +1,116 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from killers.parsers import country_links
+
+
+def backfill_country_links(apps, schema_editor):
+    Country = apps.get_model('killers', 'Country')
+    DashboardStat = apps.get_model('killers', 'DashboardStat')
+    links = (('SerialKiller', 'KillerCountry', 'killer_id'), ('Suggestion', 'SuggestionCountry', 'suggestion_id'))
+    for model_name, link_name, owner in links:
+        model = apps.get_model('killers', model_name)
+        link_model = apps.get_model('killers', link_name)
+        batch = []
+        rows = model.objects.order_by().values('id', 'birth_country', 'active_countries')
+        for row in rows.iterator(chunk_size=2000):
+            batch += [(row['id'], name, role) for name, role in country_links(row)]
+            if len(batch) >= 2000:
+                write_links(Country, link_model, owner, batch)
+                batch = []
+        write_links(Country, link_model, owner, batch)
+    # Top countries are now counted from the link table
+    DashboardStat.objects.filter(metric='killers.country').delete()
+
+
+def write_links(Country, link_model, owner, batch):
+    names = {name for _, name, _ in batch}
+    Country.objects.bulk_create([Country(name=name) for name in names], ignore_conflicts=True)
+    ids = dict(Country.objects.filter(name__in=names).values_list('name', 'id'))
+    link_model.objects.bulk_create(
+        [link_model(**{owner: pk}, country_id=ids[name], role=role) for pk, name, role in batch],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('killers', '0014_suggestion_duplicates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Country',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Country',
+                'verbose_name_plural': 'Countries',
+                'db_table': 'Countries',
+                'ordering': ['name'],
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='KillerCountry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('birth', 'Birth country'), ('active', 'Active in')], max_length=10)),
+                ('country', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='killer_links', to='killers.country')),
+                ('killer', models.ForeignKey(db_column='killer_id', db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='country_links', to='killers.serialkiller')),
+            ],
+            options={
+                'verbose_name': 'Killer Country',
+                'verbose_name_plural': 'Killer Countries',
+                'db_table': 'Killer Countries',
+                'managed': True,
+            },
+        ),
+        migrations.AddField(
+            model_name='serialkiller',
+            name='countries',
+            field=models.ManyToManyField(blank=True, related_name='killers', through='killers.KillerCountry', to='killers.country'),
+        ),
+        migrations.CreateModel(
+            name='SuggestionCountry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('birth', 'Birth country'), ('active', 'Active in')], max_length=10)),
+                ('country', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='suggestion_links', to='killers.country')),
+                ('suggestion', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='country_links', to='killers.suggestion')),
+            ],
+            options={
+                'verbose_name': 'Suggestion Country',
+                'verbose_name_plural': 'Suggestion Countries',
+                'db_table': 'Suggestion Countries',
+                'managed': True,
+            },
+        ),
+        migrations.AddField(
+            model_name='suggestion',
+            name='countries',
+            field=models.ManyToManyField(blank=True, related_name='suggestions', through='killers.SuggestionCountry', to='killers.country'),
+        ),
+        migrations.AddIndex(
+            model_name='killercountry',
+            index=models.Index(fields=['country', 'killer'], name='killer_country_lookup'),
+        ),
+        migrations.AddConstraint(
+            model_name='killercountry',
+            constraint=models.UniqueConstraint(fields=('killer', 'country', 'role'), name='killer_country_role'),
+        ),
+        migrations.AddIndex(
+            model_name='suggestioncountry',
+            index=models.Index(fields=['country', 'suggestion'], name='suggestion_country_lookup'),
+        ),
+        migrations.AddConstraint(
+            model_name='suggestioncountry',
+            constraint=models.UniqueConstraint(fields=('suggestion', 'country', 'role'), name='suggestion_country_role'),
+        ),
+        migrations.RunPython(backfill_country_links, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:57
+
+import django.db.models.deletion
+from collections import Counter
+
+from django.db import migrations, models
+
+from killers.parsers import parse_mo_tags
+
+
+def backfill_mo_tags(apps, schema_editor):
+    SerialKiller = apps.get_model('killers', 'SerialKiller')
+    KillerMoTag = apps.get_model('killers', 'KillerMoTag')
+    DashboardStat = apps.get_model('killers', 'DashboardStat')
+    counts = Counter()
+    batch = []
+    for row in SerialKiller.objects.order_by().values('id', 'modus_operandi').iterator(chunk_size=2000):
+        for tag in parse_mo_tags(row['modus_operandi']):
+            batch.append(KillerMoTag(killer_id=row['id'], tag=tag))
+            counts[tag] += 1
+        if len(batch) >= 2000:
+            KillerMoTag.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    KillerMoTag.objects.bulk_create(batch, ignore_conflicts=True)
+    # 'killers.mo' counted exact modus_operandi strings; it now counts tags
+    DashboardStat.objects.filter(metric='killers.mo').delete()
+    DashboardStat.objects.bulk_create([DashboardStat(metric='killers.mo', key=tag, value=n) for tag, n in counts.items()])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('killers', '0015_country_dimension'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KillerMoTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(choices=[('poisoning', 'Poisoning'), ('strangulation', 'Strangulation'), ('suffocation', 'Suffocation'), ('drowning', 'Drowning'), ('shooting', 'Shooting'), ('stabbing', 'Stabbing'), ('bludgeoning', 'Bludgeoning'), ('arson', 'Arson'), ('sexual_assault', 'Sexual assault'), ('torture', 'Torture'), ('mutilation', 'Mutilation'), ('cannibalism', 'Cannibalism'), ('necrophilia', 'Necrophilia'), ('kidnapping', 'Kidnapping'), ('robbery', 'Robbery')], max_length=30)),
+                ('killer', models.ForeignKey(db_column='killer_id', db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='mo_tags', to='killers.serialkiller')),
+            ],
+            options={
+                'verbose_name': 'Killer MO Tag',
+                'verbose_name_plural': 'Killer MO Tags',
+                'db_table': 'Killer MO Tags',
+                'managed': True,
+                'indexes': [models.Index(fields=['tag', 'killer'], name='killer_mo_tag_lookup')],
+                'constraints': [models.UniqueConstraint(fields=('killer', 'tag'), name='killer_mo_tag')],
+            },
+        ),
+        migrations.RunPython(backfill_mo_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:59
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_status_transitions(apps, schema_editor):
+    # Submissions already past 'new' get one transition into their current
+    # status, dated by updated_at. Where they came from and how long that
+    # took was never recorded, so time_in_status stays empty.
+    StatusTransition = apps.get_model('killers', 'StatusTransition')
+    for kind, model_name in (('suggestions', 'Suggestion'), ('modifications', 'Modification')):
+        model = apps.get_model('killers', model_name)
+        rows = model.objects.filter(submission_status__in=['in_progress', 'finished']).order_by()
+        batch = []
+        for row in rows.values('id', 'submission_status', 'created_at', 'updated_at').iterator(chunk_size=2000):
+            changed_at = row['updated_at'] or row['created_at']
+            if changed_at is None:
+                continue
+            batch.append(StatusTransition(
+                kind=kind,
+                submission_id=row['id'],
+                from_status='new' if row['submission_status'] == 'in_progress' else None,
+                to_status=row['submission_status'],
+                changed_at=changed_at,
+            ))
+            if len(batch) == 2000:
+                StatusTransition.objects.bulk_create(batch)
+                batch = []
+        StatusTransition.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('killers', '0016_mo_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('suggestions', 'Suggestion'), ('modifications', 'Modification')], max_length=20)),
+                ('submission_id', models.BigIntegerField(help_text='Id of the suggestion or modification')),
+                ('from_status', models.CharField(blank=True, choices=[('new', 'New'), ('in_progress', 'In Progress'), ('finished', 'Finished')], max_length=20, null=True)),
+                ('to_status', models.CharField(choices=[('new', 'New'), ('in_progress', 'In Progress'), ('finished', 'Finished')], max_length=20)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('time_in_status', models.DurationField(blank=True, help_text='Time spent in from_status, if known', null=True)),
+            ],
+            options={
+                'verbose_name': 'Status Transition',
+                'verbose_name_plural': 'Status Transitions',
+                'db_table': 'Status Transitions',
+                'ordering': ['-changed_at'],
+                'managed': True,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='modification',
+            index=models.Index(fields=['created_at'], name='modification_created'),
+        ),
+        migrations.AddIndex(
+            model_name='suggestion',
+            index=models.Index(fields=['created_at'], name='suggestion_created'),
+        ),
+        migrations.AddIndex(
+            model_name='statustransition',
+            index=models.Index(fields=['changed_at'], name='status_transition_changed'),
+        ),
+        migrations.AddIndex(
+            model_name='statustransition',
+            index=models.Index(fields=['kind', 'submission_id', 'changed_at'], name='status_transition_history'),
+        ),
+        migrations.RunPython(backfill_status_transitions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+"""
+Modus operandi tags.
+
+``modus_operandi`` is free text that is unique on nearly every row, so it
+can't be filtered or counted usefully. parsers.parse_mo_tags() maps it onto
+the MO_TAGS vocabulary, and sync_mo_tags() mirrors the result into the
+``Killer MO Tags`` table, an inverted index of tag -> killers served by its
+``(tag, killer)`` index. How many killers carry each tag is kept in the
+``killers.mo`` dashboard counters alongside the other killer statistics.
+"""
+from .models import KillerMoTag
+from .parsers import parse_mo_tags
+
+
+def sync_mo_tags(rows):
+    """
+    Make the tags of ``rows`` (dicts with ``id`` and ``modus_operandi``)
+    match their text, with a fixed number of queries per call.
+    """
+    if not rows:
+        return
+    wanted = {(row['id'], tag) for row in rows for tag in parse_mo_tags(row.get('modus_operandi'))}
+    stale = []
+    existing = KillerMoTag.objects.filter(killer_id__in=[row['id'] for row in rows])
+    for link_id, pk, tag in existing.values_list('id', 'killer_id', 'tag'):
+        if (pk, tag) in wanted:
+            wanted.discard((pk, tag))
+        else:
+            stale.append(link_id)
+    if stale:
+        KillerMoTag.objects.filter(id__in=stale).delete()
+    KillerMoTag.objects.bulk_create([KillerMoTag(killer_id=pk, tag=tag) for pk, tag in wanted], ignore_conflicts=True)
@@ -1,5 +1,9 @@
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from .parsers import MO_TAG_CHOICES, apply_derived_fields
 
 
 class SerialKiller(models.Model):
@@ -34,6 +38,12 @@ class SerialKiller(models.Model):
     active_countries = models.TextField(blank=True, null=True, help_text="Countries where crimes occurred")
     modus_operandi = models.TextField(blank=True, null=True, help_text="Method of operation")
     
+    # Derived from years_active / possible_victims on save
+    active_start_year = models.PositiveSmallIntegerField(blank=True, null=True, db_index=True, editable=False)
+    active_end_year = models.PositiveSmallIntegerField(blank=True, null=True, db_index=True, editable=False)
+    possible_victims_min = models.PositiveIntegerField(blank=True, null=True, db_index=True, editable=False)
+    possible_victims_max = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    
     # Legal Status
     capture_date = models.DateField(blank=True, null=True)
     sentence = models.TextField(blank=True, null=True)
@@ -47,6 +57,9 @@ class SerialKiller(models.Model):
     # Assignment
     assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_killers', help_text="Admin assigned to manage this record")
     
+    # Parsed from birth_country / active_countries on save
+    countries = models.ManyToManyField('Country', through='KillerCountry', related_name='killers', blank=True)
+    
     # Timestamps (if they exist in Supabase)
     created_at = models.DateTimeField(auto_now_add=True, blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)
@@ -57,9 +70,35 @@ class SerialKiller(models.Model):
         ordering = ['common_name']
         verbose_name = 'Serial Killer'
         verbose_name_plural = 'Serial Killers'
+        indexes = [
+            # Trigram indexes back the fuzzy/substring search in search_killers()
+            GinIndex(fields=['common_name'], name='killer_common_name_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['full_name'], name='killer_full_name_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['aliases'], name='killer_aliases_trgm', opclasses=['gin_trgm_ops']),
+            # Keyset pagination of /api/killers/ walks (ordering column, id),
+            # optionally behind an equality filter
+            models.Index(fields=['common_name', 'id'], name='killer_name_keyset'),
+            models.Index(fields=['status', 'common_name', 'id'], name='killer_status_name_keyset'),
+            models.Index(fields=['gender', 'common_name', 'id'], name='killer_gender_name_keyset'),
+            models.Index(fields=['birth_country', 'common_name', 'id'], name='killer_country_name_keyset'),
+            models.Index(fields=['proven_victims', 'id'], name='killer_victims_keyset'),
+            models.Index(fields=['active_start_year', 'id'], name='killer_start_year_keyset'),
+            # Descending orderings keep NULLs last, which the ascending
+            # indexes above can't produce when read backwards
+            models.Index(F('proven_victims').desc(nulls_last=True), F('id').desc(), name='killer_victims_desc_keyset'),
+            models.Index(
+                F('active_start_year').desc(nulls_last=True), F('id').desc(), name='killer_start_year_desc_keyset',
+            ),
+        ]
     
     def __str__(self):
         return self.common_name
+    
+    def save(self, *args, **kwargs):
+        update_fields = apply_derived_fields(self, kwargs.get('update_fields'))
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
 
 
 class Suggestion(models.Model):
@@ -100,6 +139,12 @@ class Suggestion(models.Model):
     active_countries = models.TextField(blank=True, null=True)
     modus_operandi = models.TextField(blank=True, null=True)
     
+    # Derived from years_active / possible_victims on save
+    active_start_year = models.PositiveSmallIntegerField(blank=True, null=True, db_index=True, editable=False)
+    active_end_year = models.PositiveSmallIntegerField(blank=True, null=True, db_index=True, editable=False)
+    possible_victims_min = models.PositiveIntegerField(blank=True, null=True, db_index=True, editable=False)
+    possible_victims_max = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    
     # Legal Status
     capture_date = models.DateField(blank=True, null=True)
     sentence = models.TextField(blank=True, null=True)
@@ -113,6 +158,14 @@ class Suggestion(models.Model):
     # Submission tracking
     submission_status = models.CharField(max_length=20, choices=SUBMISSION_STATUS_CHOICES, default='new', db_index=True)
     assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_suggestions', help_text="Admin assigned to review this suggestion")
+    
+    # Parsed from birth_country / active_countries on save
+    countries = models.ManyToManyField('Country', through='SuggestionCountry', related_name='suggestions', blank=True)
+    
+    # Best near-duplicate found when the suggestion was submitted
+    duplicate_of_killer = models.ForeignKey(SerialKiller, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='duplicate_suggestions', help_text="Existing killer this suggestion most likely duplicates")
+    duplicate_of_suggestion = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='duplicate_suggestions', help_text="Earlier suggestion this one most likely duplicates")
+    duplicate_score = models.FloatField(null=True, blank=True, editable=False, help_text="Name similarity of the likely duplicate (0-1)")
     created_at = models.DateTimeField(auto_now_add=True, blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)
     
@@ -122,9 +175,29 @@ class Suggestion(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Suggestion'
         verbose_name_plural = 'Suggestions'
+        indexes = [
+            # Dashboard kanban columns page newest first within a status
+            models.Index(
+                F('submission_status'), F('created_at').desc(nulls_last=True), F('id').desc(),
+                name='suggestion_status_created',
+            ),
+            # Submissions created per day/week (throughput stats)
+            models.Index(fields=['created_at'], name='suggestion_created'),
+            # Dashboard grouping of likely duplicates, best matches first
+            models.Index(
+                F('duplicate_score').desc(), name='suggestion_duplicate_score',
+                condition=models.Q(duplicate_score__isnull=False),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.common_name} - {self.get_submission_status_display()}"
+    
+    def save(self, *args, **kwargs):
+        update_fields = apply_derived_fields(self, kwargs.get('update_fields'))
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
 
 
 class Modification(models.Model):
@@ -156,6 +229,185 @@ class Modification(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Modification'
         verbose_name_plural = 'Modifications'
+        indexes = [
+            # Dashboard kanban columns page newest first within a status
+            models.Index(
+                F('submission_status'), F('created_at').desc(nulls_last=True), F('id').desc(),
+                name='modification_status_created',
+            ),
+            # Submissions created per day/week (throughput stats)
+            models.Index(fields=['created_at'], name='modification_created'),
+        ]
     
     def __str__(self):
         return f"Correction for {self.killer.common_name} - {self.get_submission_status_display()}"
+
+
+class StatusTransition(models.Model):
+    """One change of a suggestion's or modification's submission status, kept for throughput statistics."""
+    
+    KIND_CHOICES = [
+        ('suggestions', 'Suggestion'),
+        ('modifications', 'Modification'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    submission_id = models.BigIntegerField(help_text="Id of the suggestion or modification")
+    from_status = models.CharField(max_length=20, choices=Suggestion.SUBMISSION_STATUS_CHOICES, blank=True, null=True)
+    to_status = models.CharField(max_length=20, choices=Suggestion.SUBMISSION_STATUS_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+    time_in_status = models.DurationField(blank=True, null=True, help_text="Time spent in from_status, if known")
+    
+    class Meta:
+        db_table = 'Status Transitions'
+        managed = True
+        ordering = ['-changed_at']
+        verbose_name = 'Status Transition'
+        verbose_name_plural = 'Status Transitions'
+        indexes = [
+            # Transitions per day/week
+            models.Index(fields=['changed_at'], name='status_transition_changed'),
+            # When a submission entered its current status
+            models.Index(fields=['kind', 'submission_id', 'changed_at'], name='status_transition_history'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.submission_id}: {self.from_status} -> {self.to_status}"
+
+
+class Country(models.Model):
+    """Canonical country named by the free-text country fields of killers and suggestions."""
+    
+    name = models.CharField(max_length=100, unique=True)
+    
+    class Meta:
+        db_table = 'Countries'
+        managed = True
+        ordering = ['name']
+        verbose_name = 'Country'
+        verbose_name_plural = 'Countries'
+    
+    def __str__(self):
+        return self.name
+
+
+COUNTRY_ROLE_CHOICES = [
+    ('birth', 'Birth country'),
+    ('active', 'Active in'),
+]
+
+
+class KillerCountry(models.Model):
+    """Link between a killer and a country they were born or active in."""
+    
+    # Both keys lead a composite index below; a separate FK index would only slow writes
+    killer = models.ForeignKey(
+        SerialKiller, on_delete=models.CASCADE, related_name='country_links', db_column='killer_id', db_index=False,
+    )
+    country = models.ForeignKey(Country, on_delete=models.CASCADE, related_name='killer_links', db_index=False)
+    role = models.CharField(max_length=10, choices=COUNTRY_ROLE_CHOICES)
+    
+    class Meta:
+        db_table = 'Killer Countries'
+        managed = True
+        verbose_name = 'Killer Country'
+        verbose_name_plural = 'Killer Countries'
+        constraints = [
+            models.UniqueConstraint(fields=['killer', 'country', 'role'], name='killer_country_role'),
+        ]
+        indexes = [
+            # ?country= filtering and per-country counts
+            models.Index(fields=['country', 'killer'], name='killer_country_lookup'),
+        ]
+    
+    def __str__(self):
+        return f"{self.killer_id} {self.role} {self.country_id}"
+
+
+class SuggestionCountry(models.Model):
+    """Link between a suggestion and a country it names."""
+    
+    suggestion = models.ForeignKey(Suggestion, on_delete=models.CASCADE, related_name='country_links', db_index=False)
+    country = models.ForeignKey(Country, on_delete=models.CASCADE, related_name='suggestion_links', db_index=False)
+    role = models.CharField(max_length=10, choices=COUNTRY_ROLE_CHOICES)
+    
+    class Meta:
+        db_table = 'Suggestion Countries'
+        managed = True
+        verbose_name = 'Suggestion Country'
+        verbose_name_plural = 'Suggestion Countries'
+        constraints = [
+            models.UniqueConstraint(fields=['suggestion', 'country', 'role'], name='suggestion_country_role'),
+        ]
+        indexes = [
+            models.Index(fields=['country', 'suggestion'], name='suggestion_country_lookup'),
+        ]
+    
+    def __str__(self):
+        return f"{self.suggestion_id} {self.role} {self.country_id}"
+
+
+class KillerMoTag(models.Model):
+    """Modus operandi vocabulary tag parsed from a killer's free-text modus_operandi (tag -> killers index)."""
+    
+    # killer_id leads the unique index below; a separate FK index would only slow writes
+    killer = models.ForeignKey(
+        SerialKiller, on_delete=models.CASCADE, related_name='mo_tags', db_column='killer_id', db_index=False,
+    )
+    tag = models.CharField(max_length=30, choices=MO_TAG_CHOICES)
+    
+    class Meta:
+        db_table = 'Killer MO Tags'
+        managed = True
+        verbose_name = 'Killer MO Tag'
+        verbose_name_plural = 'Killer MO Tags'
+        constraints = [
+            models.UniqueConstraint(fields=['killer', 'tag'], name='killer_mo_tag'),
+        ]
+        indexes = [
+            # Postings of one tag for ?mo= filtering
+            models.Index(fields=['tag', 'killer'], name='killer_mo_tag_lookup'),
+        ]
+    
+    def __str__(self):
+        return f"{self.killer_id} {self.tag}"
+
+
+class DatasetVersion(models.Model):
+    """Version counter bumped on every write to a dataset, used for HTTP validators."""
+    
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'Dataset Versions'
+        managed = True
+        verbose_name = 'Dataset Version'
+        verbose_name_plural = 'Dataset Versions'
+    
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class DashboardStat(models.Model):
+    """Incrementally maintained counter backing the dashboard statistics."""
+    
+    metric = models.CharField(max_length=50, help_text="Statistic family, e.g. 'killers.gender'")
+    key = models.CharField(max_length=255, help_text="Bucket within the metric, e.g. 'male'")
+    value = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'Dashboard Stats'
+        managed = True
+        verbose_name = 'Dashboard Stat'
+        verbose_name_plural = 'Dashboard Stats'
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'key'], name='dashboard_stat_metric_key'),
+        ]
+        indexes = [
+            models.Index(fields=['metric', '-value'], name='dashboard_stat_top'),
+        ]
+    
+    def __str__(self):
+        return f"{self.metric}[{self.key}] = {self.value}"
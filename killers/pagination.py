@@ -0,0 +1,197 @@
+import base64
+import binascii
+import json
+from collections import namedtuple
+
+from django.db.models import F, Q
+
+from .models import SerialKiller
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Columns a client may request through ?fields=
+KILLER_FIELDS = tuple(f.attname for f in SerialKiller._meta.concrete_fields)
+
+Ordering = namedtuple('Ordering', ['column', 'descending', 'nullable'])
+
+# Supported ?ordering= values. Each is paginated by (column, id); every one
+# of them is backed by an index so deep pages stay cheap.
+ORDERINGS = {
+    'common_name': Ordering('common_name', False, False),
+    '-common_name': Ordering('common_name', True, False),
+    'proven_victims': Ordering('proven_victims', False, True),
+    '-proven_victims': Ordering('proven_victims', True, True),
+    'active_start_year': Ordering('active_start_year', False, True),
+    '-active_start_year': Ordering('active_start_year', True, True),
+}
+DEFAULT_ORDERING = ORDERINGS['common_name']
+
+Cursor = namedtuple('Cursor', ['value', 'id', 'reverse'])
+
+
+def parse_fields(raw):
+    """Parse ``?fields=a,b,c`` into a list of columns, or None for all columns."""
+    if not raw:
+        return None
+    fields = [f.strip() for f in raw.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in KILLER_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def parse_page_size(raw):
+    if not raw:
+        return DEFAULT_PAGE_SIZE
+    try:
+        size = int(raw)
+    except ValueError:
+        raise ValueError("page_size must be an integer.")
+    if size < 1:
+        raise ValueError("page_size must be positive.")
+    return min(size, MAX_PAGE_SIZE)
+
+
+def parse_ordering(raw):
+    if not raw:
+        return DEFAULT_ORDERING
+    try:
+        return ORDERINGS[raw]
+    except KeyError:
+        raise ValueError(f"ordering must be one of: {', '.join(ORDERINGS)}.")
+
+
+def ordering_key(ordering):
+    """The ``?ordering=`` spelling of ``ordering``, e.g. ``-proven_victims``."""
+    return f"{'-' if ordering.descending else ''}{ordering.column}"
+
+
+def encode_cursor(row, ordering=DEFAULT_ORDERING, reverse=False):
+    # The ordering is part of the cursor so it can't be replayed against another one
+    payload = json.dumps([row[ordering.column], row['id'], int(reverse), ordering_key(ordering)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(raw, ordering=DEFAULT_ORDERING):
+    """Decode a cursor made by encode_cursor() for the same ``ordering``."""
+    if not raw:
+        return None
+    try:
+        padded = raw + '=' * (-len(raw) % 4)
+        value, pk, reverse, key = json.loads(base64.urlsafe_b64decode(padded))
+        if not (value is None or isinstance(value, (str, int))) or isinstance(value, bool):
+            raise ValueError
+        cursor = Cursor(value, int(pk), bool(reverse))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if key != ordering_key(ordering):
+        raise ValueError("This cursor belongs to a different ordering; start again from the first page.")
+    return cursor
+
+
+def select_columns(fields, ordering=DEFAULT_ORDERING):
+    """Build the PostgREST select list; the keyset columns are always included."""
+    if fields is None:
+        return '*'
+    return ','.join(cursor_columns(fields, ordering))
+
+
+def cursor_columns(fields, ordering=DEFAULT_ORDERING):
+    keys = ['id', ordering.column]
+    return keys + [f for f in fields if f not in keys]
+
+
+def _quote(value):
+    # PostgREST needs reserved characters (, . : ( ) quoted inside or=() filters
+    if not isinstance(value, str):
+        return str(value)
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _direction(cursor, ordering):
+    """Return ``(backwards, descending)`` for the query that fetches this page."""
+    backwards = cursor.reverse if cursor else False
+    return backwards, ordering.descending != backwards
+
+
+def apply_keyset(query, cursor, page_size, ordering=DEFAULT_ORDERING):
+    """
+    Restrict a PostgREST query to the page after (or before) ``cursor``.
+
+    The ``gte``/``lte`` bound on the ordering column lets Postgres start an
+    index range scan at the cursor position, so every page costs the same as
+    the first one regardless of how deep it is. NULLs sort last.
+    """
+    backwards, descending = _direction(cursor, ordering)
+    col, op = ordering.column, 'lt' if descending else 'gt'
+    if cursor:
+        value, pk = cursor.value, cursor.id
+        if value is None:
+            if backwards:
+                query = query.or_(f"and({col}.is.null,id.{op}.{pk}),{col}.not.is.null")
+            else:
+                query = query.is_(col, 'null').filter('id', op, pk)
+        else:
+            if not ordering.nullable or backwards:
+                query = query.filter(col, op + 'e', value)
+            clause = f"{col}.{op}.{_quote(value)},and({col}.eq.{_quote(value)},id.{op}.{pk})"
+            if ordering.nullable and not backwards:
+                clause += f",{col}.is.null"
+            query = query.or_(clause)
+    nullsfirst = backwards if ordering.nullable else None
+    # Fetch one extra row to know whether another page exists
+    return query.order(col, desc=descending, nullsfirst=nullsfirst).order('id', desc=descending).limit(page_size + 1)
+
+
+def keyset_queryset(queryset, cursor, page_size, ordering=DEFAULT_ORDERING):
+    """ORM equivalent of apply_keyset() for a queryset with an ``id`` primary key."""
+    backwards, descending = _direction(cursor, ordering)
+    col, op = ordering.column, 'lt' if descending else 'gt'
+    if cursor:
+        value, pk = cursor.value, cursor.id
+        if value is None:
+            condition = Q(**{f'{col}__isnull': True, f'id__{op}': pk})
+            if backwards:
+                condition |= Q(**{f'{col}__isnull': False})
+            queryset = queryset.filter(condition)
+        else:
+            if not ordering.nullable or backwards:
+                queryset = queryset.filter(**{f'{col}__{op}e': value})
+            condition = Q(**{f'{col}__{op}': value}) | Q(**{col: value, f'id__{op}': pk})
+            if ordering.nullable and not backwards:
+                condition |= Q(**{f'{col}__isnull': True})
+            queryset = queryset.filter(condition)
+    nulls = {'nulls_first': True} if backwards else {'nulls_last': True}
+    primary = F(col).desc(**nulls) if descending else F(col).asc(**nulls)
+    if not ordering.nullable:
+        primary = F(col).desc() if descending else F(col).asc()
+    return queryset.order_by(primary, '-id' if descending else 'id')[:page_size + 1]
+
+
+def build_page(request, rows, cursor, page_size, fields=None, ordering=DEFAULT_ORDERING):
+    """Trim the extra row, restore the requested order and attach next/previous links."""
+    reverse = cursor.reverse if cursor else False
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+
+    next_url = previous_url = None
+    if rows:
+        if has_more or reverse:
+            next_url = _page_url(request, encode_cursor(rows[-1], ordering))
+        if (has_more and reverse) or (cursor and not reverse):
+            previous_url = _page_url(request, encode_cursor(rows[0], ordering, reverse=True))
+
+    if fields is not None:
+        rows = [{f: row.get(f) for f in fields} for row in rows]
+
+    return {'next': next_url, 'previous': previous_url, 'results': rows}
+
+
+def _page_url(request, cursor):
+    params = request.GET.copy()
+    params['cursor'] = cursor
+    return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
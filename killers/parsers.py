@@ -0,0 +1,176 @@
+import re
+
+YEAR_RE = re.compile(r'\b(\d{4})\b')
+NUMBER_RE = re.compile(r'\d+')
+
+
+def parse_years_active(value):
+    """
+    Parse ``years_active`` into ``(start_year, end_year)``.
+
+    Handles ranges ("1974-1978"), lists of separate years ("1990,2001") and
+    single years ("1985"); returns ``(None, None)`` when no year is present.
+    """
+    if not value:
+        return None, None
+    years = [int(y) for y in YEAR_RE.findall(str(value))]
+    if not years:
+        return None, None
+    return min(years), max(years)
+
+
+def parse_victim_range(value):
+    """
+    Parse a possible-victims string into ``(minimum, maximum)``.
+
+    "17" -> (17, 17), "50-60" -> (50, 60), "100+" -> (100, None).
+    """
+    if value is None or value == '':
+        return None, None
+    text = str(value).strip()
+    numbers = [int(n) for n in NUMBER_RE.findall(text)]
+    if not numbers:
+        return None, None
+    if '+' in text:
+        return numbers[0], None
+    return numbers[0], max(numbers)
+
+
+def derived_fields(years_active, possible_victims):
+    """Values of the indexed numeric columns derived from the free-text fields."""
+    start, end = parse_years_active(years_active)
+    low, high = parse_victim_range(possible_victims)
+    return {
+        'active_start_year': start,
+        'active_end_year': end,
+        'possible_victims_min': low,
+        'possible_victims_max': high,
+    }
+
+
+DERIVED_FIELDS = ('active_start_year', 'active_end_year', 'possible_victims_min', 'possible_victims_max')
+DERIVED_SOURCE_FIELDS = ('years_active', 'possible_victims')
+
+
+def apply_derived_fields(obj, update_fields=None):
+    """
+    Set the derived numeric columns on a SerialKiller/Suggestion instance.
+
+    Returns ``update_fields`` extended with the derived columns when one of
+    their source fields is being saved, so partial saves stay consistent.
+    """
+    for name, value in derived_fields(obj.years_active, obj.possible_victims).items():
+        setattr(obj, name, value)
+    if update_fields is None:
+        return None
+    update_fields = set(update_fields)
+    if update_fields & set(DERIVED_SOURCE_FIELDS):
+        update_fields |= set(DERIVED_FIELDS)
+    return update_fields
+
+
+BIRTH, ACTIVE = 'birth', 'active'
+
+COUNTRY_FIELDS = ('birth_country', 'active_countries')
+
+# "and" is not a separator: "Trinidad and Tobago", "Bosnia and Herzegovina"
+COUNTRY_SEPARATORS = re.compile(r'[,;/|\n]+')
+
+# Spellings seen in the data -> canonical name (keys are casefolded, without dots)
+COUNTRY_ALIASES = {
+    'usa': 'United States',
+    'us': 'United States',
+    'united states of america': 'United States',
+    'america': 'United States',
+    'uk': 'United Kingdom',
+    'great britain': 'United Kingdom',
+    'britain': 'United Kingdom',
+    'england': 'United Kingdom',
+    'scotland': 'United Kingdom',
+    'wales': 'United Kingdom',
+    'northern ireland': 'United Kingdom',
+    'ussr': 'Soviet Union',
+    'west germany': 'Germany',
+    'east germany': 'Germany',
+    'the netherlands': 'Netherlands',
+    'holland': 'Netherlands',
+    'south korea': 'South Korea',
+    'republic of korea': 'South Korea',
+    'uae': 'United Arab Emirates',
+}
+
+# Kept lowercase when re-casing "TRINIDAD AND TOBAGO"
+LOWERCASE_WORDS = {'and', 'of', 'the'}
+
+# max_length of Country.name
+COUNTRY_MAX_LENGTH = 100
+
+
+def canonical_country(name):
+    """Canonical spelling of one country name, or None when blank."""
+    name = ' '.join(name.split()).strip(' .-')
+    if not name:
+        return None
+    alias = COUNTRY_ALIASES.get(name.casefold().replace('.', ''))
+    if alias:
+        return alias
+    if name.islower() or name.isupper():
+        words = name.lower().split()
+        name = ' '.join(
+            word if i and word in LOWERCASE_WORDS else word.capitalize() for i, word in enumerate(words)
+        )
+    return name[:COUNTRY_MAX_LENGTH]
+
+
+def parse_countries(text):
+    """Canonical countries named in a free-text field, in order and without repeats."""
+    if not text:
+        return []
+    countries = []
+    for part in COUNTRY_SEPARATORS.split(str(text)):
+        name = canonical_country(part)
+        if name and name not in countries:
+            countries.append(name)
+    return countries
+
+
+def country_links(row):
+    """``{(country name, role)}`` for a row holding the two country fields."""
+    links = {(name, BIRTH) for name in parse_countries(row.get('birth_country'))}
+    links |= {(name, ACTIVE) for name in parse_countries(row.get('active_countries'))}
+    return links
+
+
+# Modus operandi vocabulary: tag -> word stems that imply it. A tag applies
+# when any word of the free text starts with one of its stems.
+MO_TAGS = {
+    'poisoning': ('poison', 'arsenic', 'cyanide', 'strychnine', 'thallium', 'overdos', 'lethal injection'),
+    'strangulation': ('strang', 'garrot', 'ligature', 'throttl', 'chok'),
+    'suffocation': ('suffocat', 'smother', 'asphyx'),
+    'drowning': ('drown',),
+    'shooting': ('shoot', 'shot', 'gun', 'firearm', 'rifle', 'pistol', 'revolver'),
+    'stabbing': ('stab', 'knife', 'knives', 'slash', 'cut throat', 'throat cut', 'machete'),
+    'bludgeoning': ('bludgeon', 'beat', 'hammer', 'blunt', 'club', 'axe'),
+    'arson': ('arson', 'burn', 'set fire', 'set on fire', 'fire to'),
+    'sexual_assault': ('rape', 'raping', 'sexual', 'sodom', 'molest'),
+    'torture': ('tortur',),
+    'mutilation': ('mutilat', 'dismember', 'decapitat', 'behead'),
+    'cannibalism': ('cannibal',),
+    'necrophilia': ('necrophil',),
+    'kidnapping': ('kidnap', 'abduct'),
+    'robbery': ('robbery', 'robbing', 'robbed', 'burglar'),
+}
+MO_TAG_CHOICES = [(tag, tag.replace('_', ' ').capitalize()) for tag in MO_TAGS]
+
+_MO_PATTERNS = {
+    tag: re.compile(r'\b(?:' + '|'.join(re.escape(stem) for stem in stems) + ')', re.IGNORECASE)
+    for tag, stems in MO_TAGS.items()
+}
+
+
+def parse_mo_tags(text):
+    """Vocabulary tags named by a free-text modus operandi, in vocabulary order."""
+    if not text:
+        return []
+    text = ' '.join(str(text).split())
+    return [tag for tag, pattern in _MO_PATTERNS.items() if pattern.search(text)]
@@ -0,0 +1,51 @@
+import decimal
+
+import orjson
+from django.http import HttpResponse
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer
+
+# Match DRF's encoder: UTC datetimes end in "Z", non-string dict keys are allowed
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _default(obj):
+    """Types orjson doesn't serialize natively, encoded like DRF's JSONEncoder."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(data):
+    """Serialize to compact UTF-8 JSON bytes."""
+    content = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+    # Like DRF, escape the line/paragraph separators that are valid JSON but
+    # end a line in JavaScript; they can only occur inside strings
+    if b'\xe2\x80' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class OrjsonRenderer(BaseRenderer):
+    """DRF renderer producing the same JSON as JSONRenderer, several times faster."""
+
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
+
+
+class OrjsonResponse(HttpResponse):
+    """JsonResponse counterpart for the plain (async) views."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
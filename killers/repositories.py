@@ -0,0 +1,151 @@
+from django.conf import settings
+from django.db import connection
+
+from .countries import sync_countries
+from .duplicates import duplicate_fields, remember_suggestion
+from .filters import apply_filters, filter_embeds, filter_queryset
+from .kanban import KINDS, STATUSES, card_query, card_queryset
+from .models import SerialKiller, Suggestion, Modification
+from .pagination import DEFAULT_ORDERING, apply_keyset, cursor_columns, keyset_queryset, select_columns
+from .parsers import derived_fields
+from .services import execute_concurrently, get_supabase_client
+from .stats import apply_deltas, submission_contributions
+
+# Rows per request when reading a whole table; PostgREST caps every select at
+# its max-rows setting, so larger reads are taken in primary-key pages.
+INDEX_PAGE_SIZE = 1000
+
+
+class PostgrestRepository:
+    """Data access through the Supabase REST (PostgREST) API."""
+
+    name = 'postgrest'
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        return self._client or get_supabase_client()
+
+    def _select_all(self, table, columns, after_id=0, where=lambda query: query):
+        """
+        Every row of ``table`` with an id above ``after_id``, in id order. Pages
+        are read until one comes back empty rather than short, as max-rows may
+        be below INDEX_PAGE_SIZE.
+        """
+        rows = []
+        while True:
+            query = where(self.client.table(table).select(columns)).gt('id', after_id)
+            page = query.order('id').limit(INDEX_PAGE_SIZE).execute().data
+            if not page:
+                return rows
+            rows += page
+            after_id = page[-1]['id']
+
+    def list_killers(self, fields, filters, cursor, page_size, ordering=DEFAULT_ORDERING):
+        columns = select_columns(fields, ordering) + filter_embeds(filters)
+        query = apply_filters(self.client.table('Serial Killers').select(columns), filters)
+        return apply_keyset(query, cursor, page_size, ordering).execute().data
+
+    def search_killers(self, query, limit):
+        return self.client.rpc('search_killers', {'q': query, 'max_results': limit}).execute().data
+
+    def killer_choices(self):
+        return self._select_all('Serial Killers', "id, common_name")
+
+    def create_suggestion(self, data):
+        # PostgREST bypasses model save() and signals: derive the numeric
+        # columns, update the dashboard counters and link the countries here instead.
+        row = {**data, **derived_fields(data.get('years_active'), data.get('possible_victims')), **duplicate_fields(data)}
+        created = self.client.table('Suggestions').insert(row).execute().data[0]
+        apply_deltas(submission_contributions('suggestions', created))
+        sync_countries(Suggestion, [created])
+        remember_suggestion(created)
+        return created
+
+    def killer_names(self):
+        return self._select_all('Serial Killers', "id, common_name, full_name, aliases")
+
+    def open_suggestion_names(self, after_id):
+        return self._select_all('Suggestions', "id, common_name, full_name, aliases", after_id,
+                                lambda query: query.neq('submission_status', 'finished'))
+
+    def create_modification(self, data):
+        created = self.client.table('Modifications').insert(data).execute().data[0]
+        apply_deltas(submission_contributions('modifications', created))
+        return created
+
+    def submission_cards(self, kind, status, cursor, page_size):
+        return card_query(self.client, kind, status, cursor, page_size).execute().data
+
+    def dashboard_columns(self, page_size):
+        """First page of every kanban column, ``{(kind, status): rows}``, fetched concurrently."""
+        return execute_concurrently({
+            (kind, status): card_query(self.client, kind, status, None, page_size)
+            for kind in KINDS for status in STATUSES
+        })
+
+
+class OrmRepository:
+    """Data access through the Django ORM over the DATABASES connection."""
+
+    name = 'orm'
+
+    def list_killers(self, fields, filters, cursor, page_size, ordering=DEFAULT_ORDERING):
+        columns = cursor_columns(fields, ordering) if fields else []
+        queryset = filter_queryset(SerialKiller.objects.all(), filters)
+        return list(keyset_queryset(queryset, cursor, page_size, ordering).values(*columns))
+
+    def search_killers(self, query, limit):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT * FROM search_killers(%s, %s)', [query, limit])
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def killer_choices(self):
+        return list(SerialKiller.objects.order_by('common_name').values('id', 'common_name'))
+
+    def create_suggestion(self, data):
+        # save() derives the numeric columns; signals update the dashboard counters
+        created = Suggestion.objects.create(**data, **duplicate_fields(data))
+        remember_suggestion({**data, 'id': created.pk})
+        return created
+
+    def killer_names(self):
+        return list(SerialKiller.objects.order_by().values('id', 'common_name', 'full_name', 'aliases'))
+
+    def open_suggestion_names(self, after_id):
+        queryset = Suggestion.objects.exclude(submission_status='finished').filter(id__gt=after_id)
+        return list(queryset.order_by('id').values('id', 'common_name', 'full_name', 'aliases'))
+
+    def create_modification(self, data):
+        return Modification.objects.create(**data)
+
+    def submission_cards(self, kind, status, cursor, page_size):
+        return card_queryset(kind, status, cursor, page_size)
+
+    def dashboard_columns(self, page_size):
+        return {
+            (kind, status): card_queryset(kind, status, None, page_size)
+            for kind in KINDS for status in STATUSES
+        }
+
+
+BACKENDS = {
+    PostgrestRepository.name: PostgrestRepository,
+    OrmRepository.name: OrmRepository,
+}
+
+
+def get_repository(endpoint):
+    """
+    Return the data backend configured for ``endpoint`` in
+    ``settings.KILLERS_DATA_BACKENDS`` (falling back to its ``'default'``).
+    """
+    conf = getattr(settings, 'KILLERS_DATA_BACKENDS', {})
+    name = conf.get(endpoint, conf.get('default', PostgrestRepository.name))
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown data backend '{name}' for endpoint '{endpoint}'.")
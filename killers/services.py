@@ -1,11 +1,295 @@
+import asyncio
+import contextvars
 import os
-from supabase import create_client, Client
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
-def get_supabase_client() -> Client:
+import httpx
+from django.conf import settings
+from django.db import close_old_connections
+from supabase import create_client, AsyncClient, Client
+from supabase.lib.client_options import AsyncClientOptions, SyncClientOptions
+
+from .metrics import current_metrics
+
+# One Supabase client per worker process. httpx.Client is thread-safe, so every
+# request thread shares the same keep-alive connection pool.
+_client: Client | None = None
+_client_pid: int | None = None
+_client_lock = threading.Lock()
+
+# One async client per event loop: httpx.AsyncClient connections are bound
+# to the loop that opened them.
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient]' = weakref.WeakKeyDictionary()
+
+# Shared thread pool for issuing independent PostgREST queries concurrently
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+
+
+def _client_settings() -> dict:
+    defaults = {
+        'MAX_CONNECTIONS': 20,
+        'MAX_KEEPALIVE_CONNECTIONS': 10,
+        'KEEPALIVE_EXPIRY': 30.0,
+        'TIMEOUT': 10.0,
+        'CONNECT_TIMEOUT': 5.0,
+        'FANOUT_WORKERS': 8,
+        'FANOUT_TIMEOUT': None,
+    }
+    defaults.update(getattr(settings, 'SUPABASE_CLIENT', {}))
+    return defaults
+
+
+def _credentials() -> tuple[str, str]:
     url: str = os.environ.get("SUPABASE_URL")
     key: str = os.environ.get("SUPABASE_KEY")
-    
+
     if not url or not key:
         raise ValueError("Supabase URL and Key must be set in environment variables.")
-        
-    return create_client(url, key)
+    return url, key
+
+
+def _http_pool_options() -> dict:
+    conf = _client_settings()
+    return {
+        'timeout': httpx.Timeout(conf['TIMEOUT'], connect=conf['CONNECT_TIMEOUT']),
+        'limits': httpx.Limits(
+            max_connections=conf['MAX_CONNECTIONS'],
+            max_keepalive_connections=conf['MAX_KEEPALIVE_CONNECTIONS'],
+            keepalive_expiry=conf['KEEPALIVE_EXPIRY'],
+        ),
+    }
+
+
+class _TimedStream(httpx.SyncByteStream):
+    def __init__(self, stream, metrics, started):
+        self._stream, self._metrics, self._started = stream, metrics, started
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._metrics.add_supabase_call(time.perf_counter() - self._started)
+
+
+class _AsyncTimedStream(httpx.AsyncByteStream):
+    def __init__(self, stream, metrics, started):
+        self._stream, self._metrics, self._started = stream, metrics, started
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._metrics.add_supabase_call(time.perf_counter() - self._started)
+
+
+class TimedTransport(httpx.HTTPTransport):
+    """
+    Connection-pooling transport that charges each Supabase call to the
+    current request's metrics. The call ends when its body has been read
+    and the response closed, so download time is included.
+    """
+
+    def handle_request(self, request):
+        metrics = current_metrics()
+        if metrics is None:
+            return super().handle_request(request)
+        started = time.perf_counter()
+        try:
+            response = super().handle_request(request)
+        except Exception:
+            metrics.add_supabase_call(time.perf_counter() - started)
+            raise
+        response.stream = _TimedStream(response.stream, metrics, started)
+        return response
+
+
+class AsyncTimedTransport(httpx.AsyncHTTPTransport):
+    """TimedTransport for the async clients."""
+
+    async def handle_async_request(self, request):
+        metrics = current_metrics()
+        if metrics is None:
+            return await super().handle_async_request(request)
+        started = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            metrics.add_supabase_call(time.perf_counter() - started)
+            raise
+        response.stream = _AsyncTimedStream(response.stream, metrics, started)
+        return response
+
+
+def new_supabase_client() -> Client:
+    """Build a fresh Supabase client with its own HTTP connection pool."""
+    url, key = _credentials()
+    pool = _http_pool_options()
+    # A custom transport owns the pool, so the limits are given to it
+    http = httpx.Client(timeout=pool['timeout'], transport=TimedTransport(limits=pool['limits']))
+    options = SyncClientOptions(httpx_client=http, postgrest_client_timeout=pool['timeout'])
+    return create_client(url, key, options=options)
+
+
+def get_supabase_client() -> Client:
+    """
+    Return the process-wide Supabase client, creating it on first use.
+
+    The client is rebuilt when the current PID differs from the one that
+    created it, so workers forked by gunicorn/uvicorn never share sockets
+    with their parent.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            client = new_supabase_client()
+            # Initialise the lazy PostgREST sub-client while holding the lock
+            client.postgrest
+            _client, _client_pid = client, pid
+        return _client
+
+
+def get_async_supabase_client() -> AsyncClient:
+    """
+    Return the async Supabase client for the running event loop.
+
+    ASGI workers run a single loop, so this is effectively one pooled client
+    per process, shared by every concurrent request on that loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        url, key = _credentials()
+        pool = _http_pool_options()
+        http = httpx.AsyncClient(timeout=pool['timeout'], transport=AsyncTimedTransport(limits=pool['limits']))
+        options = AsyncClientOptions(httpx_client=http, postgrest_client_timeout=pool['timeout'])
+        # The constructor does no I/O, so no other coroutine can interleave here
+        client = AsyncClient(url, key, options)
+        client.postgrest
+        _async_clients[loop] = client
+    return client
+
+
+def close_supabase_client() -> None:
+    """Close the pooled client's connections (e.g. on worker shutdown)."""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.options.httpx_client.close()
+        _client, _client_pid = None, None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+
+    with _client_lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(
+                max_workers=_client_settings()['FANOUT_WORKERS'],
+                thread_name_prefix='supabase-fanout',
+            )
+            _executor_pid = pid
+        return _executor
+
+
+def _fanout_timeout(timeout):
+    if timeout is not None:
+        return timeout
+    conf = _client_settings()
+    return conf['FANOUT_TIMEOUT'] if conf['FANOUT_TIMEOUT'] is not None else conf['TIMEOUT']
+
+
+def _run_in_pool(fn, args, kwargs):
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        # Pool threads never see request_finished; let them recycle DB
+        # connections the same way request threads do.
+        close_old_connections()
+
+
+def submit_call(fn, *args, **kwargs) -> Future:
+    """
+    Start ``fn(*args, **kwargs)`` on the shared fan-out pool and return its Future.
+
+    ``fn`` must not submit work to the pool and wait for it (e.g. through
+    execute_concurrently()): once every worker is blocked that way, the
+    queued inner calls never start and all of them time out.
+    """
+    started_at = time.monotonic()
+    # Carry context variables (the request's metrics) into the pool thread
+    context = contextvars.copy_context()
+    future = _get_executor().submit(context.run, _run_in_pool, fn, args, kwargs)
+    future.started_at = started_at
+    return future
+
+
+def submit_query(query) -> Future:
+    """Start executing a PostgREST query in the background; its result is the rows."""
+    return submit_call(lambda: query.execute().data)
+
+
+def query_result(future: Future, timeout: float | None = None, name: str = 'query'):
+    """
+    Wait for a call started with submit_call()/submit_query() and return its result.
+
+    ``timeout`` counts from when the query was submitted, so results that
+    were awaited after other work still get their full budget, no more.
+    """
+    deadline = future.started_at + _fanout_timeout(timeout)
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Supabase {name} timed out.")
+
+
+def execute_concurrently(queries: dict, timeout: float | None = None, timeouts: dict | None = None) -> dict:
+    """
+    Run independent PostgREST queries at the same time.
+
+    ``queries`` maps names to un-executed request builders; the result maps
+    the same names to their rows. ``timeouts`` overrides ``timeout`` per name.
+    Page latency becomes the slowest query instead of the sum of all of them.
+    """
+    timeouts = timeouts or {}
+    futures = {name: submit_query(query) for name, query in queries.items()}
+    try:
+        return {
+            name: query_result(future, timeouts.get(name, timeout), name=f"query '{name}'")
+            for name, future in futures.items()
+        }
+    finally:
+        for future in futures.values():
+            future.cancel()
+
+
+def _reset_after_fork() -> None:
+    # The child inherits the parent's lock, sockets and (dead) pool threads;
+    # drop them without closing, since the parent still owns the connections.
+    global _client, _client_pid, _client_lock, _executor, _executor_pid
+    _client, _client_pid = None, None
+    _executor, _executor_pid = None, None
+    _async_clients.clear()
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
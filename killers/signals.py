@@ -1,8 +1,15 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User, Permission
 from django.contrib.contenttypes.models import ContentType
 from .models import Suggestion, Modification, SerialKiller
+from .conditional import KILLERS_DATASET, bump_dataset_version
+from .countries import sync_countries
+from .mo_tags import sync_mo_tags
+from .parsers import COUNTRY_FIELDS
+from .throughput import log_transitions
+from .stats import apply_deltas, contributions_for, diff, row_contributions, stored_row
 
 
 @receiver(post_save, sender=User)
@@ -25,3 +32,78 @@ def grant_staff_permissions(sender, instance, created, **kwargs):
                 
         except Group.DoesNotExist:
             print("[ERROR] 'Staff' group does not exist! Please run migrations.")
+
+
+@receiver(post_save, sender=SerialKiller)
+@receiver(post_delete, sender=SerialKiller)
+def bump_killers_version(sender, instance, **kwargs):
+    """Invalidate ETags of the public killers API after any killer write."""
+    transaction.on_commit(lambda: bump_dataset_version(KILLERS_DATASET))
+
+
+@receiver(pre_save, sender=SerialKiller)
+@receiver(pre_save, sender=Suggestion)
+@receiver(pre_save, sender=Modification)
+def remember_dashboard_contributions(sender, instance, raw=False, **kwargs):
+    """
+    Capture what the stored row contributes to the dashboard before it
+    changes, and for submissions its status, so a status change can be
+    logged after saving.
+    """
+    instance._dashboard_contributions = instance._stored_status = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    row = stored_row(sender, instance.pk)
+    instance._dashboard_contributions = row_contributions(sender, row)
+    if row is not None and sender is not SerialKiller:
+        instance._stored_status = row['submission_status']
+
+
+@receiver(post_save, sender=SerialKiller)
+@receiver(post_save, sender=Suggestion)
+@receiver(post_save, sender=Modification)
+def update_dashboard_stats(sender, instance, created, raw=False, **kwargs):
+    """Apply only the difference between the old and new row to the dashboard counters."""
+    if raw:
+        return
+    old = getattr(instance, '_dashboard_contributions', None) or {}
+    apply_deltas(diff(old, contributions_for(instance)))
+    instance._dashboard_contributions = None
+
+
+@receiver(post_delete, sender=SerialKiller)
+@receiver(post_delete, sender=Suggestion)
+@receiver(post_delete, sender=Modification)
+def remove_dashboard_stats(sender, instance, **kwargs):
+    apply_deltas(diff(contributions_for(instance), {}))
+
+
+@receiver(post_save, sender=SerialKiller)
+@receiver(post_save, sender=Suggestion)
+def sync_country_links(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Mirror birth_country / active_countries into the country link table."""
+    if raw or (update_fields is not None and not set(update_fields) & set(COUNTRY_FIELDS)):
+        return
+    sync_countries(sender, [{'id': instance.pk, **{f: getattr(instance, f) for f in COUNTRY_FIELDS}}])
+
+
+@receiver(post_save, sender=SerialKiller)
+def sync_killer_mo_tags(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the tag -> killers index in step with modus_operandi."""
+    if raw or (update_fields is not None and 'modus_operandi' not in update_fields):
+        return
+    sync_mo_tags([{'id': instance.pk, 'modus_operandi': instance.modus_operandi}])
+
+
+@receiver(post_save, sender=Suggestion)
+@receiver(post_save, sender=Modification)
+def log_status_transition(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Log a status change using the status captured by remember_dashboard_contributions()."""
+    old = getattr(instance, '_stored_status', None)
+    if raw or created or old is None or old == instance.submission_status:
+        return
+    if update_fields is not None and 'submission_status' not in update_fields:
+        return
+    kind = 'suggestions' if sender is Suggestion else 'modifications'
+    log_transitions(kind, [(instance.pk, old, instance.submission_status, instance.created_at)])
+    instance._stored_status = None
@@ -0,0 +1,197 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from .countries import country_counts
+from .models import DashboardStat, KillerMoTag, SerialKiller, Suggestion, Modification
+from .parsers import MO_TAG_CHOICES, parse_mo_tags
+from .throughput import log_bulk_status_change
+
+# Fields each model's dashboard contributions depend on
+KILLER_FIELDS = ('gender', 'modus_operandi', 'active_start_year', 'proven_victims', 'possible_victims_min')
+SUBMISSION_FIELDS = ('submission_status',)
+
+KEY_MAX_LENGTH = DashboardStat._meta.get_field('key').max_length
+
+
+def killer_contributions(row):
+    """Counter of ``(metric, key) -> amount`` that one killer adds to the stats."""
+    counts = Counter({('killers', 'total'): 1})
+    if row.get('gender'):
+        counts[('killers.gender', row['gender'])] += 1
+    for tag in parse_mo_tags(row.get('modus_operandi')):
+        counts[('killers.mo', tag)] += 1
+    if row.get('active_start_year') is not None:
+        counts[('killers.decade', str(row['active_start_year'] // 10 * 10))] += 1
+    counts[('killers.victims', 'proven')] += row.get('proven_victims') or 0
+    counts[('killers.victims', 'possible')] += row.get('possible_victims_min') or 0
+    return counts
+
+
+def submission_contributions(kind, row):
+    return Counter({(f'{kind}.status', row.get('submission_status') or 'new'): 1})
+
+
+def contributions_for(instance):
+    """Dashboard contributions of a model instance (or None for untracked models)."""
+    if isinstance(instance, SerialKiller):
+        return killer_contributions({f: getattr(instance, f) for f in KILLER_FIELDS})
+    if isinstance(instance, Suggestion):
+        return submission_contributions('suggestions', {'submission_status': instance.submission_status})
+    if isinstance(instance, Modification):
+        return submission_contributions('modifications', {'submission_status': instance.submission_status})
+    return None
+
+
+def stored_row(model, pk):
+    """The fields the row's contributions depend on, as currently stored (None if it is gone)."""
+    fields = KILLER_FIELDS if model is SerialKiller else SUBMISSION_FIELDS
+    return model._base_manager.filter(pk=pk).values(*fields).first()
+
+
+def row_contributions(model, row):
+    """Contributions of a stored_row(), read before the row is overwritten."""
+    if row is None:
+        return Counter()
+    if model is SerialKiller:
+        return killer_contributions(row)
+    return submission_contributions('suggestions' if model is Suggestion else 'modifications', row)
+
+
+def apply_deltas(deltas):
+    """Atomically add each non-zero delta to its counter row, creating rows as needed."""
+    for (metric, key), amount in deltas.items():
+        if not amount:
+            continue
+        stats = DashboardStat.objects.filter(metric=metric, key=key)
+        if stats.update(value=F('value') + amount):
+            continue
+        try:
+            with transaction.atomic():
+                DashboardStat.objects.create(metric=metric, key=key, value=amount)
+        except IntegrityError:
+            # Another writer created the row first
+            stats.update(value=F('value') + amount)
+
+
+def diff(old, new):
+    deltas = Counter(new)
+    deltas.subtract(old)
+    return deltas
+
+
+def record_bulk_status_change(kind, queryset, new_status):
+    """
+    Adjust status counters (and log the transitions) for a
+    ``queryset.update(submission_status=...)``, which bypasses model
+    signals. Call before running the update.
+    """
+    deltas = Counter()
+    counts = queryset.order_by().values('submission_status').annotate(count=Count('id'))
+    for old_status, count in counts.values_list('submission_status', 'count'):
+        deltas[(f'{kind}.status', old_status or 'new')] -= count
+        deltas[(f'{kind}.status', new_status)] += count
+    log_bulk_status_change(kind, queryset, new_status)
+    apply_deltas(deltas)
+
+
+def get_dashboard_stats(top=5):
+    """
+    Read the dashboard statistics from the counter table with a few indexed
+    queries; top countries come from one aggregate over the country links.
+    """
+    fixed = {
+        (metric, key): value
+        for metric, key, value in DashboardStat.objects.filter(
+            metric__in=['killers', 'killers.victims', 'killers.gender', 'suggestions.status', 'modifications.status']
+        ).values_list('metric', 'key', 'value')
+    }
+
+    def top_buckets(metric, limit):
+        return list(
+            DashboardStat.objects.filter(metric=metric, value__gt=0)
+            .order_by('-value', 'key')
+            .values_list('key', 'value')[:limit]
+        )
+
+    decade = top_buckets('killers.decade', 1)
+    gender_distribution = {
+        key: value for (metric, key), value in fixed.items() if metric == 'killers.gender' and value > 0
+    }
+
+    def status_count(kind, status):
+        return fixed.get((f'{kind}.status', status), 0)
+
+    return {
+        'killer_stats': {
+            'total': fixed.get(('killers', 'total'), 0),
+            'top_countries': [(row['name'], row['killers']) for row in country_counts(top)],
+            'gender_distribution': gender_distribution,
+            'top_mo': top_buckets('killers.mo', top),
+            'most_active_decade': (int(decade[0][0]), decade[0][1]) if decade else None,
+            'total_proven_victims': fixed.get(('killers.victims', 'proven'), 0),
+            'total_possible_victims': fixed.get(('killers.victims', 'possible'), 0),
+        },
+        'submission_stats': {
+            'suggestions_new': status_count('suggestions', 'new'),
+            'suggestions_progress': status_count('suggestions', 'in_progress'),
+            'suggestions_done': status_count('suggestions', 'finished'),
+            'corrections_new': status_count('modifications', 'new'),
+            'corrections_progress': status_count('modifications', 'in_progress'),
+            'corrections_done': status_count('modifications', 'finished'),
+        },
+    }
+
+
+def mo_tag_counts():
+    """
+    Killers per modus operandi tag, most first, from the ``killers.mo``
+    counters (the size of each tag's postings): ``[{'tag', 'label', 'killers'}]``.
+    """
+    labels = dict(MO_TAG_CHOICES)
+    rows = (
+        DashboardStat.objects.filter(metric='killers.mo', key__in=labels, value__gt=0)
+        .order_by('-value', 'key').values_list('key', 'value')
+    )
+    return [{'tag': tag, 'label': labels[tag], 'killers': count} for tag, count in rows]
+
+
+def rebuild_dashboard_stats():
+    """Recompute every counter with GROUP BY/SUM queries and replace the stored values."""
+    killers = SerialKiller.objects.order_by()
+    totals = Counter()
+    victims = killers.aggregate(
+        total=Count('id'), proven=Sum('proven_victims'), possible=Sum('possible_victims_min')
+    )
+    totals[('killers', 'total')] = victims['total']
+    totals[('killers.victims', 'proven')] = victims['proven'] or 0
+    totals[('killers.victims', 'possible')] = victims['possible'] or 0
+
+    genders = killers.exclude(gender__isnull=True).exclude(gender='')
+    for key, count in genders.values_list('gender').annotate(n=Count('id')):
+        totals[('killers.gender', key[:KEY_MAX_LENGTH])] += count
+    # Size of each tag's postings, read from the (tag, killer) index
+    for tag, count in KillerMoTag.objects.order_by().values_list('tag').annotate(n=Count('id')):
+        totals[('killers.mo', tag)] = count
+
+    decades = (
+        killers.filter(active_start_year__isnull=False)
+        .annotate(decade=F('active_start_year') / 10 * 10)
+        .values_list('decade')
+        .annotate(n=Count('id'))
+    )
+    for decade, count in decades:
+        totals[('killers.decade', str(decade))] = count
+
+    for kind, model in (('suggestions', Suggestion), ('modifications', Modification)):
+        for row in model.objects.order_by().values('submission_status').annotate(n=Count('id')):
+            totals[(f'{kind}.status', row['submission_status'] or 'new')] += row['n']
+
+    with transaction.atomic():
+        DashboardStat.objects.all().delete()
+        DashboardStat.objects.bulk_create(
+            [DashboardStat(metric=metric, key=key, value=value) for (metric, key), value in totals.items()],
+            batch_size=1000,
+        )
+    return len(totals)
@@ -1,3 +1,1204 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from supabase import create_client
+
+from . import async_views, services, views
+from .admin import EstimatedCountPaginator
+from .approvals import approve_suggestions
+from .autocomplete import PrefixIndex
+from .benchmarking import FakePostgrest, synthetic_killer
+from .compression import CompressionMiddleware, brotli, choose_encoding
+from .conditional import KILLERS_DATASET, dataset_conditional
+from .countries import country_counts, sync_countries
+from .duplicates import KILLER, SUGGESTION, NameIndex, record_names, rescore_suggestions
+from .exports import EXPORT_FIELDS, aiter_killer_rows, iter_killer_rows
+from .filters import filter_queryset, parse_killer_filters
+from .importers import bulk_write, clean_row
+from .kanban import CARD_ORDERING, board, column_page
+from .metrics import HISTOGRAMS, Histogram, MetricsMiddleware, metrics_view, render_metrics
+from .mo_tags import sync_mo_tags
+from .models import DashboardStat, KillerMoTag, Modification, SerialKiller, StatusTransition, Suggestion
+from .parsers import country_links, derived_fields, parse_countries, parse_mo_tags
+from .pagination import ORDERINGS, Cursor, decode_cursor, keyset_queryset, select_columns
+from .renderers import OrjsonRenderer
+from .repositories import PostgrestRepository
+from .services import execute_concurrently, new_supabase_client
+from .stats import apply_deltas, diff, get_dashboard_stats, mo_tag_counts, rebuild_dashboard_stats
+from .throttling import check_rate, get_store, rate_limited
+from .throughput import (
+    bucket_starts, log_transitions, parse_bucket, parse_bucket_count, submission_throughput,
+)
+from .transitions import apply_transitions, parse_transitions
+
+
+class KillerListingPlanTests(TestCase):
+    """
+    The listing must stay an index range scan for the common filter and
+    ordering combinations, however deep the cursor is.
+
+    Sequential scans, bitmap scans and sorts are disabled for the transaction
+    so the planner's choice doesn't depend on the (tiny) test table size: a
+    Seq Scan or Sort in the plan means no index returns the rows in order.
+    """
+
+    # Index each ?ordering= pages through (descending ones read it backwards
+    # when paging back)
+    ORDERING_INDEXES = {
+        'common_name': 'killer_name_keyset',
+        '-common_name': 'killer_name_keyset',
+        'proven_victims': 'killer_victims_keyset',
+        '-proven_victims': 'killer_victims_desc_keyset',
+        'active_start_year': 'killer_start_year_keyset',
+        '-active_start_year': 'killer_start_year_desc_keyset',
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        SerialKiller.objects.bulk_create([
+            SerialKiller(
+                # Insert out of name order, like real data, so the heap isn't sorted by name
+                common_name=f"Killer {i * 7 % 1000:03d}",
+                status=['imprisoned', 'deceased', 'at_large'][i % 3],
+                gender=['male', 'female'][i % 2],
+                birth_country=['USA', 'UK', 'Germany'][i % 3],
+                modus_operandi=['Poisoning', 'Strangled victims', 'Shooting'][i % 3],
+                proven_victims=i % 20,
+            )
+            for i in range(1000)
+        ])
+        sync_countries(SerialKiller, SerialKiller.objects.values('id', 'birth_country', 'active_countries'))
+        sync_mo_tags(SerialKiller.objects.values('id', 'modus_operandi'))
+        # Fresh statistics, so plans don't depend on what earlier tests left behind
+        with connection.cursor() as db:
+            db.execute('ANALYZE "Serial Killers", "Countries", "Killer Countries", "Killer MO Tags"')
+
+    def plan(self, params, ordering='common_name', cursor=None):
+        filters = parse_killer_filters(params)
+        queryset = keyset_queryset(filter_queryset(SerialKiller.objects.all(), filters), cursor, 50, ORDERINGS[ordering])
+        with connection.cursor() as db:
+            db.execute(
+                'SET LOCAL enable_seqscan = off; SET LOCAL enable_bitmapscan = off;'
+                ' SET LOCAL enable_sort = off; SET LOCAL enable_incremental_sort = off'
+            )
+        return queryset.explain()
+
+    def assertIndexScan(self, plan, *indexes):
+        self.assertNotIn('Seq Scan', plan)
+        self.assertNotIn('Sort', plan)
+        for index in indexes:
+            self.assertRegex(plan, rf'using {index} ')
+
+    def test_orderings(self):
+        for name, index in self.ORDERING_INDEXES.items():
+            ordering = ORDERINGS[name]
+            value = 'Killer 100' if ordering.column == 'common_name' else 10
+            cursors = [None, Cursor(value, 101, False), Cursor(value, 101, True)]
+            if ordering.nullable:
+                cursors += [Cursor(None, 101, False), Cursor(None, 101, True)]
+            for cursor in cursors:
+                with self.subTest(ordering=name, cursor=cursor):
+                    self.assertIndexScan(self.plan({}, ordering=name, cursor=cursor), index)
+
+    def test_equality_filters(self):
+        cases = (
+            ({'status': 'imprisoned'}, 'killer_status_name_keyset'),
+            ({'gender': 'female'}, 'killer_gender_name_keyset'),
+            ({'birth_country': 'UK'}, 'killer_country_name_keyset'),
+        )
+        for params, index in cases:
+            with self.subTest(params=params):
+                self.assertIndexScan(self.plan(params), index)
+                self.assertIndexScan(self.plan(params, cursor=Cursor('Killer 100', 101, False)), index)
+                self.assertIndexScan(self.plan(params, cursor=Cursor('Killer 100', 101, True)), index)
+
+    def test_country_filter(self):
+        # Killers are walked in name order and each is probed through its
+        # (killer, country, role) links
+        for cursor in (None, Cursor('Killer 100', 101, False), Cursor('Killer 100', 101, True)):
+            with self.subTest(cursor=cursor):
+                self.assertIndexScan(
+                    self.plan({'country': 'usa'}, cursor=cursor), 'killer_name_keyset', 'killer_country_role',
+                )
+
+    def test_mo_filter(self):
+        # Each killer is probed for the tags; (killer, tag) and (tag, killer)
+        # answer that equally well, so the planner may take either
+        plan = self.plan({'mo': 'poisoning,shooting'})
+        self.assertIndexScan(plan, 'killer_name_keyset')
+        self.assertRegex(plan, r'using killer_mo_tag(_lookup)? ')
+
+    def test_min_proven_victims_ordering(self):
+        for name in ('proven_victims', '-proven_victims'):
+            with self.subTest(ordering=name):
+                plan = self.plan({'min_proven_victims': '10'}, ordering=name, cursor=Cursor(12, 50, False))
+                self.assertIndexScan(plan, self.ORDERING_INDEXES[name])
+
+
+@override_settings(KILLERS_DATA_BACKENDS={'default': 'orm'}, KILLERS_RATE_LIMITS={})
+class KeysetPaginationTests(TestCase):
+    """/api/killers/ next/previous links walk every ordering in both directions."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.killers = [
+            SerialKiller.objects.create(
+                common_name=f"Killer {i:02}",
+                # Repeated values exercise the id tie-break, every fourth row is NULL
+                proven_victims=None if i % 4 == 0 else i % 3,
+                years_active=None if i % 4 == 1 else str(1950 + i % 5 * 10),
+            )
+            for i in range(13)
+        ]
+
+    def expected(self, ordering):
+        col = ordering.column
+        rows = [{'id': k.pk, col: getattr(k, col)} for k in self.killers]
+        present = sorted((r for r in rows if r[col] is not None), key=lambda r: (r[col], r['id']),
+                         reverse=ordering.descending)
+        missing = sorted((r for r in rows if r[col] is None), key=lambda r: r['id'], reverse=ordering.descending)
+        return [r['id'] for r in present + missing]
+
+    def walk(self, name, fields=None):
+        """Ids seen following next links to the end, then previous links back to the start."""
+        params = {'ordering': name, 'page_size': 4, **({'fields': fields} if fields else {})}
+        page = self.client.get('/api/killers/', params).json()
+        forward = [page]
+        while page['next']:
+            page = self.client.get(page['next']).json()
+            forward.append(page)
+        backward = [page]
+        while page['previous']:
+            page = self.client.get(page['previous']).json()
+            backward.insert(0, page)
+        return forward, backward
+
+    def test_pages_in_both_directions(self):
+        for name, ordering in ORDERINGS.items():
+            with self.subTest(ordering=name):
+                forward, backward = self.walk(name)
+                ids = [[row['id'] for row in page['results']] for page in forward]
+                self.assertEqual(sum(ids, []), self.expected(ordering))
+                self.assertEqual([[row['id'] for row in page['results']] for page in backward], ids)
+                self.assertIsNone(backward[0]['previous'])
+
+    def test_fields_keep_keyset_columns(self):
+        ordering = ORDERINGS['-proven_victims']
+        self.assertEqual(select_columns(['status'], ordering), 'id,proven_victims,status')
+        forward, _ = self.walk('-proven_victims', fields='common_name')
+        self.assertTrue(all(list(row) == ['common_name'] for page in forward for row in page['results']))
+        names = {k.pk: k.common_name for k in self.killers}
+        self.assertEqual(
+            [row['common_name'] for page in forward for row in page['results']],
+            [names[pk] for pk in self.expected(ordering)],
+        )
+
+    def test_cursor_is_bound_to_its_ordering(self):
+        page = self.client.get('/api/killers/', {'ordering': 'proven_victims', 'page_size': 4}).json()
+        cursor = page['next'].rpartition('cursor=')[2]
+        self.assertEqual(decode_cursor(cursor, ORDERINGS['proven_victims']).reverse, False)
+
+        response = self.client.get('/api/killers/', {'ordering': 'common_name', 'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.json()['error'])
+        with self.assertRaises(ValueError):
+            decode_cursor(cursor, ORDERINGS['-proven_victims'])
+
+
+class ConditionalRequestTests(TestCase):
+    """Dataset-versioned ETags short-circuit unchanged reads before the view runs."""
+
+    def setUp(self):
+        self.calls = 0
+
+        def view(request):
+            self.calls += 1
+            return JsonResponse({'error': 'boom'}, status=500) if 'fail' in request.GET else JsonResponse({})
+
+        self.view = dataset_conditional(KILLERS_DATASET)(view)
+
+    def get(self, path='/api/killers/', **headers):
+        return self.view(RequestFactory().get(path, headers=headers))
+
+    def test_if_none_match_skips_the_view(self):
+        etag = self.get()['ETag']
+        response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.calls, 1)
+
+        async def view(request):
+            self.calls += 1
+            return JsonResponse({})
+
+        async_view = dataset_conditional(KILLERS_DATASET)(view)
+        request = RequestFactory().get('/api/killers/', headers={'if_none_match': etag})
+        self.assertEqual(async_to_sync(async_view)(request).status_code, 304)
+        self.assertEqual(self.calls, 1)
+
+    @override_settings(KILLERS_DATA_BACKENDS={'default': 'orm'}, KILLERS_RATE_LIMITS={'killers_list': '1/min'},
+                       KILLERS_RATE_LIMIT_STORE='local')
+    def test_revalidations_are_throttled_first(self):
+        etag = views.get_all_killers(RequestFactory().get('/api/killers/'))['ETag']
+        revalidate = RequestFactory().get('/api/killers/', headers={'if_none_match': etag})
+        for view in (views.get_all_killers, async_to_sync(async_views.get_all_killers)):
+            with self.subTest(view=view):
+                get_store().clear()
+                self.assertEqual(view(revalidate).status_code, 304)
+                self.assertEqual(view(revalidate).status_code, 429)
+
+    def test_etag_changes_when_killers_change(self):
+        etags = [self.get()['ETag']]
+        with self.captureOnCommitCallbacks(execute=True):
+            killer = SerialKiller.objects.create(common_name='Changed')
+        etags.append(self.get()['ETag'])
+        with self.captureOnCommitCallbacks(execute=True):
+            killer.delete()
+        etags.append(self.get()['ETag'])
+
+        self.assertEqual(len(set(etags)), 3)
+        self.assertEqual(self.get(if_none_match=etags[0]).status_code, 200)
+        self.assertNotEqual(self.get('/api/killers/?page_size=5')['ETag'], etags[-1])
+
+    def test_errors_get_no_validators(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            SerialKiller.objects.create(common_name='Dated')
+        response = self.get('/api/killers/?fail=1')
+        self.assertEqual(response.status_code, 500)
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+        self.assertIn('Last-Modified', self.get())
+
+
+class KillerFilterParsingTests(TestCase):
+
+    def test_choice_lists(self):
+        filters = parse_killer_filters({'status': 'imprisoned,at_large', 'gender': 'male'})
+        self.assertEqual(filters, {'status': ['imprisoned', 'at_large'], 'gender': ['male']})
+
+    def test_invalid_values(self):
+        for params in ({'status': 'escaped'}, {'gender': ','}, {'min_proven_victims': '-1'}, {'min_proven_victims': 'x'}):
+            with self.subTest(params=params), self.assertRaises(ValueError):
+                parse_killer_filters(params)
+
+
+@override_settings(KILLERS_DATA_BACKENDS={'default': 'orm'}, KILLERS_RATE_LIMITS={})
+class NameLookupLimitTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        SerialKiller.objects.bulk_create([SerialKiller(common_name=f"Bundy {i}") for i in range(25)])
+
+    def test_limit_parameter(self):
+        self.assertEqual(len(self.client.get('/api/killers/Bundy/').json()), 20)
+        self.assertEqual(len(self.client.get('/api/killers/Bundy/?limit=25').json()), 25)
+        self.assertEqual(len(self.client.get('/api/killers/Bundy/?limit=0').json()), 1)
+        self.assertEqual(self.client.get('/api/killers/Bundy/?limit=x').status_code, 400)
+
+
+class CountryParsingTests(SimpleTestCase):
+
+    def test_aliases_and_separators(self):
+        self.assertEqual(parse_countries('USA, Canada; u.s.a. / England'), ['United States', 'Canada', 'United Kingdom'])
+        self.assertEqual(parse_countries('trinidad and tobago'), ['Trinidad and Tobago'])
+        self.assertEqual(parse_countries(' , '), [])
+        self.assertEqual(parse_countries(None), [])
+
+    def test_country_links(self):
+        links = country_links({'birth_country': 'UK', 'active_countries': 'UK, France'})
+        self.assertEqual(links, {('United Kingdom', 'birth'), ('United Kingdom', 'active'), ('France', 'active')})
+
+    def test_filter_parsing(self):
+        self.assertEqual(parse_killer_filters({'country': ' usa '}), {'country': 'United States'})
+        with self.assertRaises(ValueError):
+            parse_killer_filters({'country': ' . '})
+
+
+class CountryDimensionTests(TestCase):
+
+    def countries(self, killer):
+        return set(killer.country_links.values_list('country__name', 'role'))
+
+    def test_links_follow_saves(self):
+        killer = SerialKiller.objects.create(common_name='A', birth_country='USA', active_countries='USA, Canada')
+        self.assertEqual(self.countries(killer), {('United States', 'birth'), ('United States', 'active'), ('Canada', 'active')})
+
+        killer.active_countries = 'Mexico'
+        killer.save()
+        self.assertEqual(self.countries(killer), {('United States', 'birth'), ('Mexico', 'active')})
+
+        killer.notes = 'untouched links'
+        with mock.patch('killers.signals.sync_countries') as sync:
+            killer.save(update_fields=['notes'])
+        sync.assert_not_called()
+
+    def test_filter_and_counts(self):
+        bulk_write(SerialKiller, [
+            {'common_name': 'A', 'birth_country': 'USA', 'active_countries': 'USA'},
+            {'common_name': 'B', 'birth_country': 'Canada', 'active_countries': 'United States'},
+            {'common_name': 'C', 'birth_country': 'UK'},
+        ])
+        filtered = filter_queryset(SerialKiller.objects.all(), parse_killer_filters({'country': 'United States'}))
+        self.assertEqual(sorted(filtered.values_list('common_name', flat=True)), ['A', 'B'])
+
+        with self.assertNumQueries(1):
+            counts = country_counts()
+        self.assertEqual(counts[0], {'name': 'United States', 'killers': 2, 'born': 1, 'active': 2})
+        self.assertEqual([row['name'] for row in counts[1:]], ['Canada', 'United Kingdom'])
+        self.assertEqual(get_dashboard_stats()['killer_stats']['top_countries'][0], ('United States', 2))
+
+
+class MoTagParsingTests(SimpleTestCase):
+
+    def test_parse_mo_tags(self):
+        self.assertEqual(parse_mo_tags('Shot victims with a rifle, then dismembered'), ['shooting', 'mutilation'])
+        self.assertEqual(parse_mo_tags('Poisoned with ARSENIC'), ['poisoning'])
+        self.assertEqual(parse_mo_tags('Fired at passing cars'), [])
+        self.assertEqual(parse_mo_tags(None), [])
+        with self.assertRaises(ValueError):
+            parse_killer_filters({'mo': 'poisoning,witchcraft'})
+
+
+class MoTagTests(TestCase):
+
+    def test_index_follows_saves(self):
+        killer = SerialKiller.objects.create(common_name='A', modus_operandi='Strangulation')
+        SerialKiller.objects.create(common_name='B', modus_operandi='Poisoning and strangulation')
+        self.assertEqual(list(killer.mo_tags.values_list('tag', flat=True)), ['strangulation'])
+
+        killer.modus_operandi = 'Drowning'
+        killer.save()
+        self.assertEqual(list(killer.mo_tags.values_list('tag', flat=True)), ['drowning'])
+        self.assertEqual(
+            [(row['tag'], row['killers']) for row in mo_tag_counts()],
+            [('drowning', 1), ('poisoning', 1), ('strangulation', 1)],
+        )
+
+        filtered = filter_queryset(SerialKiller.objects.all(), parse_killer_filters({'mo': 'strangulation,drowning'}))
+        self.assertEqual(sorted(filtered.values_list('common_name', flat=True)), ['A', 'B'])
+
+        killer.delete()
+        self.assertEqual([row['tag'] for row in mo_tag_counts()], ['poisoning', 'strangulation'])
+
+    def test_bulk_write_tags(self):
+        bulk_write(SerialKiller, [{'common_name': 'C', 'modus_operandi': 'Stabbing'}])
+        self.assertEqual(list(KillerMoTag.objects.values_list('killer__common_name', 'tag')), [('C', 'stabbing')])
+        rebuild_dashboard_stats()
+        self.assertEqual(get_dashboard_stats()['killer_stats']['top_mo'], [('stabbing', 1)])
+
+
+class DashboardCounterTests(TestCase):
+    """Incrementally maintained counters always equal a full recount."""
+
+    def counters(self):
+        return {
+            (metric, key): value
+            for metric, key, value in DashboardStat.objects.exclude(value=0).values_list('metric', 'key', 'value')
+        }
+
+    def assertMatchesRecount(self):
+        incremental = self.counters()
+        rebuild_dashboard_stats()
+        self.assertEqual(incremental, self.counters())
+
+    def test_diff_and_apply_deltas(self):
+        deltas = diff(Counter({('a', 'x'): 1, ('a', 'y'): 2}), Counter({('a', 'y'): 5, ('a', 'z'): 1}))
+        self.assertEqual(deltas, {('a', 'x'): -1, ('a', 'y'): 3, ('a', 'z'): 1})
+
+        apply_deltas(deltas)
+        apply_deltas(Counter({('a', 'z'): 2, ('a', 'w'): 0}))
+        self.assertEqual(self.counters(), {('a', 'x'): -1, ('a', 'y'): 3, ('a', 'z'): 3})
+
+    def test_writes_keep_counters_equal_to_recount(self):
+        first = SerialKiller.objects.create(
+            common_name='First', gender='male', modus_operandi='Strangulation', years_active='1974-1978',
+            proven_victims=3, possible_victims='5-7',
+        )
+        second = SerialKiller.objects.create(common_name='Second', gender='female', years_active='1991')
+        suggestion = Suggestion.objects.create(common_name='Suggested')
+        correction = Modification.objects.create(killer=second, suggestion_text='Fix the dates')
+        self.assertMatchesRecount()
+
+        first.gender, first.modus_operandi, first.years_active = 'female', 'Poisoning', '1982-1990'
+        first.proven_victims, first.possible_victims = 4, '10'
+        first.save()
+        self.assertMatchesRecount()
+
+        suggestion.submission_status = 'in_progress'
+        suggestion.save(update_fields=['submission_status'])
+        correction.submission_status = 'finished'
+        correction.save()
+        self.assertMatchesRecount()
+
+        # Deleting the killer also deletes its correction
+        second.delete()
+        suggestion.delete()
+        self.assertMatchesRecount()
+        self.assertEqual(self.counters()[('killers', 'total')], 1)
+
+    def test_rebuild_repairs_drifted_counters(self):
+        SerialKiller.objects.create(common_name='Counted', gender='male', proven_victims=2)
+        expected = self.counters()
+        apply_deltas(Counter({('killers', 'total'): 5, ('killers.gender', 'unknown'): 1}))
+
+        rebuild_dashboard_stats()
+        self.assertEqual(self.counters(), expected)
+
+
+class BulkImportTests(TestCase):
+
+    def test_clean_row_validates_choices(self):
+        row = clean_row(SerialKiller, {'common_name': 'Test', 'gender': 'male', 'proven_victims': '3', 'status': ''})
+        self.assertEqual(row, {'common_name': 'Test', 'gender': 'male', 'proven_victims': 3, 'status': None})
+        for bad in ({'common_name': 'Test', 'gender': 'other'}, {'common_name': ''}, {'common_name': 'Test', 'height': '2'},
+                    ['Test'], 'Test', None):
+            with self.subTest(row=bad), self.assertRaises(ValidationError):
+                clean_row(SerialKiller, bad)
+
+    def test_non_object_ndjson_lines_are_row_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'killers.ndjson')
+            with open(path, 'w') as f:
+                f.write('{"common_name": "First"}\n["Second"]\n{"common_name": "Third"}\n')
+            with self.assertRaisesMessage(CommandError, 'Row 2: Expected a JSON object, got list.'):
+                call_command('import_killers', path, stdout=io.StringIO())
+            stderr = io.StringIO()
+            call_command('import_killers', path, '--skip-invalid', stdout=io.StringIO(), stderr=stderr)
+        self.assertIn('Skipping row 2', stderr.getvalue())
+        self.assertEqual(sorted(SerialKiller.objects.values_list('common_name', flat=True)), ['First', 'Third'])
+
+    def test_upsert_by_common_name(self):
+        SerialKiller.objects.create(common_name='Existing', gender='male', proven_victims=1)
+        created, updated = bulk_write(SerialKiller, [
+            {'common_name': 'Existing', 'proven_victims': 5, 'years_active': '1970-1975'},
+            {'common_name': 'New', 'gender': 'female'},
+            {'common_name': 'New', 'proven_victims': 2},
+        ], upsert=True)
+
+        self.assertEqual((created, updated), (1, 1))
+        existing = SerialKiller.objects.get(common_name='Existing')
+        self.assertEqual((existing.proven_victims, existing.active_start_year), (5, 1970))
+        new = SerialKiller.objects.get(common_name='New')
+        self.assertEqual((new.gender, new.proven_victims), ('female', 2))
+        stats = get_dashboard_stats()['killer_stats']
+        self.assertEqual((stats['total'], stats['total_proven_victims']), (2, 7))
+
+
+@override_settings(KILLERS_RATE_LIMITS={})
+class ExportTests(TestCase):
+    """Full-dataset exports stream every row, as a sync iterator under WSGI and an async one under ASGI."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            SerialKiller.objects.create(common_name=f"Exported {i}", full_name='Name, "quoted"', proven_victims=i)
+
+    def expected(self):
+        return list(SerialKiller.objects.order_by('pk').values(*EXPORT_FIELDS))
+
+    async def collect(self, response):
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    def test_rows_are_read_in_chunks(self):
+        with CaptureQueriesContext(connection) as queries:
+            rows = list(iter_killer_rows(chunk_size=2))
+        self.assertEqual(rows, self.expected())
+        self.assertEqual(len(queries), 4)
+
+        async def read():
+            return [row async for row in aiter_killer_rows(chunk_size=2)]
+
+        self.assertEqual(async_to_sync(read)(), self.expected())
+
+    def test_ndjson(self):
+        request = RequestFactory().get('/api/killers/export.ndjson')
+        sync = views.export_killers_ndjson(request)
+        response = async_to_sync(async_views.export_killers_ndjson)(request)
+        self.assertFalse(sync.is_async)
+        self.assertTrue(response.is_async)
+
+        body = async_to_sync(self.collect)(response)
+        self.assertEqual(body, b''.join(sync.streaming_content))
+        self.assertEqual(
+            [json.loads(line) for line in body.splitlines()],
+            json.loads(JSONRenderer().render(self.expected())),
+        )
+
+    def test_csv(self):
+        request = RequestFactory().get('/api/killers/export.csv')
+        sync = views.export_killers_csv(request)
+        response = async_to_sync(async_views.export_killers_csv)(request)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+
+        body = async_to_sync(self.collect)(response)
+        self.assertEqual(body, b''.join(sync.streaming_content))
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual([row['common_name'] for row in rows], [f"Exported {i}" for i in range(5)])
+        self.assertEqual(rows[0]['full_name'], 'Name, "quoted"')
+
+
+class ApproveSuggestionsTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('reviewer')
+
+    def suggest(self, count):
+        return Suggestion.objects.bulk_create([
+            Suggestion(common_name=f"Suggested {i}", gender='female', years_active='1980-1990', proven_victims=i)
+            for i in range(count)
+        ])
+
+    def test_matches_per_row_approval(self):
+        self.suggest(3)
+        approved = approve_suggestions(Suggestion.objects.all(), self.user, chunk_size=2)
+
+        self.assertEqual(approved, 3)
+        self.assertFalse(Suggestion.objects.exclude(submission_status='finished').exists())
+        killer = SerialKiller.objects.get(common_name='Suggested 2')
+        self.assertEqual(
+            (killer.gender, killer.proven_victims, killer.active_start_year, killer.assigned_to),
+            ('female', 2, 1980, self.user),
+        )
+        self.assertEqual(get_dashboard_stats()['killer_stats']['total'], 3)
+
+    def test_reports_progress_per_chunk(self):
+        self.suggest(5)
+        calls = []
+        approve_suggestions(Suggestion.objects.all(), self.user, chunk_size=2,
+                            progress=lambda done, total: calls.append((done, total)))
+        self.assertEqual(calls, [(2, 5), (4, 5), (5, 5)])
+
+    def test_admin_action_logs_progress(self):
+        pks = [s.pk for s in self.suggest(3)]
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        with self.assertLogs('killers.admin', 'INFO') as logs:
+            response = self.client.post('/admin/killers/suggestion/', {
+                'action': 'approve_and_create_killer', '_selected_action': pks,
+            }, follow=True)
+        self.assertEqual(logs.output, ['INFO:killers.admin:admin approved 3/3 suggestions'])
+        self.assertContains(response, '3 suggestion(s) approved and added to database in 1 chunk(s).')
+
+    def test_query_count_does_not_grow_with_selection(self):
+        # Create the counter rows first so both measured runs only update them
+        self.suggest(5)
+        approve_suggestions(Suggestion.objects.all(), self.user)
+        self.suggest(5)
+        with CaptureQueriesContext(connection) as small:
+            approve_suggestions(Suggestion.objects.exclude(submission_status='finished'), self.user)
+        self.suggest(200)
+        with CaptureQueriesContext(connection) as large:
+            approve_suggestions(Suggestion.objects.exclude(submission_status='finished'), self.user)
+        self.assertEqual(len(small), len(large))
+
+
+@override_settings(KILLERS_DATA_BACKENDS={'default': 'orm'})
+class DashboardAccessTests(TestCase):
+    """The dashboard's data endpoints are staff only."""
+
+    def setUp(self):
+        self.visitor = User.objects.create_user('visitor', password='pw')
+        self.staff = User.objects.create_user('reviewer', password='pw', is_staff=True)
+
+    def assertStaffOnly(self, request):
+        self.assertEqual(request().status_code, 403)
+        self.client.force_login(self.visitor)
+        self.assertEqual(request().status_code, 403)
+        self.client.force_login(self.staff)
+        self.assertEqual(request().status_code, 200)
+
+    def test_dashboard_cards(self):
+        self.assertStaffOnly(lambda: self.client.get('/api/dashboard/cards/?type=suggestions&status=new'))
+
+    def test_submission_stats(self):
+        self.assertStaffOnly(lambda: self.client.get('/api/stats/submissions/?bucket=week'))
+
+    def test_status_changes(self):
+        suggestion = Suggestion.objects.create(common_name='Suggested')
+        move = {'id': suggestion.pk, 'type': 'Suggestion', 'status': 'finished'}
+        self.assertStaffOnly(lambda: self.client.post('/api/dashboard/transitions/', move, content_type='application/json'))
+        self.client.logout()
+        self.assertEqual(self.client.post('/api/dashboard/update/', move).status_code, 403)
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.post('/api/dashboard/update/', move).status_code, 302)
+
+
+class StatusTransitionTests(TestCase):
+    """Dashboard card moves are set-based and keep the status counters right."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('reviewer', is_staff=True))
+
+    def suggest(self, count):
+        return [Suggestion.objects.create(common_name=f"Suggested {i}") for i in range(count)]
+
+    def test_batch_returns_only_changed_cards(self):
+        first, second, third = self.suggest(3)
+        killer = SerialKiller.objects.create(common_name='Subject')
+        correction = Modification.objects.create(killer=killer, suggestion_text='Fix the dates')
+
+        response = self.client.post('/api/dashboard/transitions/', [
+            {'id': first.pk, 'type': 'Suggestion', 'status': 'finished'},
+            {'id': second.pk, 'type': 'Suggestion', 'status': 'in_progress'},
+            {'id': third.pk, 'type': 'Suggestion', 'status': 'new'},
+            {'id': correction.pk, 'type': 'Correction', 'status': 'finished'},
+            {'id': 999999, 'type': 'Correction', 'status': 'finished'},
+        ], content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(
+            sorted((card['type'], card['id'], card['submission_status']) for card in data['updated']),
+            sorted([('Suggestion', first.pk, 'finished'), ('Suggestion', second.pk, 'in_progress'),
+                    ('Correction', correction.pk, 'finished')]),
+        )
+        self.assertEqual(data['missing'], [{'id': 999999, 'type': 'Correction'}])
+        modification_card = next(card for card in data['updated'] if card['type'] == 'Correction')
+        self.assertEqual(modification_card['killer_name'], 'Subject')
+
+        first.refresh_from_db()
+        self.assertEqual(first.submission_status, 'finished')
+        stats = get_dashboard_stats()['submission_stats']
+        self.assertEqual(
+            (stats['suggestions_new'], stats['suggestions_progress'], stats['suggestions_done']), (1, 1, 1)
+        )
+        self.assertEqual((stats['corrections_new'], stats['corrections_done']), (0, 1))
+
+    def test_query_count_does_not_grow_with_batch(self):
+        suggestions = self.suggest(56)
+
+        def moves(items, status):
+            return parse_transitions([{'id': s.pk, 'type': 'Suggestion', 'status': status} for s in items])
+
+        # Create the counter rows first so both measured runs only update them
+        apply_transitions(moves(suggestions[:1], 'in_progress'))
+        with CaptureQueriesContext(connection) as small:
+            apply_transitions(moves(suggestions[1:6], 'in_progress'))
+        with CaptureQueriesContext(connection) as large:
+            apply_transitions(moves(suggestions[6:], 'in_progress'))
+        self.assertEqual(len(small), len(large))
+
+    def test_rejects_invalid_transitions(self):
+        invalid = (
+            [],
+            [{'id': 1, 'type': 'Killer', 'status': 'new'}],
+            {'id': 'x', 'type': 'Suggestion', 'status': 'new'},
+            [{'id': 1, 'type': 'Suggestion', 'status': 'approved'}],
+        )
+        for payload in invalid:
+            with self.subTest(payload=payload):
+                response = self.client.post('/api/dashboard/transitions/', payload, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+
+
+class LargeTableAdminTests(TestCase):
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(self.admin_user)
+
+    def add_modifications(self, count):
+        offset = SerialKiller.objects.count()
+        killers = SerialKiller.objects.bulk_create([
+            SerialKiller(common_name=f"Killer {offset + i}", assigned_to=self.admin_user)
+            for i in range(count)
+        ])
+        Modification.objects.bulk_create([
+            Modification(killer=killer, suggestion_text='Fix the dates', assigned_to=self.admin_user)
+            for killer in killers
+        ])
+
+    def changelist_queries(self, model_name):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/admin/killers/{model_name}/')
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_query_count_is_constant(self):
+        for model_name in ('serialkiller', 'modification'):
+            with self.subTest(model=model_name):
+                self.add_modifications(2)
+                few = self.changelist_queries(model_name)
+                self.add_modifications(30)
+                self.assertEqual(self.changelist_queries(model_name), few)
+
+    def test_unfiltered_count_uses_planner_estimate(self):
+        self.add_modifications(5)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE "Modifications"')
+        with mock.patch.object(EstimatedCountPaginator, 'exact_count_threshold', 0), \
+                CaptureQueriesContext(connection) as queries:
+            self.client.get('/admin/killers/modification/')
+        self.assertFalse([q for q in queries if 'COUNT(' in q['sql'].upper()])
+
+
+class PrefixIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        self.index = PrefixIndex([
+            {'id': 1, 'common_name': 'Ted Bundy'},
+            {'id': 2, 'common_name': 'The Zodiac Killer'},
+            {'id': 3, 'common_name': 'Bundy Imitator'},
+            {'id': 4, 'common_name': 'Teddy Example'},
+        ])
+
+    def test_whole_name_matches_rank_first(self):
+        self.assertEqual([r['id'] for r in self.index.search('bundy')], [3, 1])
+        self.assertEqual([r['id'] for r in self.index.search('TED')], [1, 4])
+
+    def test_limit_and_empty_query(self):
+        self.assertEqual(len(self.index.search('t', limit=2)), 2)
+        self.assertEqual(self.index.search('  '), [])
+        self.assertEqual(self.index.search('killer'), [{'id': 2, 'common_name': 'The Zodiac Killer'}])
+
+    def test_prefix_past_every_key(self):
+        self.assertEqual(self.index.search('zz'), [])
+        self.assertEqual([r['id'] for r in self.index.search('zodiac')], [2])
+
+
+class NameIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        self.index = NameIndex()
+        self.index.add((KILLER, 1), record_names(
+            {'common_name': 'Jeffrey Dahmer', 'aliases': 'The Milwaukee Cannibal, The Milwaukee Monster'}
+        ))
+        self.index.add((KILLER, 2), record_names({'common_name': 'Ted Bundy', 'full_name': 'Theodore Robert Bundy'}))
+        self.index.add((SUGGESTION, 7), record_names({'common_name': 'Andrei Chikatilo'}))
+
+    def test_matches_spelling_variants_and_aliases(self):
+        cases = {
+            'Jeffery Dahmer': (KILLER, 1),
+            'dahmer, jeffrey': (KILLER, 1),
+            'Milwaukee Cannibal': (KILLER, 1),
+            'Theodore R. Bundy': (KILLER, 2),
+            'Andréi Chikatilo': (SUGGESTION, 7),
+        }
+        for name, key in cases.items():
+            with self.subTest(name=name):
+                match = self.index.best_match([name])
+                self.assertIsNotNone(match)
+                self.assertEqual(match[0], key)
+
+    def test_unrelated_names_do_not_match(self):
+        self.assertIsNone(self.index.best_match(['Harold Shipman']))
+        self.assertIsNone(self.index.best_match(['']))
+
+    def test_remove_and_replace(self):
+        self.index.remove((KILLER, 2))
+        self.assertIsNone(self.index.best_match(['Ted Bundy']))
+        self.index.add((SUGGESTION, 7), ['Pedro Lopez'])
+        self.assertIsNone(self.index.best_match(['Andrei Chikatilo']))
+        self.assertEqual(self.index.best_match(['Pedro López'])[0], (SUGGESTION, 7))
+        self.assertEqual(len(self.index), 2)
+
+
+class DuplicateScoringTests(TestCase):
+
+    def test_rescore_compares_with_killers_and_earlier_suggestions(self):
+        killer = SerialKiller.objects.create(common_name='Jeffrey Dahmer')
+        first = Suggestion.objects.create(common_name='Jeffery Dahmer')
+        original = Suggestion.objects.create(common_name='Gary Ridgway')
+        repeat = Suggestion.objects.create(common_name='Gary Ridgeway')
+        unrelated = Suggestion.objects.create(common_name='Aileen Wuornos')
+
+        self.assertEqual(rescore_suggestions(), (4, 2))
+        for suggestion in (first, original, repeat, unrelated):
+            suggestion.refresh_from_db()
+        self.assertEqual(first.duplicate_of_killer, killer)
+        self.assertEqual(repeat.duplicate_of_suggestion, original)
+        self.assertIsNone(original.duplicate_score)
+        self.assertIsNone(unrelated.duplicate_score)
+
+
+@override_settings(KILLERS_RATE_LIMITS={'test': '2/min'}, KILLERS_RATE_LIMIT_STORE='local')
+class RateLimitTests(SimpleTestCase):
+
+    def setUp(self):
+        get_store().clear()
+        self.factory = RequestFactory()
+
+    def test_bucket_refuses_after_burst(self):
+        request = self.factory.get('/', REMOTE_ADDR='10.0.0.1')
+        self.assertTrue(check_rate(request, 'test')[0])
+        allowed, headers = check_rate(request, 'test')
+        self.assertTrue(allowed)
+        self.assertEqual(headers['X-RateLimit-Remaining'], '0')
+        allowed, headers = check_rate(request, 'test')
+        self.assertFalse(allowed)
+        self.assertEqual(headers['Retry-After'], '30')
+        # Other clients have their own bucket
+        self.assertTrue(check_rate(self.factory.get('/', REMOTE_ADDR='10.0.0.2'), 'test')[0])
+
+    def test_decorator_returns_429(self):
+        view = rate_limited('test')(lambda request: JsonResponse({}))
+        responses = [view(self.factory.get('/', REMOTE_ADDR='10.0.0.3')) for _ in range(3)]
+        self.assertEqual([r.status_code for r in responses], [200, 200, 429])
+        self.assertEqual(responses[-1]['Retry-After'], '30')
+
+    def test_unconfigured_scope_is_unlimited(self):
+        self.assertEqual(check_rate(self.factory.get('/'), 'other'), (True, {}))
+
+
+class RenderingAndCompressionTests(SimpleTestCase):
+
+    def test_orjson_matches_drf_renderer(self):
+        data = [{
+            'id': 1, 'common_name': 'Ted Bundy', 'notes': 'naïve “quotes”\u2028line\u2029', 'proven_victims': None,
+            'date_of_birth': datetime.date(1946, 11, 24),
+            'created_at': datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            'weight': Decimal('1.50'),
+        }]
+        self.assertEqual(OrjsonRenderer().render(data), JSONRenderer().render(data))
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding('gzip, deflate'), 'gzip')
+        self.assertIsNone(choose_encoding(''))
+        self.assertIsNone(choose_encoding('gzip;q=0, identity'))
+        self.assertEqual(choose_encoding('*'), 'br' if brotli else 'gzip')
+
+    @override_settings(KILLERS_COMPRESSION_MIN_SIZE=1000)
+    def test_size_threshold(self):
+        middleware = CompressionMiddleware(lambda request: None)
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        small = middleware.process_response(request, HttpResponse(b'x' * 999))
+        large = middleware.process_response(request, HttpResponse(b'x' * 1000, headers={'ETag': '"abc"'}))
+        self.assertFalse(small.has_header('Content-Encoding'))
+        self.assertEqual(large['Content-Encoding'], 'gzip')
+        self.assertEqual(large['ETag'], 'W/"abc"')
+        self.assertEqual(gzip.decompress(large.content), b'x' * 1000)
+
+    def test_async_stream_is_one_gzip_member(self):
+        async def lines():
+            for i in range(50):
+                yield b'line %d\n' % i
+
+        middleware = CompressionMiddleware(lambda request: None)
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        response = middleware.process_response(request, StreamingHttpResponse(lines()))
+
+        async def collect():
+            return [chunk async for chunk in response.streaming_content]
+
+        chunks = async_to_sync(collect)()
+        decompressor = zlib.decompressobj(31)
+        body = b''.join(decompressor.decompress(chunk) for chunk in chunks)
+        self.assertEqual(body, b''.join(b'line %d\n' % i for i in range(50)))
+        self.assertTrue(decompressor.eof)
+        self.assertEqual(decompressor.unused_data, b'')
+
+
+class FakePostgrestTests(SimpleTestCase):
+    """The benchmark stand-in must page through results exactly like PostgREST."""
+
+    def setUp(self):
+        rows = []
+        for i in range(120):
+            row = {'id': i + 1, **synthetic_killer(i)}
+            row.update(derived_fields(row['years_active'], row['possible_victims']))
+            if i % 10 == 0:
+                row['proven_victims'] = None
+            rows.append(row)
+        self.rows = rows
+        self.fake = FakePostgrest({'Serial Killers': rows}).start()
+        self.addCleanup(self.fake.stop)
+        self.repo = PostgrestRepository(client=create_client(self.fake.url, 'test-key'))
+
+    def test_keyset_pages_cover_every_row_in_order(self):
+        for name, ordering in ORDERINGS.items():
+            with self.subTest(ordering=name):
+                seen, cursor = [], None
+                while True:
+                    page = self.repo.list_killers(['common_name'], {}, cursor, 25, ordering)
+                    seen += [row['id'] for row in page[:25]]
+                    if len(page) <= 25:
+                        break
+                    last = page[24]
+                    cursor = Cursor(last[ordering.column], last['id'], False)
+
+                col = ordering.column
+                present = sorted((r for r in self.rows if r[col] is not None), key=lambda r: (r[col], r['id']),
+                                 reverse=ordering.descending)
+                missing = sorted((r for r in self.rows if r[col] is None), key=lambda r: r['id'],
+                                 reverse=ordering.descending)
+                self.assertEqual(seen, [r['id'] for r in present + missing])
+
+    def test_killer_choices_read_past_max_rows(self):
+        self.fake.max_rows = 50
+        choices = self.repo.killer_choices()
+        self.assertEqual([row['id'] for row in choices], [row['id'] for row in self.rows])
+
+    def test_name_reads_past_max_rows(self):
+        self.fake.max_rows = 50
+        self.fake.tables['Suggestions'] = [
+            {'id': i, 'common_name': f'Suggestion {i}', 'submission_status': 'finished' if i % 3 == 0 else 'pending'}
+            for i in range(1, 121)
+        ]
+        self.assertEqual([row['id'] for row in self.repo.killer_names()], [row['id'] for row in self.rows])
+        open_ids = [row['id'] for row in self.repo.open_suggestion_names(10)]
+        self.assertEqual(open_ids, [i for i in range(11, 121) if i % 3])
+
+    def test_filters(self):
+        filters = {'status': ['imprisoned', 'at_large'], 'min_proven_victims': 10}
+        rows = self.repo.list_killers(None, filters, None, 200)
+        expected = [r for r in self.rows if r['status'] in filters['status'] and (r['proven_victims'] or 0) >= 10]
+        self.assertEqual(sorted(r['id'] for r in rows), sorted(r['id'] for r in expected))
+
+
+class MetricsTests(SimpleTestCase):
+    """Per-view telemetry and its Prometheus exposition."""
+
+    def setUp(self):
+        for histogram in HISTOGRAMS:
+            histogram.clear()
+        self.addCleanup(lambda: [h.clear() for h in HISTOGRAMS])
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram('demo_seconds', 'Demo.', (0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe('a"b', value)
+        text = histogram.render()
+        self.assertIn('# TYPE demo_seconds histogram', text)
+        self.assertIn('demo_seconds_bucket{view="a\\"b",le="0.1"} 2', text)
+        self.assertIn('demo_seconds_bucket{view="a\\"b",le="1.0"} 3', text)
+        self.assertIn('demo_seconds_bucket{view="a\\"b",le="+Inf"} 4', text)
+        self.assertIn('demo_seconds_count{view="a\\"b"} 4', text)
+
+    def test_middleware_counts_supabase_calls_including_fan_out(self):
+        fake = FakePostgrest({'Serial Killers': [{'id': 1, **synthetic_killer(1)}]}).start()
+        self.addCleanup(fake.stop)
+        with mock.patch.dict(os.environ, {'SUPABASE_URL': fake.url, 'SUPABASE_KEY': 'test-key'}):
+            client = new_supabase_client()
+
+        def view(request):
+            client.table('Serial Killers').select('id').execute()
+            execute_concurrently({
+                'a': client.table('Serial Killers').select('id'),
+                'b': client.table('Serial Killers').select('common_name'),
+            })
+            return HttpResponse(b'x' * 300)
+
+        request = RequestFactory().get('/api/killers/')
+        request.resolver_match = mock.Mock(view_name='killer-list')
+        MetricsMiddleware(view)(request)
+
+        text = render_metrics()
+        self.assertIn('killers_supabase_calls_bucket{view="killer-list",le="2"} 0', text)
+        self.assertIn('killers_supabase_calls_bucket{view="killer-list",le="3"} 1', text)
+        self.assertIn('killers_response_bytes_sum{view="killer-list"} 300', text)
+        self.assertIn('killers_request_duration_seconds_count{view="killer-list"} 1', text)
+
+    def test_endpoint_is_staff_only(self):
+        request = RequestFactory().get('/metrics')
+        request.user = AnonymousUser()
+        self.assertEqual(metrics_view(request).status_code, 403)
+
+        request.user = User(is_staff=True, is_active=True)
+        response = metrics_view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+        with self.settings(KILLERS_METRICS_TOKEN='scrape'):
+            request = RequestFactory().get('/metrics', HTTP_AUTHORIZATION='Bearer scrape')
+            request.user = AnonymousUser()
+            self.assertEqual(metrics_view(request).status_code, 200)
+
+
+class KanbanColumnTests(SimpleTestCase):
+    """Dashboard columns page newest first without materialising whole tables."""
+
+    def setUp(self):
+        start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        killers = [{'id': 1, 'common_name': 'Subject 000001'}]
+        self.modifications = [
+            {
+                'id': i + 1, 'killer_id': 1, 'suggestion_text': f"Correction {i}",
+                'submission_status': ('new', 'finished')[i % 2],
+                # Pairs share a timestamp so the id tie-break is exercised
+                'created_at': (start + datetime.timedelta(minutes=i // 2)).isoformat(),
+            }
+            for i in range(95)
+        ]
+        fake = FakePostgrest({
+            'Serial Killers': killers, 'Suggestions': [], 'Modifications': self.modifications,
+        }).start()
+        self.addCleanup(fake.stop)
+        self.repo = PostgrestRepository(client=create_client(fake.url, 'test-key'))
+
+    def test_pages_cover_column_newest_first(self):
+        seen, cursor = [], None
+        while True:
+            rows = self.repo.submission_cards('modifications', 'finished', cursor, 10)
+            page = column_page('modifications', 'finished', rows, 10)
+            seen += [card['id'] for card in page['results']]
+            self.assertTrue(all(card['killer_name'] == 'Subject 000001' for card in page['results']))
+            if not page['next']:
+                break
+            self.assertIn('/dashboard/cards/?', page['next'])
+            cursor = decode_cursor(page['next'].rpartition('cursor=')[2], CARD_ORDERING)
+
+        finished = [m for m in self.modifications if m['submission_status'] == 'finished']
+        expected = sorted(finished, key=lambda m: (m['created_at'], m['id']), reverse=True)
+        self.assertEqual(seen, [m['id'] for m in expected])
+
+    def test_board_uses_counters_for_column_sizes(self):
+        columns = self.repo.dashboard_columns(20)
+        stats = {
+            'suggestions_new': 0, 'suggestions_progress': 0, 'suggestions_done': 0,
+            'corrections_new': 48, 'corrections_progress': 0, 'corrections_done': 47,
+        }
+        modifications = board(columns, stats)['modifications']
+        self.assertEqual([c['count'] for c in modifications], [48, 0, 47])
+        self.assertEqual([len(c['results']) for c in modifications], [20, 0, 20])
+        self.assertIsNone(modifications[1]['next'])
+
+
+class DashboardConcurrencyTests(SimpleTestCase):
+    """Concurrent dashboard loads must not starve the shared fan-out pool."""
+
+    workers = 2
+
+    def setUp(self):
+        fake = FakePostgrest({'Serial Killers': [], 'Suggestions': [], 'Modifications': []}).start()
+        self.addCleanup(fake.stop)
+        client = create_client(fake.url, 'test-key')
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        self.addCleanup(pool.shutdown)
+        for name, value in (('_executor', pool), ('_executor_pid', os.getpid())):
+            patcher = mock.patch.object(services, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Hold every load until as many are running as the pool has workers
+        barrier = threading.Barrier(self.workers, timeout=5)
+
+        class Repository(PostgrestRepository):
+            def dashboard_columns(self, page_size):
+                barrier.wait()
+                return super().dashboard_columns(page_size)
+
+        self.repository = Repository(client=client)
+
+    @override_settings(SUPABASE_CLIENT={'FANOUT_WORKERS': workers, 'FANOUT_TIMEOUT': 2})
+    def test_more_loads_than_workers(self):
+        stats = {'submission_stats': {
+            'suggestions_new': 0, 'suggestions_progress': 0, 'suggestions_done': 0,
+            'corrections_new': 0, 'corrections_progress': 0, 'corrections_done': 0,
+        }}
+        contexts = []
+
+        def render(request, template, context):
+            contexts.append(context)
+            return HttpResponse()
+
+        with mock.patch.object(views, 'get_repository', return_value=self.repository), \
+                mock.patch.object(views, 'get_dashboard_stats', return_value=stats), \
+                mock.patch.object(views, 'duplicate_groups', return_value=[]), \
+                mock.patch.object(views, 'render', render):
+            loads = [threading.Thread(target=views.dashboard_view, args=(RequestFactory().get('/dashboard/'),))
+                     for _ in range(self.workers * 2)]
+            for load in loads:
+                load.start()
+            for load in loads:
+                load.join()
+
+        self.assertEqual(len(contexts), self.workers * 2)
+        self.assertEqual([context.get('error') for context in contexts], [None] * len(contexts))
+
+
+class ThroughputBucketTests(SimpleTestCase):
+
+    def test_bucket_starts(self):
+        now = datetime.datetime(2026, 10, 18, 15, 30, tzinfo=datetime.timezone.utc)  # a Sunday
+        self.assertEqual(
+            [start.date() for start in bucket_starts('week', 2, now)],
+            [datetime.date(2026, 10, 5), datetime.date(2026, 10, 12)],
+        )
+        self.assertEqual(
+            [start.date() for start in bucket_starts('day', 2, now)],
+            [datetime.date(2026, 10, 17), datetime.date(2026, 10, 18)],
+        )
+
+    def test_parsing(self):
+        self.assertEqual(parse_bucket(None), 'day')
+        self.assertEqual(parse_bucket_count('1000', 'week'), 366)
+        for parse in (lambda: parse_bucket('month'), lambda: parse_bucket_count('0', 'day')):
+            with self.assertRaises(ValueError):
+                parse()
+
+
+class SubmissionThroughputTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_transitions_are_logged(self):
+        suggestion = Suggestion.objects.create(common_name='A')
+        Suggestion.objects.filter(pk=suggestion.pk).update(created_at=timezone.now() - datetime.timedelta(hours=2))
+        apply_transitions({'suggestions': {suggestion.pk: 'in_progress'}})
+        suggestion.refresh_from_db()
+        suggestion.submission_status = 'finished'
+        suggestion.save()
+
+        transitions = list(StatusTransition.objects.order_by('changed_at'))
+        self.assertEqual(
+            [(t.from_status, t.to_status) for t in transitions], [('new', 'in_progress'), ('in_progress', 'finished')]
+        )
+        self.assertAlmostEqual(transitions[0].time_in_status.total_seconds(), 7200, delta=60)
+
+    def test_save_reads_the_stored_row_once(self):
+        correction = Modification.objects.create(
+            killer=SerialKiller.objects.create(common_name='Subject'), suggestion_text='Fix the dates',
+        )
+        correction.submission_status = 'in_progress'
+        with CaptureQueriesContext(connection) as queries:
+            correction.save()
+        reads = [q['sql'] for q in queries if q['sql'].startswith('SELECT "Modifications"')]
+        self.assertEqual(len(reads), 1)
+        self.assertEqual(
+            list(StatusTransition.objects.values_list('kind', 'from_status', 'to_status')),
+            [('modifications', 'new', 'in_progress')],
+        )
+
+        # A save that leaves submission_status out doesn't log a change it didn't store
+        correction.submission_status = 'finished'
+        correction.save(update_fields=['suggestion_text'])
+        self.assertEqual(StatusTransition.objects.count(), 1)
+
+    def test_closed_buckets_are_cached(self):
+        now = timezone.now()
+        suggestion = Suggestion.objects.create(common_name='A')
+        log_transitions(
+            'suggestions', [(suggestion.pk, 'new', 'finished', now - datetime.timedelta(days=2))],
+            now=now - datetime.timedelta(days=1),
+        )
+
+        yesterday, today = submission_throughput('day', 2, now)
+        self.assertEqual((yesterday['closed'], today['closed']), (True, False))
+        self.assertEqual(yesterday['suggestions']['finished'], 1)
+        self.assertEqual(yesterday['suggestions']['avg_seconds_in_status'], {'new': 86400})
+        self.assertEqual(today['suggestions']['created'], 1)
+
+        # Only the open bucket is queried again: one GROUP BY per table
+        with self.assertNumQueries(3):
+            self.assertEqual(submission_throughput('day', 2, now)[0], yesterday)
@@ -0,0 +1,226 @@
+"""
+Token-bucket rate limiting for the public read API.
+
+Each client gets one bucket per scope holding up to N tokens that refill
+continuously at N per period (``'120/min'``), so short bursts are allowed
+while the sustained rate is capped. Limits are configured per scope in
+``settings.KILLERS_RATE_LIMITS``.
+
+Buckets live in the store named by ``settings.KILLERS_RATE_LIMIT_STORE``:
+``'local'`` keeps them in a dict in this process (microseconds per check),
+``'cache'`` keeps them in the default Django cache so every worker shares
+them when that cache is Redis/Memcached.
+"""
+import math
+import threading
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Attribute on the HttpRequest carrying the headers for RateLimitHeadersMiddleware
+REQUEST_ATTR = 'rate_limit_headers'
+
+
+def parse_rate(rate):
+    """``'120/min'`` -> ``(120, 60)``; the period is read from its first letter like DRF."""
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+class LocalBucketStore:
+    """Buckets in a process-local dict guarded by a lock."""
+
+    prune_every = 10000
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def consume(self, key, capacity, refill_rate, now):
+        """Take one token; return ``(allowed, tokens_left)``."""
+        with self._lock:
+            tokens, stamp = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - stamp) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._calls += 1
+            if self._calls >= self.prune_every:
+                self._prune(now)
+            return allowed, tokens
+
+    def _prune(self, now):
+        # Drop buckets idle for a day; any bucket that old has refilled
+        # completely, so forgetting it doesn't change behaviour.
+        self._calls = 0
+        stale = [key for key, (_, stamp) in self._buckets.items() if now - stamp > PERIODS['d']]
+        for key in stale:
+            del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Buckets in a Django cache shared by all workers. Reads and writes are
+    not atomic, so concurrent requests from one client may occasionally
+    both get the last token; that slack is accepted to avoid a lock round trip.
+    """
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    def consume(self, key, capacity, refill_rate, now):
+        cache = caches[self.alias]
+        tokens, stamp = cache.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + (now - stamp) * refill_rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        cache.set(key, (tokens, now), timeout=math.ceil(capacity / refill_rate) + 1)
+        return allowed, tokens
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+STORES = {
+    'local': LocalBucketStore,
+    'cache': CacheBucketStore,
+}
+
+_stores = {}
+
+
+def get_store():
+    name = getattr(settings, 'KILLERS_RATE_LIMIT_STORE', 'local')
+    if name not in _stores:
+        try:
+            _stores[name] = STORES[name]()
+        except KeyError:
+            raise ValueError(f"Unknown rate limit store '{name}'.")
+    return _stores[name]
+
+
+def client_ident(request):
+    """Client address as DRF resolves it (honouring NUM_PROXIES for X-Forwarded-For)."""
+    return BaseThrottle().get_ident(request)
+
+
+def check_rate(request, scope):
+    """
+    Consume one token from the client's bucket for ``scope``.
+
+    Clients are identified by address only, so the check never touches the
+    session or the database. Returns ``(allowed, headers)`` where ``headers`` holds the
+    ``X-RateLimit-*`` values (and ``Retry-After`` when refused), or
+    ``(True, {})`` when the scope has no configured limit.
+    """
+    rate = getattr(settings, 'KILLERS_RATE_LIMITS', {}).get(scope)
+    if not rate:
+        return True, {}
+    capacity, period = parse_rate(rate)
+    refill_rate = capacity / period
+    allowed, tokens = get_store().consume(f'throttle:{scope}:{client_ident(request)}', capacity, refill_rate, time.time())
+    headers = {
+        'X-RateLimit-Limit': str(capacity),
+        'X-RateLimit-Remaining': str(int(tokens)),
+        # Seconds until the bucket is full again
+        'X-RateLimit-Reset': str(math.ceil((capacity - tokens) / refill_rate)),
+    }
+    if not allowed:
+        headers['Retry-After'] = str(math.ceil((1 - tokens) / refill_rate))
+    return allowed, headers
+
+
+class BucketRateThrottle(BaseThrottle):
+    """DRF throttle backed by check_rate(); subclasses set ``scope``."""
+
+    scope = None
+
+    def allow_request(self, request, view):
+        allowed, headers = check_rate(request, self.scope)
+        setattr(request._request, REQUEST_ATTR, headers)
+        self.retry_after = int(headers['Retry-After']) if 'Retry-After' in headers else None
+        return allowed
+
+    def wait(self):
+        return self.retry_after
+
+
+class KillersListThrottle(BucketRateThrottle):
+    scope = 'killers_list'
+
+
+class KillersSearchThrottle(BucketRateThrottle):
+    scope = 'killers_search'
+
+
+class KillersAutocompleteThrottle(BucketRateThrottle):
+    scope = 'killers_autocomplete'
+
+
+def rate_limited(scope):
+    """check_rate() for plain (sync or async) Django views, answering 429 when refused."""
+    def refused(headers):
+        response = JsonResponse({"error": "Request was throttled."}, status=429)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_view(request, *args, **kwargs):
+                allowed, headers = check_rate(request, scope)
+                if not allowed:
+                    return refused(headers)
+                setattr(request, REQUEST_ATTR, headers)
+                return await view_func(request, *args, **kwargs)
+            return async_view
+
+        @wraps(view_func)
+        def view(request, *args, **kwargs):
+            allowed, headers = check_rate(request, scope)
+            if not allowed:
+                return refused(headers)
+            setattr(request, REQUEST_ATTR, headers)
+            return view_func(request, *args, **kwargs)
+        return view
+    return decorator
+
+
+class RateLimitHeadersMiddleware:
+    """Copy the rate limit headers computed for a request onto its response."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        return self._add_headers(request, self.get_response(request))
+
+    async def _acall(self, request):
+        return self._add_headers(request, await self.get_response(request))
+
+    def _add_headers(self, request, response):
+        for name, value in getattr(request, REQUEST_ATTR, {}).items():
+            response.headers.setdefault(name, value)
+        return response
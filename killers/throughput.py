@@ -0,0 +1,171 @@
+"""
+Submission throughput: how many suggestions and modifications were created,
+moved to in progress and finished per day or week, and how long they spent
+in each status.
+
+Every status change is appended to StatusTransition together with the time
+spent in the previous status, so each bucket is answered by ``date_trunc``
+GROUP BYs over indexed timestamp ranges instead of reading the submission
+tables. A bucket that has ended never changes again, so it is computed
+once and then served from the cache; only the current bucket is queried on
+every request.
+"""
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .models import Modification, StatusTransition, Suggestion
+
+KINDS = {'suggestions': Suggestion, 'modifications': Modification}
+
+BUCKETS = ('day', 'week')
+DEFAULT_BUCKET_COUNTS = {'day': 30, 'week': 12}
+MAX_BUCKET_COUNT = 366
+
+CACHE_PREFIX = 'killers:throughput'
+
+
+def parse_bucket(raw):
+    if not raw:
+        return 'day'
+    if raw not in BUCKETS:
+        raise ValueError(f"bucket must be one of: {', '.join(BUCKETS)}.")
+    return raw
+
+
+def parse_bucket_count(raw, bucket):
+    if not raw:
+        return DEFAULT_BUCKET_COUNTS[bucket]
+    try:
+        count = int(raw)
+    except ValueError:
+        raise ValueError("buckets must be an integer.")
+    if count < 1:
+        raise ValueError("buckets must be positive.")
+    return min(count, MAX_BUCKET_COUNT)
+
+
+def log_transitions(kind, changes, now=None):
+    """
+    Record ``[(pk, old_status, new_status, created_at), ...]`` status changes
+    of one submission kind. The time in the old status runs from the
+    submission's previous transition (or its creation); all previous
+    transitions are read with one grouped query on the history index.
+    """
+    changes = [change for change in changes if change[1] != change[2]]
+    if not changes:
+        return
+    now = now or timezone.now()
+    entered = dict(
+        StatusTransition.objects.filter(kind=kind, submission_id__in=[pk for pk, *_ in changes])
+        .order_by().values('submission_id').annotate(last=Max('changed_at')).values_list('submission_id', 'last')
+    )
+    transitions = []
+    for pk, old, new, created_at in changes:
+        since = entered.get(pk, created_at)
+        transitions.append(StatusTransition(
+            kind=kind, submission_id=pk, from_status=old or 'new', to_status=new, changed_at=now,
+            time_in_status=now - since if since is not None else None,
+        ))
+    StatusTransition.objects.bulk_create(transitions)
+
+
+def log_bulk_status_change(kind, queryset, new_status):
+    """log_transitions() for a ``queryset.update(submission_status=...)``; call before the update."""
+    rows = queryset.exclude(submission_status=new_status).order_by()
+    log_transitions(kind, [
+        (pk, old, new_status, created_at)
+        for pk, old, created_at in rows.values_list('id', 'submission_status', 'created_at')
+    ])
+
+
+def bucket_start(moment, bucket):
+    """Start of the day or (Monday-based, like date_trunc) week containing ``moment``."""
+    start = timezone.localtime(moment).replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == 'week':
+        start -= datetime.timedelta(days=start.weekday())
+    return start
+
+
+def bucket_starts(bucket, count, now):
+    """Starts of the last ``count`` buckets, oldest first; the last one is still open."""
+    current = bucket_start(now, bucket)
+    step = datetime.timedelta(days=7 if bucket == 'week' else 1)
+    # Step through local dates so DST changes don't shift the boundaries
+    return [bucket_start(current - step * i + datetime.timedelta(hours=12), bucket) for i in reversed(range(count))]
+
+
+def empty_counts():
+    return {'created': 0, 'in_progress': 0, 'finished': 0, 'reopened': 0, 'avg_seconds_in_status': {}}
+
+
+def compute_buckets(bucket, since):
+    """
+    Throughput of every bucket from ``since`` on, ``{start: {kind: counts}}``,
+    with one GROUP BY per submission table and one over the transitions.
+    """
+    results = defaultdict(lambda: {kind: empty_counts() for kind in KINDS})
+    for kind, model in KINDS.items():
+        created = (
+            model.objects.filter(created_at__gte=since).order_by()
+            .annotate(start=Trunc('created_at', bucket)).values('start').annotate(n=Count('id'))
+        )
+        for row in created:
+            results[row['start']][kind]['created'] = row['n']
+
+    durations = defaultdict(lambda: [datetime.timedelta(), 0])
+    transitions = (
+        StatusTransition.objects.filter(changed_at__gte=since).order_by()
+        .annotate(start=Trunc('changed_at', bucket))
+        .values('start', 'kind', 'from_status', 'to_status')
+        .annotate(n=Count('id'), total=Sum('time_in_status'), timed=Count('time_in_status'))
+    )
+    for row in transitions:
+        counts = results[row['start']][row['kind']]
+        counts['reopened' if row['to_status'] == 'new' else row['to_status']] += row['n']
+        if row['timed'] and row['from_status']:
+            spent = durations[(row['start'], row['kind'], row['from_status'])]
+            spent[0] += row['total']
+            spent[1] += row['timed']
+    for (start, kind, status), (total, timed) in durations.items():
+        results[start][kind]['avg_seconds_in_status'][status] = round(total.total_seconds() / timed)
+    return results
+
+
+def _cache_key(bucket, start):
+    return f'{CACHE_PREFIX}:{bucket}:{start.isoformat()}'
+
+
+def submission_throughput(bucket='day', count=None, now=None):
+    """
+    ``[{'start', 'end', 'closed', 'suggestions': counts, 'modifications': counts}]``
+    for the last ``count`` buckets, oldest first. Closed buckets are read
+    from the cache when possible; everything else is computed in one pass
+    from the oldest missing bucket on.
+    """
+    now = now or timezone.now()
+    starts = bucket_starts(bucket, count or DEFAULT_BUCKET_COUNTS[bucket], now)
+    current = starts[-1]
+    keys = {start: _cache_key(bucket, start) for start in starts[:-1]}
+    cached = cache.get_many(keys.values())
+
+    missing = [start for start in starts if keys.get(start) not in cached]
+    computed = compute_buckets(bucket, missing[0])
+    timeout = getattr(settings, 'KILLERS_THROUGHPUT_CACHE_TIMEOUT', 7 * 24 * 3600)
+    cache.set_many({keys[start]: computed[start] for start in missing if start != current}, timeout)
+
+    step = datetime.timedelta(days=7 if bucket == 'week' else 1)
+    return [
+        {
+            'start': start.isoformat(),
+            'end': bucket_start(start + step + datetime.timedelta(hours=12), bucket).isoformat(),
+            'closed': start != current,
+            **(cached[keys[start]] if keys.get(start) in cached else computed[start]),
+        }
+        for start in starts
+    ]
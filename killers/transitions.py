@@ -0,0 +1,97 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .kanban import CARD_TYPES, CARD_VALUES, KINDS, STATUSES, to_card
+from .stats import apply_deltas
+from .throughput import log_transitions
+
+# Card ``type`` as posted by the dashboard -> submission kind
+KIND_BY_TYPE = {card_type: kind for kind, card_type in CARD_TYPES.items()}
+
+# Largest batch accepted in one request
+MAX_TRANSITIONS = 500
+
+
+def parse_transitions(payload):
+    """
+    Validate ``[{id, type, status}, ...]`` (or a single object, or
+    ``{"transitions": [...]}``) into ``{kind: {pk: status}}``.
+
+    A later transition for the same card wins.
+    """
+    if isinstance(payload, dict):
+        payload = payload.get('transitions', [payload])
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Expected a transition object or a non-empty list of them.")
+    if len(payload) > MAX_TRANSITIONS:
+        raise ValueError(f"At most {MAX_TRANSITIONS} transitions per request.")
+
+    moves = defaultdict(dict)
+    for i, item in enumerate(payload):
+        if not isinstance(item, dict):
+            raise ValueError(f"Transition {i}: expected an object.")
+        kind = KIND_BY_TYPE.get(item.get('type'))
+        if kind is None:
+            raise ValueError(f"Transition {i}: type must be one of: {', '.join(KIND_BY_TYPE)}.")
+        if item.get('status') not in STATUSES:
+            raise ValueError(f"Transition {i}: status must be one of: {', '.join(STATUSES)}.")
+        try:
+            pk = int(item.get('id'))
+        except (TypeError, ValueError):
+            raise ValueError(f"Transition {i}: id must be an integer.")
+        moves[kind][pk] = item['status']
+    return dict(moves)
+
+
+def _locked_cards(kind, pks):
+    queryset = KINDS[kind].objects.filter(pk__in=pks).select_for_update(of=('self',)).order_by()
+    if kind == 'modifications':
+        return queryset.values(*CARD_VALUES[kind], killer_name=F('killer__common_name'))
+    return queryset.values(*CARD_VALUES[kind])
+
+
+@transaction.atomic
+def apply_transitions(moves):
+    """
+    Apply ``{kind: {pk: new_status}}`` from parse_transitions().
+
+    Per table this costs one locking read of the affected cards and one
+    update() setting every new status through a CASE, whatever the batch
+    size; the status counters are adjusted by the resulting deltas and the
+    changes are appended to the status transition log.
+    Returns ``(changed_cards, missing)`` where ``missing`` lists the
+    ``{id, type}`` pairs that don't exist. Cards already in their target
+    status are left untouched and not returned.
+    """
+    now = timezone.now()
+    changed, missing, deltas = [], [], Counter()
+    for kind, targets in moves.items():
+        rows = {row['id']: row for row in _locked_cards(kind, list(targets))}
+        missing += [{'id': pk, 'type': CARD_TYPES[kind]} for pk in targets if pk not in rows]
+
+        by_status, logged = defaultdict(list), []
+        for pk, row in rows.items():
+            old, new = row['submission_status'] or 'new', targets[pk]
+            if old == new:
+                continue
+            by_status[new].append(pk)
+            logged.append((pk, old, new, row['created_at']))
+            deltas[(f'{kind}.status', old)] -= 1
+            deltas[(f'{kind}.status', new)] += 1
+            row['submission_status'] = new
+            changed.append(to_card(kind, row))
+        if not by_status:
+            continue
+
+        KINDS[kind].objects.filter(pk__in=[pk for pks in by_status.values() for pk in pks]).update(
+            submission_status=Case(
+                *(When(pk__in=pks, then=Value(status)) for status, pks in by_status.items())
+            ),
+            updated_at=now,
+        )
+        log_transitions(kind, logged, now)
+    apply_deltas(deltas)
+    return changed, missing
@@ -1,12 +1,27 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.KILLERS_ASYNC_VIEWS:
+    from . import async_views as io_views
+else:
+    io_views = views
+
 urlpatterns = [
     path('', views.home_view, name='home'),
-    path('killers/', views.get_all_killers, name='get_all_killers'),
-    path('killers/<str:common_name>/', views.get_killer_by_name, name='get_killer_by_name'),
+    path('killers/', io_views.get_all_killers, name='get_all_killers'),
+    path('killers/export.ndjson', io_views.export_killers_ndjson, name='export_killers_ndjson'),
+    path('killers/export.csv', io_views.export_killers_csv, name='export_killers_csv'),
+    path('killers/search/', views.search_killers, name='search_killers'),
+    path('killers/countries/', views.killer_countries, name='killer_countries'),
+    path('killers/mo-tags/', views.killer_mo_tags, name='killer_mo_tags'),
+    path('killers/autocomplete/', views.autocomplete_killers, name='autocomplete_killers'),
+    path('killers/<str:common_name>/', io_views.get_killer_by_name, name='get_killer_by_name'),
     path('docs/', views.docs_view, name='docs'),
-    path('suggest/', views.suggestion_view, name='suggest'),
-    path('dashboard/', views.dashboard_view, name='dashboard'),
+    path('suggest/', io_views.suggestion_view, name='suggest'),
+    path('dashboard/', io_views.dashboard_view, name='dashboard'),
+    path('dashboard/cards/', views.dashboard_cards, name='dashboard_cards'),
     path('dashboard/update/', views.update_status_view, name='update_status'),
+    path('dashboard/transitions/', views.transition_status_view, name='transition_status'),
+    path('stats/submissions/', views.submission_stats, name='submission_stats'),
 ]
@@ -1,8 +1,51 @@
-from rest_framework.decorators import api_view
+import json
+
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
+from django.http import HttpResponseForbidden, StreamingHttpResponse
 from django.shortcuts import render, redirect
-from .services import get_supabase_client
+from django.views.decorators.http import require_GET, require_POST
+from .repositories import get_repository
+from .throttling import (
+    KillersAutocompleteThrottle, KillersListThrottle, KillersSearchThrottle, rate_limited,
+)
+from .autocomplete import AUTOCOMPLETE_LIMIT, MAX_AUTOCOMPLETE_LIMIT, get_killer_index
+from .stats import get_dashboard_stats, mo_tag_counts
+from .countries import country_counts
+from .kanban import CARD_ORDERING, COLUMN_PAGE_SIZE, board, column_page, parse_column, parse_column_page_size
+from .transitions import apply_transitions, parse_transitions
+from .throughput import parse_bucket, parse_bucket_count, submission_throughput
+from .duplicates import duplicate_groups
+from .renderers import OrjsonResponse
+from .exports import csv_lines, iter_killer_rows, ndjson_lines
+from .filters import parse_killer_filters
+from .conditional import KILLERS_DATASET, dataset_conditional
+from .pagination import build_page, decode_cursor, parse_fields, parse_ordering, parse_page_size
+
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+SUGGESTION_FORM_FIELDS = (
+    'common_name', 'full_name', 'aliases', 'date_of_birth', 'birth_country', 'gender',
+    'proven_victims', 'possible_victims', 'years_active', 'active_countries', 'modus_operandi',
+    'capture_date', 'sentence', 'death_date', 'manner_of_death', 'status', 'notes',
+)
+
+def suggestion_data(post):
+    """Build Suggestion fields from the "new killer" form, dropping empty values."""
+    data = {field: post.get(field) for field in SUGGESTION_FORM_FIELDS}
+    data['submission_status'] = 'new'
+    return {k: v for k, v in data.items() if v}
+
+def parse_search_limit(raw):
+    """``?limit=`` for the name lookups: default SEARCH_LIMIT, clamped to 1..MAX_SEARCH_LIMIT."""
+    try:
+        limit = int(raw) if raw else SEARCH_LIMIT
+    except ValueError:
+        raise ValueError("limit must be an integer.")
+    return max(min(limit, MAX_SEARCH_LIMIT), 1)
 
 def docs_view(request):
     return render(request, 'documentation.html')
@@ -11,35 +54,13 @@ def home_view(request):
     return render(request, 'home.html')
 
 def suggestion_view(request):
+    repository = get_repository('suggest')
     if request.method == 'POST':
         try:
-            supabase = get_supabase_client()
             form_type = request.POST.get('form_type')
 
             if form_type == 'new_killer':
-                data = {
-                    'common_name': request.POST.get('common_name'),
-                    'full_name': request.POST.get('full_name'),
-                    'aliases': request.POST.get('aliases'),
-                    'date_of_birth': request.POST.get('date_of_birth'),
-                    'birth_country': request.POST.get('birth_country'),
-                    'gender': request.POST.get('gender'),
-                    'proven_victims': request.POST.get('proven_victims'),
-                    'possible_victims': request.POST.get('possible_victims'),
-                    'years_active': request.POST.get('years_active'),
-                    'active_countries': request.POST.get('active_countries'),
-                    'modus_operandi': request.POST.get('modus_operandi'),
-                    'capture_date': request.POST.get('capture_date'),
-                    'sentence': request.POST.get('sentence'),
-                    'death_date': request.POST.get('death_date'),
-                    'manner_of_death': request.POST.get('manner_of_death'),
-                    'status': request.POST.get('status'),
-                    'notes': request.POST.get('notes'),
-                    'submission_status': 'new'
-                }
-                # Remove empty fields
-                data = {k: v for k, v in data.items() if v}
-                supabase.table('Suggestions').insert(data).execute()
+                repository.create_suggestion(suggestion_data(request.POST))
                 return render(request, 'suggestion.html', {'message': 'Suggestion submitted successfully!'})
 
             elif form_type == 'correction':
@@ -48,229 +69,249 @@ def suggestion_view(request):
                     'suggestion_text': request.POST.get('suggestion_text'),
                     'submission_status': 'new'
                 }
-                supabase.table('Modifications').insert(data).execute()
-                # Re-fetch killers for the dropdown
-                response = supabase.table('Serial Killers').select("id, common_name").order('common_name').execute()
-                killers = response.data
-                return render(request, 'suggestion.html', {'message': 'Correction submitted successfully!', 'killers': killers, 'is_correction': True})
+                repository.create_modification(data)
+                return render(request, 'suggestion.html', {'message': 'Correction submitted successfully!', 'is_correction': True})
 
         except Exception as e:
             context = {'error': str(e)}
             if request.POST.get('form_type') == 'correction':
                 context['is_correction'] = True
-                try:
-                    # Re-fetch killers so the dropdown doesn't disappear
-                    response = supabase.table('Serial Killers').select("id, common_name").order('common_name').execute()
-                    context['killers'] = response.data
-                except:
-                    pass
             return render(request, 'suggestion.html', context)
 
-    # GET request
-    is_correction = request.GET.get('type') == 'correction'
-    killers = []
-    if is_correction:
-        try:
-            supabase = get_supabase_client()
-            response = supabase.table('Serial Killers').select("id, common_name").order('common_name').execute()
-            killers = response.data
-        except Exception as e:
-            print(f"Error fetching killers: {e}")
-
-    return render(request, 'suggestion.html', {'is_correction': is_correction, 'killers': killers})
+    # GET request; the correction form looks subjects up through /api/killers/autocomplete/
+    return render(request, 'suggestion.html', {'is_correction': request.GET.get('type') == 'correction'})
 
 @api_view(['GET'])
+@throttle_classes([KillersListThrottle])
+@dataset_conditional(KILLERS_DATASET)
 def get_all_killers(request):
     """
-    Fetch all serial killers from Supabase.
+    Fetch serial killers, one keyset-paginated page at a time.
+
+    Query params: ``cursor`` (from the next/previous links), ``page_size``,
+    ``fields`` (comma-separated projection, e.g. ``id,common_name,status``),
+    ``ordering`` (e.g. ``-proven_victims``) and the filters ``active_between``
+    (e.g. ``1970,1980``), ``status``, ``gender`` (comma-separated lists),
+    ``birth_country``, ``country`` (born or active there), ``mo`` (comma-separated
+    modus operandi tags) and ``min_proven_victims``.
     """
     try:
-        supabase = get_supabase_client()
-        response = supabase.table('Serial Killers').select("*").execute()
-        return Response(response.data, status=status.HTTP_200_OK)
+        fields = parse_fields(request.GET.get('fields'))
+        page_size = parse_page_size(request.GET.get('page_size'))
+        ordering = parse_ordering(request.GET.get('ordering'))
+        cursor = decode_cursor(request.GET.get('cursor'), ordering)
+        filters = parse_killer_filters(request.GET)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        rows = get_repository('list').list_killers(fields, filters, cursor, page_size, ordering)
+        page = build_page(request, rows, cursor, page_size, fields, ordering)
+        return Response(page, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
+@throttle_classes([KillersSearchThrottle])
+@dataset_conditional(KILLERS_DATASET)
 def get_killer_by_name(request, common_name):
     """
-    Fetch a specific serial killer by name (ilike search).
+    Fetch serial killers matching a name, best match first: up to ``?limit=``
+    (default SEARCH_LIMIT, max MAX_SEARCH_LIMIT) results.
     """
     try:
-        supabase = get_supabase_client()
-        response = supabase.table('Serial Killers').select("*").ilike('common_name', f"%{common_name}%").execute()
-        return Response(response.data, status=status.HTTP_200_OK)
+        limit = parse_search_limit(request.GET.get('limit'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        return Response(get_repository('search').search_killers(common_name, limit), status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-def dashboard_view(request):
+@api_view(['GET'])
+@throttle_classes([KillersSearchThrottle])
+@dataset_conditional(KILLERS_DATASET)
+def search_killers(request):
+    """
+    Ranked fuzzy search over common name, full name and aliases (?q=, ?limit=).
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return Response({"error": "The q parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
     try:
-        supabase = get_supabase_client()
-        
-        # Fetch suggestions
-        suggestions_response = supabase.table('Suggestions').select("*").execute()
-        suggestions = suggestions_response.data
-        
-        # Fetch modifications
-        modifications_response = supabase.table('Modifications').select("*").execute()
-        modifications = modifications_response.data
-        
-        # Fetch all killers with all fields for statistics
-        killers_response = supabase.table('Serial Killers').select("*").execute()
-        killers = killers_response.data
-        killers_map = {k['id']: k['common_name'] for k in killers}
-        
-        for mod in modifications:
-            mod['killer_name'] = killers_map.get(mod['killer_id'], 'Unknown ID')
+        limit = parse_search_limit(request.GET.get('limit'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Calculate Serial Killers Statistics
-        total_killers = len(killers)
-        
-        # Country distribution
-        country_counts = {}
-        for killer in killers:
-            country = killer.get('country', 'Unknown')
-            if country:
-                country_counts[country] = country_counts.get(country, 0) + 1
-        
-        # Sort countries by count and get top 5
-        top_countries = sorted(country_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        # Gender distribution
-        gender_counts = {}
-        for killer in killers:
-            gender = killer.get('gender', 'Unknown')
-            if gender:
-                gender_counts[gender] = gender_counts.get(gender, 0) + 1
-        
-        # Modus Operandi categories (top 5)
-        mo_counts = {}
-        for killer in killers:
-            mo = killer.get('modus_operandi', '')
-            if mo:
-                mo_counts[mo] = mo_counts.get(mo, 0) + 1
-        top_mo = sorted(mo_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        # Parse years_active to find most active decade
-        decades_count = {}
-        for killer in killers:
-            years_active = killer.get('years_active', '')
-            if years_active and '-' in years_active:
-                try:
-                    # Parse format like "1974-1978"
-                    parts = years_active.split('-')
-                    start_year = int(parts[0].strip())
-                    # Determine decade (e.g., 1970s)
-                    decade = (start_year // 10) * 10
-                    decades_count[decade] = decades_count.get(decade, 0) + 1
-                except:
-                    pass
-        
-        # Get most active decade
-        most_active_decade = None
-        if decades_count:
-            most_active_decade = max(decades_count.items(), key=lambda x: x[1])
-        
-        
-        # Helper function to parse victim counts (handles "100+", "17", etc.)
-        def parse_victim_count(value):
-            if not value:
-                return 0
-            # Convert to string and remove whitespace
-            value_str = str(value).strip()
-            # Extract numeric part (handles "100+", "50-60", etc.)
-            import re
-            match = re.search(r'(\d+)', value_str)
-            if match:
-                return int(match.group(1))
-            return 0
-        
-        # Victim statistics
-        total_proven_victims = 0
-        total_possible_victims = 0
-        for killer in killers:
-            proven = killer.get('proven_victims')
-            possible = killer.get('possible_victims')
-            
-            total_proven_victims += parse_victim_count(proven)
-            total_possible_victims += parse_victim_count(possible)
+    try:
+        return Response(get_repository('search').search_killers(query, limit), status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@throttle_classes([KillersAutocompleteThrottle])
+def autocomplete_killers(request):
+    """
+    Killers whose name (or any word of it) starts with ?q=, for typeaheads.
+    Served from an in-memory prefix index; ?limit= defaults to 10.
+    """
+    try:
+        limit = min(int(request.GET.get('limit', AUTOCOMPLETE_LIMIT)), MAX_AUTOCOMPLETE_LIMIT)
+    except ValueError:
+        return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Group submissions by status
-        dashboard_data = {
-            'new': [],
-            'in_progress': [],
-            'finished': []
-        }
-        
-        def add_to_dashboard(item, type_label):
-            item['type'] = type_label
-            item_status = item.get('submission_status', 'new')
-            if item_status == 'new':
-                dashboard_data['new'].append(item)
-            elif item_status == 'in_progress':
-                dashboard_data['in_progress'].append(item)
-            elif item_status == 'finished':
-                dashboard_data['finished'].append(item)
-            else:
-                # Fallback for unknown statuses
-                dashboard_data['new'].append(item)
-
-        for s in suggestions:
-            add_to_dashboard(s, 'Suggestion')
-            
-        for m in modifications:
-            add_to_dashboard(m, 'Correction')
-        
-        # Calculate submission statistics by type
-        suggestions_new = sum(1 for item in dashboard_data['new'] if item['type'] == 'Suggestion')
-        suggestions_progress = sum(1 for item in dashboard_data['in_progress'] if item['type'] == 'Suggestion')
-        suggestions_done = sum(1 for item in dashboard_data['finished'] if item['type'] == 'Suggestion')
+    try:
+        return Response(get_killer_index().search(request.GET.get('q', ''), max(limit, 1)), status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@throttle_classes([KillersListThrottle])
+@dataset_conditional(KILLERS_DATASET)
+def killer_countries(request):
+    """
+    Killers per country, most first, from one aggregate over the country
+    links: ``name``, ``killers`` (born or active there), ``born`` and ``active``.
+    """
+    try:
+        return Response(country_counts(), status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@throttle_classes([KillersListThrottle])
+@dataset_conditional(KILLERS_DATASET)
+def killer_mo_tags(request):
+    """
+    Killers per modus operandi tag, most first. Each ``tag`` can be passed
+    to the ``mo`` filter of the killers listing.
+    """
+    try:
+        return Response(mo_tag_counts(), status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@rate_limited('killers_export')
+@dataset_conditional(KILLERS_DATASET)
+@require_GET
+def export_killers_ndjson(request):
+    """
+    Stream the full killers dataset as newline-delimited JSON.
+    """
+    response = StreamingHttpResponse(ndjson_lines(iter_killer_rows()), content_type='application/x-ndjson')
+    response['Content-Disposition'] = 'attachment; filename="killers.ndjson"'
+    return response
+
+@rate_limited('killers_export')
+@dataset_conditional(KILLERS_DATASET)
+@require_GET
+def export_killers_csv(request):
+    """
+    Stream the full killers dataset as CSV.
+    """
+    response = StreamingHttpResponse(csv_lines(iter_killer_rows()), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="killers.csv"'
+    return response
+
+def dashboard_view(request):
+    try:
+        # First page of every kanban column (fetched concurrently by the
+        # repository); the rest of each column is loaded on demand from
+        # dashboard_cards. Called from the request thread: the column queries
+        # already use the fan-out pool, and a pool task waiting on them could
+        # starve it.
+        columns = get_repository('dashboard').dashboard_columns(COLUMN_PAGE_SIZE)
         
-        corrections_new = sum(1 for item in dashboard_data['new'] if item['type'] == 'Correction')
-        corrections_progress = sum(1 for item in dashboard_data['in_progress'] if item['type'] == 'Correction')
-        corrections_done = sum(1 for item in dashboard_data['finished'] if item['type'] == 'Correction')
+        # Statistics come from the incrementally maintained counter table
+        stats = get_dashboard_stats()
+        groups = duplicate_groups()
         
-        # Prepare context
-        context = {
-            'dashboard_data': dashboard_data,
-            'killer_stats': {
-                'total': total_killers,
-                'top_countries': top_countries,
-                'gender_distribution': gender_counts,
-                'top_mo': top_mo,
-                'most_active_decade': most_active_decade,
-                'total_proven_victims': total_proven_victims,
-                'total_possible_victims': total_possible_victims,
-            },
-            'submission_stats': {
-                'suggestions_new': suggestions_new,
-                'suggestions_progress': suggestions_progress,
-                'suggestions_done': suggestions_done,
-                'corrections_new': corrections_new,
-                'corrections_progress': corrections_progress,
-                'corrections_done': corrections_done,
-            }
-        }
+        context = {'board': board(columns, stats['submission_stats']), 'duplicate_groups': groups, **stats}
             
         return render(request, 'dashboard.html', context)
 
     except Exception as e:
         return render(request, 'dashboard.html', {'error': str(e)})
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def dashboard_cards(request):
+    """
+    Next page of one kanban column: ``?type=suggestions|modifications&status=...&cursor=...``.
+    Staff only: the cards carry unreviewed submissions.
+    """
+    try:
+        kind, status_name = parse_column(request.GET.get('type'), request.GET.get('status'))
+        page_size = parse_column_page_size(request.GET.get('page_size'))
+        cursor = decode_cursor(request.GET.get('cursor'), CARD_ORDERING)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        rows = get_repository('dashboard').submission_cards(kind, status_name, cursor, page_size)
+        return Response(column_page(kind, status_name, rows, page_size))
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def submission_stats(request):
+    """
+    Suggestions and modifications created, moved to in progress, finished
+    and reopened per ``?bucket=day|week`` (last ``?buckets=`` buckets), with
+    the average seconds spent in each status before leaving it. Staff only.
+    """
+    try:
+        bucket = parse_bucket(request.GET.get('bucket'))
+        count = parse_bucket_count(request.GET.get('buckets'), bucket)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        return Response({'bucket': bucket, 'results': submission_throughput(bucket, count)})
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def is_staff(user):
+    return user.is_active and user.is_staff
+
 def update_status_view(request):
+    # Form fallback for the dashboard when JavaScript is unavailable
+    if not is_staff(request.user):
+        return HttpResponseForbidden('Staff only.')
     if request.method == 'POST':
         try:
-            supabase = get_supabase_client()
-            item_id = request.POST.get('id')
-            item_type = request.POST.get('type')
-            new_status = request.POST.get('status')
-            
-            table_name = 'Suggestions' if item_type == 'Suggestion' else 'Modifications'
-            
-            supabase.table(table_name).update({'submission_status': new_status}).eq('id', item_id).execute()
+            apply_transitions(parse_transitions({
+                'id': request.POST.get('id'),
+                'type': request.POST.get('type'),
+                'status': request.POST.get('status'),
+            }))
             
         except Exception as e:
             print(f"Error updating status: {e}")
             
     return redirect('dashboard')
+
+@require_POST
+def transition_status_view(request):
+    """
+    Move one or many dashboard cards. The body is a JSON ``{id, type, status}``
+    object or a list of them; the response holds only the cards that changed,
+    so the dashboard patches its columns instead of reloading. Staff only.
+    """
+    if not is_staff(request.user):
+        return OrjsonResponse({"error": "Staff only."}, status=403)
+
+    try:
+        moves = parse_transitions(json.loads(request.body or b'null'))
+    except ValueError as e:
+        # json.JSONDecodeError is a ValueError too
+        return OrjsonResponse({"error": str(e)}, status=400)
+
+    try:
+        updated, missing = apply_transitions(moves)
+        return OrjsonResponse({"updated": updated, "missing": missing})
+    except Exception as e:
+        print(f"Error updating status: {e}")
+        return OrjsonResponse({"error": str(e)}, status=500)